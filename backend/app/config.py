@@ -31,6 +31,12 @@ class Config:
     # Google Sheets Configuration (Optional - for backup/export)
     GOOGLE_SHEETS_CREDENTIALS = os.environ.get('GOOGLE_SHEETS_CREDENTIALS')
     GOOGLE_SHEETS_SHEET_ID = os.environ.get('GOOGLE_SHEETS_SHEET_ID')
+    SHEETS_APPEND_CHUNK_SIZE = int(os.environ.get('SHEETS_APPEND_CHUNK_SIZE', 500))  # rows per append_rows call
+    SHEETS_MAX_RETRIES = int(os.environ.get('SHEETS_MAX_RETRIES', 5))  # on 429 quota / 5xx responses
+    SHEETS_BACKOFF_BASE = float(os.environ.get('SHEETS_BACKOFF_BASE', 1.0))  # seconds, doubled per retry
+    SHEETS_BACKOFF_MAX = float(os.environ.get('SHEETS_BACKOFF_MAX', 64.0))
+    SHEETS_CACHE_TTL = float(os.environ.get('SHEETS_CACHE_TTL', 30))  # seconds a worksheet snapshot is served without checking
+    SHEETS_CACHE_REVISION_CHECK = os.environ.get('SHEETS_CACHE_REVISION_CHECK', 'true').lower() == 'true'  # reuse snapshots while Drive modifiedTime is unchanged
     
     # Amazon API Configuration
     AMAZON_API_KEY = os.environ.get('AMAZON_API_KEY')
@@ -42,6 +48,75 @@ class Config:
     
     # Email Finder API (Hunter.io)
     HUNTER_API_KEY = os.environ.get('HUNTER_API_KEY')
+    HUNTER_VERIFY_RATE = float(os.environ.get('HUNTER_VERIFY_RATE', 10))  # email-verifier requests per second
+    HUNTER_SEARCH_RATE = float(os.environ.get('HUNTER_SEARCH_RATE', 15))  # email-finder / domain-search requests per second
+    HUNTER_VERIFY_WORKERS = int(os.environ.get('HUNTER_VERIFY_WORKERS', 5))  # concurrent verifications per brand
+    HUNTER_VERIFY_DEADLINE = float(os.environ.get('HUNTER_VERIFY_DEADLINE', 20))  # seconds per brand; the rest stay unverified
+    HUNTER_RATE_LIMIT_RETRIES = int(os.environ.get('HUNTER_RATE_LIMIT_RETRIES', 3))  # retries of a rate-limited (429) call
+    HUNTER_MONTHLY_SEARCHES = int(os.environ.get('HUNTER_MONTHLY_SEARCHES', 0))  # plan allowance until synced from Hunter (0 = unknown)
+    HUNTER_MONTHLY_VERIFICATIONS = int(os.environ.get('HUNTER_MONTHLY_VERIFICATIONS', 0))  # plan allowance until synced (0 = unknown)
+    HUNTER_QUOTA_LOW_WATERMARK = float(os.environ.get('HUNTER_QUOTA_LOW_WATERMARK', 0.2))  # share of credits left below which generic addresses are skipped
+    HUNTER_QUOTA_SYNC_INTERVAL = int(os.environ.get('HUNTER_QUOTA_SYNC_INTERVAL', 900))  # seconds between account usage refreshes
+    HUNTER_CACHE_SIZE = int(os.environ.get('HUNTER_CACHE_SIZE', 5000))  # in-process LRU entries
+    HUNTER_CACHE_TTL_DELIVERABLE = int(os.environ.get('HUNTER_CACHE_TTL_DELIVERABLE', 30 * 86400))  # seconds
+    HUNTER_CACHE_TTL_UNDELIVERABLE = int(os.environ.get('HUNTER_CACHE_TTL_UNDELIVERABLE', 14 * 86400))  # negative results
+    HUNTER_CACHE_TTL_UNCERTAIN = int(os.environ.get('HUNTER_CACHE_TTL_UNCERTAIN', 3 * 86400))  # risky / accept_all / unknown
+    HUNTER_CACHE_TTL_NOT_FOUND = int(os.environ.get('HUNTER_CACHE_TTL_NOT_FOUND', 7 * 86400))  # finder / domain search with no emails
+    HUNTER_CACHE_TTL_FOUND = int(os.environ.get('HUNTER_CACHE_TTL_FOUND', 14 * 86400))  # finder / domain search results
+    
+    # Brand website crawling
+    BRAND_CRAWL_CONCURRENT = os.environ.get('BRAND_CRAWL_CONCURRENT', 'true').lower() == 'true'
+    BRAND_CRAWL_WORKERS = int(os.environ.get('BRAND_CRAWL_WORKERS', 8))
+    BRAND_CRAWL_DEADLINE = float(os.environ.get('BRAND_CRAWL_DEADLINE', 15))  # seconds per brand
+    
+    # Shared Chrome WebDriver pool (Selenium scrapers lease browsers instead of launching them)
+    WEBDRIVER_POOL_SIZE = int(os.environ.get('WEBDRIVER_POOL_SIZE', 2))
+    WEBDRIVER_POOL_WARM = int(os.environ.get('WEBDRIVER_POOL_WARM', 0))  # browsers started ahead of use
+    WEBDRIVER_MAX_PAGES = int(os.environ.get('WEBDRIVER_MAX_PAGES', 50))  # navigations before a browser is recycled
+    WEBDRIVER_LEASE_TIMEOUT = int(os.environ.get('WEBDRIVER_LEASE_TIMEOUT', 120))  # seconds to wait for a free browser
+    WEBDRIVER_IDLE_TIMEOUT = int(os.environ.get('WEBDRIVER_IDLE_TIMEOUT', 600))  # idle seconds before a browser is quit
+    WEBDRIVER_HEADLESS = os.environ.get('WEBDRIVER_HEADLESS', 'true').lower() == 'true'
+    
+    # Selenium page readiness (replaces fixed sleeps; timeouts are learned per site within these bounds)
+    READINESS_TIMEOUT = float(os.environ.get('READINESS_TIMEOUT', 10))  # seconds, before a site has been seen
+    READINESS_MIN_TIMEOUT = float(os.environ.get('READINESS_MIN_TIMEOUT', 2))
+    READINESS_MAX_TIMEOUT = float(os.environ.get('READINESS_MAX_TIMEOUT', 20))
+    READINESS_QUIET_MS = int(os.environ.get('READINESS_QUIET_MS', 500))  # DOM/network quiet time that counts as ready
+    READINESS_POLL = float(os.environ.get('READINESS_POLL', 0.1))  # seconds between readiness checks
+    
+    # HTML parsing: 'html.parser' (pure Python) or 'lxml' (faster, when installed; parity: tests/test_html_parser_parity.py)
+    HTML_PARSER = os.environ.get('HTML_PARSER', 'html.parser')
+    # Seller storefront pages: 'script' (one execute_script per page) or 'offline' (parse page_source once)
+    SELLER_PAGE_EXTRACTION = os.environ.get('SELLER_PAGE_EXTRACTION', 'script').lower()
+    # SmartScout brand rows: 'script' (one execute_script per batch) or 'offline' (parse page_source)
+    SMARTSCOUT_ROW_EXTRACTION = os.environ.get('SMARTSCOUT_ROW_EXTRACTION', 'script').lower()
+    
+    # Bulk brand research
+    BULK_RESEARCH_WORKERS = int(os.environ.get('BULK_RESEARCH_WORKERS', 4))
+    BULK_RESEARCH_BATCH_SIZE = int(os.environ.get('BULK_RESEARCH_BATCH_SIZE', 25))  # brands per commit
+    BULK_RESEARCH_MAX_BRANDS = int(os.environ.get('BULK_RESEARCH_MAX_BRANDS', 500))
+    BULK_RESEARCH_PER_HOST = int(os.environ.get('BULK_RESEARCH_PER_HOST', 1))  # concurrent crawls per host
+    BULK_RESEARCH_HOST_DELAY = float(os.environ.get('BULK_RESEARCH_HOST_DELAY', 1.0))  # seconds between visits
+    
+    # Research queue (brands waiting for research; drained by app/tasks/research_worker.py)
+    RESEARCH_QUEUE_WORKERS = int(os.environ.get('RESEARCH_QUEUE_WORKERS', 2))  # forced to 1 without SKIP LOCKED (SQLite)
+    RESEARCH_QUEUE_POLL_INTERVAL = float(os.environ.get('RESEARCH_QUEUE_POLL_INTERVAL', 5))  # idle seconds between claims
+    RESEARCH_QUEUE_VISIBILITY_TIMEOUT = int(os.environ.get('RESEARCH_QUEUE_VISIBILITY_TIMEOUT', 600))  # seconds a claim is held
+    RESEARCH_QUEUE_MAX_ATTEMPTS = int(os.environ.get('RESEARCH_QUEUE_MAX_ATTEMPTS', 5))  # then the item is dead-lettered
+    RESEARCH_QUEUE_BACKOFF_BASE = int(os.environ.get('RESEARCH_QUEUE_BACKOFF_BASE', 30))  # seconds, doubled per attempt
+    RESEARCH_QUEUE_BACKOFF_MAX = int(os.environ.get('RESEARCH_QUEUE_BACKOFF_MAX', 3600))
+    
+    # Background automation jobs (morning setup / end of day run off the request thread)
+    AUTOMATION_JOB_WORKERS = int(os.environ.get('AUTOMATION_JOB_WORKERS', 2))
+    AUTOMATION_JOB_HEARTBEAT = int(os.environ.get('AUTOMATION_JOB_HEARTBEAT', 15))  # seconds between heartbeats
+    AUTOMATION_JOB_STALE_AFTER = int(os.environ.get('AUTOMATION_JOB_STALE_AFTER', 90))  # silent seconds before another process resumes a job
+    AUTOMATION_JOB_MAX_ATTEMPTS = int(os.environ.get('AUTOMATION_JOB_MAX_ATTEMPTS', 3))
+    AUTOMATION_STEP_WORKERS = int(os.environ.get('AUTOMATION_STEP_WORKERS', 4))  # pipeline steps run in parallel once their dependencies finish
+    AUTOMATION_STEP_TIMEOUT = int(os.environ.get('AUTOMATION_STEP_TIMEOUT', 600))  # seconds per step attempt
+    AUTOMATION_SMARTSCOUT_TIMEOUT = int(os.environ.get('AUTOMATION_SMARTSCOUT_TIMEOUT', 1800))  # the browser extraction step
+    
+    # Scheduled tasks (each trigger runs once across all workers; see scheduled_job_runs)
+    SCHEDULER_MISFIRE_GRACE = int(os.environ.get('SCHEDULER_MISFIRE_GRACE', 300))  # seconds late a trigger may still run
     
     # Gmail Configuration
     GMAIL_USER = os.environ.get('GMAIL_USER')
@@ -1,12 +1,21 @@
 from app import create_app
 from app.tasks.scheduler import init_scheduler
+from app.tasks.research_worker import init_research_worker
+from app.tasks.job_runner import init_job_runner
 import os
 
 app = create_app()
 
+# Background automation jobs (resumes jobs interrupted by a restart)
+init_job_runner(app)
+
 # Initialize scheduler for automated tasks
 if os.environ.get('ENABLE_SCHEDULER', 'true').lower() == 'true':
-    init_scheduler()
+    init_scheduler(app)
+
+# Drain the brand research queue in-process
+if os.environ.get('ENABLE_RESEARCH_WORKER', 'false').lower() == 'true':
+    init_research_worker(app)
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
@@ -4,6 +4,12 @@ from app.models.seller import Seller
 from app.models.brand import Brand
 from app.models.qa_analysis import QAAnalysis
 from app.models.audit_log import AuditLog
+from app.models.dedupe_key import DedupeKey
+from app.models.research_queue_item import ResearchQueueItem
+from app.models.automation_job import AutomationJob
+from app.models.scheduled_job_run import ScheduledJobRun
+from app.models.hunter_cache_entry import HunterCacheEntry
+from app.models.hunter_quota_usage import HunterQuotaUsage
 
-__all__ = ['User', 'Seller', 'Brand', 'QAAnalysis', 'AuditLog']
+__all__ = ['User', 'Seller', 'Brand', 'QAAnalysis', 'AuditLog', 'DedupeKey', 'ResearchQueueItem', 'AutomationJob', 'ScheduledJobRun', 'HunterCacheEntry', 'HunterQuotaUsage']
 
@@ -0,0 +1,74 @@
+from app.models.database import db
+from datetime import datetime
+import uuid
+import json
+
+class AutomationJob(db.Model):
+    """Background run of an automation pipeline (morning setup, end of day) with per-step progress"""
+    __tablename__ = 'automation_jobs'
+    __table_args__ = (
+        # Recovery scan: unfinished jobs whose owner stopped sending heartbeats
+        db.Index('ix_automation_jobs_status_heartbeat', 'status', 'heartbeat_at'),
+    )
+    
+    # queued -> running -> completed / failed; a job whose process died goes back to queued
+    STATUSES = ['queued', 'running', 'completed', 'failed']
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    job_type = db.Column(db.String(50), nullable=False, index=True)  # morning_setup, end_of_day
+    status = db.Column(db.String(20), default='queued', nullable=False)
+    params = db.Column(db.Text, nullable=True)  # JSON string
+    steps = db.Column(db.Text, nullable=True)  # JSON list of {name, status, started_at, finished_at, duration_seconds, error}
+    result = db.Column(db.Text, nullable=True)  # JSON string; step results are checkpointed here as they finish
+    error = db.Column(db.Text, nullable=True)
+    attempts = db.Column(db.Integer, default=1, nullable=False)
+    owner = db.Column(db.String(100), nullable=True)  # host:pid of the process running the job
+    heartbeat_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_by = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    @staticmethod
+    def _load(value, default):
+        if value:
+            try:
+                return json.loads(value)
+            except:
+                return default
+        return default
+    
+    def get_params(self):
+        return self._load(self.params, {})
+    
+    def get_steps(self):
+        return self._load(self.steps, [])
+    
+    def get_result(self):
+        return self._load(self.result, {})
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        duration = None
+        if self.started_at:
+            duration = round(((self.finished_at or datetime.utcnow()) - self.started_at).total_seconds(), 2)
+        return {
+            'id': self.id,
+            'job_type': self.job_type,
+            'status': self.status,
+            'params': self.get_params(),
+            'steps': self.get_steps(),
+            'result': self.get_result(),
+            'error': self.error,
+            'attempts': self.attempts,
+            'owner': self.owner,
+            'heartbeat_at': self.heartbeat_at.isoformat(),
+            'created_by': self.created_by,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration_seconds': duration
+        }
+    
+    def __repr__(self):
+        return f'<AutomationJob {self.job_type} ({self.status})>'
@@ -6,6 +6,10 @@ import json
 class Brand(db.Model):
     """Brand model"""
     __tablename__ = 'brands'
+    __table_args__ = (
+        # Composite key for keyset pagination (ORDER BY created_at DESC, id DESC)
+        db.Index('ix_brands_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = db.Column(db.String(200), nullable=False, index=True)
@@ -70,3 +74,6 @@ class Brand(db.Model):
     def __repr__(self):
         return f'<Brand {self.name}>'
 
+# Case-insensitive name lookups (lower(name) = ...) for duplicate checks and queue batching
+db.Index('ix_brands_name_lower', db.func.lower(Brand.name))
+
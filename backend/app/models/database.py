@@ -13,4 +13,19 @@ def init_db(app):
         # Create all tables
         db.create_all()
         print("✅ Database tables created successfully!")
+        
+        from app.services.database_service import DatabaseService
+        # create_all skips indexes added to tables that already exist
+        DatabaseService.ensure_indexes()
+        
+        # Index existing sellers/brands for duplicate checks (no-op once populated)
+        DatabaseService.ensure_dedupe_index()
+        
+        # Hunter.io cache is read from scraper threads that have no app context
+        from app.services.hunter_cache_service import hunter_cache
+        hunter_cache.bind(db.engine)
+        hunter_cache.purge_expired()
+        
+        from app.services.hunter_quota_service import hunter_quota
+        hunter_quota.bind(db.engine)
 
@@ -0,0 +1,59 @@
+from app.models.database import db
+from datetime import datetime
+import hashlib
+
+class DedupeKey(db.Model):
+    """Normalized duplicate-check keys for sellers and brands (one row per entity and key type)"""
+    __tablename__ = 'dedupe_keys'
+    __table_args__ = (
+        # One indexed probe answers "does any seller/brand already have this name/email/url?"
+        db.Index('ix_dedupe_keys_lookup', 'entity_type', 'key_type', 'key_hash'),
+        db.UniqueConstraint('entity_type', 'entity_id', 'key_type', name='uq_dedupe_keys_entity_key'),
+    )
+    
+    # Fields used as duplicate keys for each entity type
+    KEY_FIELDS = {
+        'seller': ['name', 'email', 'store_url'],
+        'brand': ['name', 'domain']
+    }
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    entity_type = db.Column(db.String(20), nullable=False)  # seller, brand
+    entity_id = db.Column(db.String(36), nullable=False, index=True)
+    key_type = db.Column(db.String(20), nullable=False)  # name, email, store_url, domain
+    key_hash = db.Column(db.String(64), nullable=False)  # sha256 of the normalized value
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    @staticmethod
+    def normalize(value):
+        """Normalize a key value the same way the duplicate checks compare them"""
+        return str(value or '').lower().strip()
+    
+    @staticmethod
+    def hash_value(value):
+        """Fixed-width hash so long URLs index as cheaply as short names"""
+        return hashlib.sha256(value.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def keys_for(cls, entity_type, data):
+        """Return {key_type: key_hash} for every non-empty key field in data"""
+        keys = {}
+        for field in cls.KEY_FIELDS[entity_type]:
+            value = cls.normalize(data.get(field))
+            if value:
+                keys[field] = cls.hash_value(value)
+        return keys
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'id': self.id,
+            'entity_type': self.entity_type,
+            'entity_id': self.entity_id,
+            'key_type': self.key_type,
+            'key_hash': self.key_hash,
+            'created_at': self.created_at.isoformat()
+        }
+    
+    def __repr__(self):
+        return f'<DedupeKey {self.entity_type}:{self.key_type}>'
@@ -0,0 +1,47 @@
+from app.models.database import db
+from datetime import datetime
+import json
+
+class HunterCacheEntry(db.Model):
+    """Cached Hunter.io response (email verification, email finder or domain search) with its expiry"""
+    __tablename__ = 'hunter_cache'
+    __table_args__ = (
+        db.UniqueConstraint('kind', 'cache_key', name='uq_hunter_cache_kind_key'),
+    )
+    
+    # verify: keyed by email; find: domain|first|last; domain: domain|limit
+    KINDS = ['verify', 'find', 'domain']
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    kind = db.Column(db.String(10), nullable=False)
+    cache_key = db.Column(db.String(512), nullable=False)
+    result = db.Column(db.Text, nullable=True)  # JSON string; null when Hunter had nothing
+    is_negative = db.Column(db.Boolean, default=False, nullable=False)  # undeliverable / nothing found
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    def get_result(self):
+        """Get result as Python value"""
+        if self.result:
+            try:
+                return json.loads(self.result)
+            except:
+                return None
+        return None
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'cache_key': self.cache_key,
+            'result': self.get_result(),
+            'is_negative': self.is_negative,
+            'expires_at': self.expires_at.isoformat(),
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat()
+        }
+    
+    def __repr__(self):
+        return f'<HunterCacheEntry {self.kind}:{self.cache_key}>'
@@ -0,0 +1,40 @@
+from app.models.database import db
+from datetime import datetime
+
+class HunterQuotaUsage(db.Model):
+    """Hunter.io credit usage for the current billing period, one row per credit type"""
+    __tablename__ = 'hunter_quota_usage'
+    
+    # searches: email finder + domain search; verifications: email verifier
+    KINDS = ['searches', 'verifications']
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    kind = db.Column(db.String(20), unique=True, nullable=False)
+    period_start = db.Column(db.Date, nullable=False)
+    reset_date = db.Column(db.Date, nullable=False)  # credits renew on this day
+    credits_used = db.Column(db.Integer, default=0, nullable=False)
+    credits_available = db.Column(db.Integer, nullable=True)  # plan allowance; null until known
+    calls = db.Column(db.Integer, default=0, nullable=False)  # API requests made this period
+    skipped = db.Column(db.Integer, default=0, nullable=False)  # low-value calls skipped to save credits
+    exhausted_at = db.Column(db.DateTime, nullable=True)  # Hunter answered "usage limit reached"
+    last_synced_at = db.Column(db.DateTime, nullable=True)  # last refresh from the account endpoint
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'period_start': self.period_start.isoformat(),
+            'reset_date': self.reset_date.isoformat(),
+            'credits_used': self.credits_used,
+            'credits_available': self.credits_available,
+            'calls': self.calls,
+            'skipped': self.skipped,
+            'exhausted_at': self.exhausted_at.isoformat() if self.exhausted_at else None,
+            'last_synced_at': self.last_synced_at.isoformat() if self.last_synced_at else None,
+            'updated_at': self.updated_at.isoformat()
+        }
+    
+    def __repr__(self):
+        return f'<HunterQuotaUsage {self.kind} {self.credits_used}/{self.credits_available}>'
@@ -6,6 +6,10 @@ import json
 class QAAnalysis(db.Model):
     """QA Analysis model"""
     __tablename__ = 'qa_analyses'
+    __table_args__ = (
+        # Composite key for keyset pagination (ORDER BY created_at DESC, id DESC)
+        db.Index('ix_qa_analyses_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     brand_id = db.Column(db.String(36), db.ForeignKey('brands.id'), nullable=False, index=True)
@@ -0,0 +1,102 @@
+from app.models.database import db
+from datetime import datetime
+import uuid
+import json
+
+class ResearchQueueItem(db.Model):
+    """Brand waiting to be researched (persistent work queue drained by the research workers)"""
+    __tablename__ = 'research_queue'
+    __table_args__ = (
+        # Dequeue order: visible items, highest priority first, then oldest
+        db.Index('ix_research_queue_dequeue', 'status', 'available_at', 'priority'),
+    )
+    
+    # Priority labels accepted by the queue service; higher numbers are dequeued first
+    PRIORITIES = {
+        'low': 0,
+        'normal': 50,
+        'high': 100
+    }
+    
+    # pending: waiting (or backing off until available_at)
+    # processing: claimed by a worker until available_at (its visibility timeout)
+    # completed / dead: final; dead items exhausted max_attempts
+    STATUSES = ['pending', 'processing', 'completed', 'dead']
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    brand_name = db.Column(db.String(200), nullable=False, index=True)
+    source = db.Column(db.String(50), nullable=True)  # seller_sniping, manual, ...
+    priority = db.Column(db.Integer, default=50, nullable=False)
+    status = db.Column(db.String(20), default='pending', nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, default=5, nullable=False)
+    available_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    locked_by = db.Column(db.String(100), nullable=True)  # worker id holding the claim
+    last_error = db.Column(db.Text, nullable=True)
+    details = db.Column(db.Text, nullable=True)  # JSON string (metadata passed when queued)
+    brand_id = db.Column(db.String(36), nullable=True)  # researched brand once completed
+    created_by = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    
+    @classmethod
+    def priority_value(cls, priority):
+        """Numeric priority for a label ('high', 'normal', 'low') or a number"""
+        if isinstance(priority, int):
+            return priority
+        return cls.PRIORITIES.get(str(priority or 'normal').lower(), cls.PRIORITIES['normal'])
+    
+    def priority_label(self):
+        """Closest priority label for the stored number"""
+        return min(self.PRIORITIES, key=lambda label: abs(self.PRIORITIES[label] - self.priority))
+    
+    def set_details(self, details_dict):
+        """Set details as JSON string"""
+        if details_dict:
+            self.details = json.dumps(details_dict)
+        else:
+            self.details = None
+    
+    def get_details(self):
+        """Get details as dictionary"""
+        if self.details:
+            try:
+                return json.loads(self.details)
+            except:
+                return {}
+        return {}
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'id': self.id,
+            'brand_name': self.brand_name,
+            'source': self.source,
+            'priority': self.priority_label(),
+            'priority_value': self.priority,
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'available_at': self.available_at.isoformat(),
+            'locked_by': self.locked_by,
+            'last_error': self.last_error,
+            'metadata': self.get_details(),
+            'brand_id': self.brand_id,
+            'created_by': self.created_by,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat(),
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+        }
+    
+    def __repr__(self):
+        return f'<ResearchQueueItem {self.brand_name} ({self.status})>'
+
+# At most one pending/processing item per brand name; batch enqueue relies on it for ON CONFLICT DO NOTHING
+db.Index(
+    'uq_research_queue_active_name',
+    db.func.lower(ResearchQueueItem.brand_name),
+    unique=True,
+    postgresql_where=ResearchQueueItem.status.in_(['pending', 'processing']),
+    sqlite_where=ResearchQueueItem.status.in_(['pending', 'processing'])
+)
@@ -0,0 +1,43 @@
+from app.models.database import db
+from datetime import datetime
+import uuid
+
+class ScheduledJobRun(db.Model):
+    """One firing of a scheduled task; the unique (job_id, scheduled_for) row doubles as its lock"""
+    __tablename__ = 'scheduled_job_runs'
+    __table_args__ = (
+        # Every process's scheduler fires the same trigger; only the first insert wins
+        db.UniqueConstraint('job_id', 'scheduled_for', name='uq_scheduled_job_runs_trigger'),
+    )
+    
+    # running -> completed / failed
+    STATUSES = ['running', 'completed', 'failed']
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    job_id = db.Column(db.String(50), nullable=False, index=True)  # morning_setup, end_of_day, daily_backup, weekly_summary
+    scheduled_for = db.Column(db.DateTime, nullable=False)  # trigger fire time (UTC)
+    status = db.Column(db.String(20), default='running', nullable=False)
+    owner = db.Column(db.String(100), nullable=True)  # host:pid of the process that ran it
+    started_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    duration_seconds = db.Column(db.Float, nullable=True)
+    result_size = db.Column(db.Integer, nullable=True)  # bytes of the JSON-encoded result
+    error = db.Column(db.Text, nullable=True)
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'id': self.id,
+            'job_id': self.job_id,
+            'scheduled_for': self.scheduled_for.isoformat(),
+            'status': self.status,
+            'owner': self.owner,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration_seconds': self.duration_seconds,
+            'result_size': self.result_size,
+            'error': self.error
+        }
+    
+    def __repr__(self):
+        return f'<ScheduledJobRun {self.job_id} @ {self.scheduled_for} ({self.status})>'
@@ -5,6 +5,10 @@ import uuid
 class Seller(db.Model):
     """Seller model"""
     __tablename__ = 'sellers'
+    __table_args__ = (
+        # Composite key for keyset pagination (ORDER BY created_at DESC, id DESC)
+        db.Index('ix_sellers_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     name = db.Column(db.String(200), nullable=False, index=True)
@@ -1,9 +1,17 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, current_app
 from app.services.automation_service import AutomationService
+from app.services.job_service import JobService
+from app.services.scheduled_run_service import ScheduledRunService
+from app.services.google_sheets_service import GoogleSheetsService
+from app.services.email_finder_service import EmailFinderService
 from app.services.reporting_service import ReportingService
 from app.services.performance_tracking_service import PerformanceTrackingService
 from app.services.backup_service import BackupService
+from app.services.database_service import DatabaseService
+from app.services.duplicate_detector_service import DuplicateDetectorService
 from app.utils.error_handler import handle_error
+from app.utils.auth_decorator import manager_required
+from app.tasks.job_runner import init_job_runner
 
 bp = Blueprint('automation', __name__)
 automation_service = AutomationService()
@@ -11,9 +19,26 @@ reporting_service = ReportingService()
 performance_service = PerformanceTrackingService()
 backup_service = BackupService()
 
+def _wants_sync(data):
+    """?wait=true (or "wait": true in the body) runs the automation inside the request as before"""
+    from flask import request
+    return request.args.get('wait', 'false').lower() == 'true' or data.get('wait') is True
+
+def _job_started(job, message):
+    return jsonify({
+        'success': True,
+        'message': message,
+        'job_id': job['id'],
+        'status_url': f"/api/automation/jobs/{job['id']}",
+        'data': job
+    }), 202
+
 @bp.route('/morning-setup', methods=['POST'])
 def morning_setup():
-    """Run morning setup automation - SmartScout + Google Sheets + Duplicate Detection"""
+    """
+    Run morning setup automation - SmartScout + Google Sheets + Duplicate Detection
+    Returns 202 with a job id; poll GET /api/automation/jobs/<job_id> for progress
+    """
     try:
         from flask import request
         data = request.get_json() or {}
@@ -22,6 +47,13 @@ def morning_setup():
         smartscout_enabled = data.get('smartscout_enabled', True)
         brand_count = data.get('brand_count', 100)
         
+        if not _wants_sync(data):
+            job = init_job_runner(current_app._get_current_object()).submit('morning_setup', {
+                'smartscout_enabled': smartscout_enabled,
+                'brand_count': brand_count
+            })
+            return _job_started(job, 'Morning setup started')
+        
         results = automation_service.morning_setup(
             smartscout_enabled=smartscout_enabled,
             brand_count=brand_count
@@ -37,8 +69,15 @@ def morning_setup():
 
 @bp.route('/end-of-day', methods=['POST'])
 def end_of_day():
-    """Run end of day automation"""
+    """Run end of day automation (202 with a job id unless ?wait=true)"""
     try:
+        from flask import request
+        data = request.get_json(silent=True) or {}
+        
+        if not _wants_sync(data):
+            job = init_job_runner(current_app._get_current_object()).submit('end_of_day')
+            return _job_started(job, 'End of day tasks started')
+        
         results = automation_service.end_of_day_tasks()
         return jsonify({
             'success': True,
@@ -48,6 +87,121 @@ def end_of_day():
     except Exception as e:
         return handle_error(e)
 
+@bp.route('/jobs', methods=['GET'])
+def get_jobs():
+    """Recent automation jobs"""
+    try:
+        from flask import request
+        limit = request.args.get('limit', 20, type=int)
+        job_type = request.args.get('type')
+        return jsonify({
+            'success': True,
+            'data': JobService.list_jobs(limit=limit, job_type=job_type)
+        }), 200
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Automation job status with per-step progress, timings and results"""
+    try:
+        job = JobService.get_job(job_id)
+        if not job:
+            return jsonify({
+                'success': False,
+                'message': 'Job not found'
+            }), 404
+        return jsonify({
+            'success': True,
+            'data': job
+        }), 200
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route('/scheduled-runs', methods=['GET'])
+def get_scheduled_runs():
+    """Run history of the scheduled tasks with per-job duration summary"""
+    try:
+        from flask import request
+        limit = request.args.get('limit', 50, type=int)
+        job_id = request.args.get('job')
+        return jsonify({
+            'success': True,
+            'data': ScheduledRunService.list_runs(job_id=job_id, limit=limit),
+            'summary': ScheduledRunService.get_summary()
+        }), 200
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route('/sheets-cache', methods=['GET'])
+def get_sheets_cache():
+    """Hit/miss counters of the Google Sheets snapshot cache"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': GoogleSheetsService.cache_stats()
+        }), 200
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route('/merge-duplicates', methods=['POST'])
+@manager_required
+def merge_duplicates(current_user):
+    """Merge exact duplicate sellers or brands in the Google Sheet or the database"""
+    try:
+        from flask import request
+        data = request.get_json() or {}
+        entity = data.get('entity', 'seller')
+        target = data.get('target', 'sheets')
+        
+        if entity not in ('seller', 'brand') or target not in ('sheets', 'database'):
+            return jsonify({
+                'success': False,
+                'message': 'entity must be seller or brand, target must be sheets or database'
+            }), 400
+        
+        if target == 'database':
+            result = DatabaseService.merge_duplicates(entity)
+        else:
+            result = DuplicateDetectorService().merge_duplicates(sheet_name='Sellers' if entity == 'seller' else 'Brands')
+            if result is False:
+                return jsonify({
+                    'success': False,
+                    'message': 'Google Sheets merge failed or Sheets is not configured'
+                }), 500
+        
+        return jsonify({
+            'success': True,
+            'data': result
+        }), 200
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route('/hunter-cache', methods=['GET'])
+def get_hunter_cache():
+    """Hit/miss counters of the Hunter.io result cache"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': EmailFinderService.cache_stats()
+        }), 200
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route('/hunter-quota', methods=['GET'])
+def get_hunter_quota():
+    """Hunter.io credit usage, remaining budget and projected exhaustion (?refresh=true syncs from Hunter first)"""
+    try:
+        from flask import request
+        if request.args.get('refresh', 'false').lower() == 'true':
+            EmailFinderService().sync_quota()
+        return jsonify({
+            'success': True,
+            'data': EmailFinderService.quota_stats()
+        }), 200
+    except Exception as e:
+        return handle_error(e)
+
 @bp.route('/daily-report', methods=['GET'])
 def get_daily_report():
     """Get daily report"""
@@ -1,10 +1,14 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from app.services.brand_service import BrandService
+from app.services.research_queue_service import ResearchQueueService
 from app.utils.error_handler import handle_error
 from app.utils.auth_decorator import token_required
+from app.config import Config
+import json
 
 bp = Blueprint('brands', __name__)
 brand_service = BrandService()
+research_queue = ResearchQueueService()
 
 @bp.route('/', methods=['GET'])
 @token_required
@@ -22,6 +26,25 @@ def get_brands(current_user):
         if search:
             filters['search'] = search
         
+        # Keyset pagination: ?cursor= (empty for the first page), then pass back next_cursor
+        if 'cursor' in request.args:
+            include_total = request.args.get('include_total', 'false').lower() == 'true'
+            result = brand_service.get_brands_page(
+                cursor=request.args.get('cursor'),
+                limit=limit,
+                filters=filters,
+                include_total=include_total
+            )
+            return jsonify({
+                'success': True,
+                'data': result['data'],
+                'limit': limit,
+                'next_cursor': result['next_cursor'],
+                'has_more': result['has_more'],
+                'total': result['total'],
+                'total_estimate': result['total_estimate']
+            }), 200
+        
         brands = brand_service.get_all_brands(page=page, limit=limit, filters=filters)
         return jsonify({
             'success': True,
@@ -29,6 +52,11 @@ def get_brands(current_user):
             'page': page,
             'limit': limit
         }), 200
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return handle_error(e)
 
@@ -56,6 +84,138 @@ def research_brand(current_user):
     except Exception as e:
         return handle_error(e)
 
+@bp.route('/research/bulk', methods=['POST'])
+@token_required
+def research_brands_bulk(current_user):
+    """
+    Research a list of brands on a worker pool.
+    Streams newline-delimited JSON events: started, progress (one per brand),
+    batch_saved/batch_failed (one per commit) and a final completed summary.
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('brand_names'), list):
+            return jsonify({
+                'success': False,
+                'message': 'brand_names list is required'
+            }), 400
+        
+        # Keep the first spelling of each name, in request order
+        brand_names = []
+        seen = set()
+        for name in data['brand_names']:
+            name = str(name or '').strip()
+            if name and name.lower() not in seen:
+                seen.add(name.lower())
+                brand_names.append(name)
+        
+        if not brand_names:
+            return jsonify({
+                'success': False,
+                'message': 'brand_names list is required'
+            }), 400
+        
+        if len(brand_names) > Config.BULK_RESEARCH_MAX_BRANDS:
+            return jsonify({
+                'success': False,
+                'message': f'At most {Config.BULK_RESEARCH_MAX_BRANDS} brands per request'
+            }), 400
+        
+        # Validated here: once the stream has started a bad value can no longer become a 400
+        options = {}
+        for key in ('workers', 'batch_size'):
+            value = data.get(key)
+            if value is None:
+                continue
+            if isinstance(value, bool) or not str(value).strip().isdigit() or int(value) < 1:
+                return jsonify({
+                    'success': False,
+                    'message': f'{key} must be a positive integer'
+                }), 400
+            options[key] = int(value)
+        if 'workers' in options:
+            options['workers'] = min(options['workers'], Config.BULK_RESEARCH_WORKERS)
+        if 'batch_size' in options:
+            options['batch_size'] = min(options['batch_size'], Config.BULK_RESEARCH_MAX_BRANDS)
+        
+        events = brand_service.research_brands_bulk(
+            brand_names,
+            current_user.id,
+            use_enhanced_scraper=data.get('use_enhanced_scraper', True),
+            **options
+        )
+        
+        def generate():
+            for event in events:
+                yield json.dumps(event, default=str) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson'), 200
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route('/queue', methods=['GET'])
+@token_required
+def get_research_queue(current_user):
+    """Get research queue items (in dequeue order) and per-status counts"""
+    try:
+        status = request.args.get('status', 'pending')
+        limit = request.args.get('limit', 100, type=int)
+        
+        return jsonify({
+            'success': True,
+            'data': research_queue.get_queue(status=None if status == 'all' else status, limit=limit),
+            'stats': research_queue.get_stats()
+        }), 200
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route('/queue', methods=['POST'])
+@token_required
+def add_to_research_queue(current_user):
+    """Queue brands for background research"""
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('brand_names'), list):
+            return jsonify({
+                'success': False,
+                'message': 'brand_names list is required'
+            }), 400
+        
+        result = research_queue.add_batch_to_queue(
+            data['brand_names'],
+            source=data.get('source', 'manual'),
+            priority=data.get('priority', 'normal'),
+            user_id=current_user.id
+        )
+        
+        return jsonify({
+            'success': True,
+            'data': result
+        }), 201
+    except Exception as e:
+        return handle_error(e)
+
+@bp.route('/queue/<item_id>/retry', methods=['POST'])
+@token_required
+def retry_research_queue_item(item_id, current_user):
+    """Re-queue a dead-lettered item"""
+    try:
+        item = research_queue.retry_dead(item_id)
+        if not item:
+            return jsonify({
+                'success': False,
+                'message': 'Dead-lettered queue item not found'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'data': item
+        }), 200
+    except Exception as e:
+        return handle_error(e)
+
 @bp.route('/<brand_id>', methods=['GET'])
 @token_required
 def get_brand(brand_id, current_user):
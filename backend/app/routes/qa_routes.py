@@ -6,6 +6,57 @@ from app.utils.auth_decorator import token_required
 bp = Blueprint('qa', __name__)
 qa_service = QAService()
 
+@bp.route('/', methods=['GET'])
+@token_required
+def get_qa_analyses(current_user):
+    """Get all QA analyses"""
+    try:
+        page = request.args.get('page', 1, type=int)
+        limit = request.args.get('limit', 50, type=int)
+        status = request.args.get('status')
+        brand_id = request.args.get('brand_id')
+        
+        filters = {}
+        if status:
+            filters['status'] = status
+        if brand_id:
+            filters['brand_id'] = brand_id
+        
+        # Keyset pagination: ?cursor= (empty for the first page), then pass back next_cursor
+        if 'cursor' in request.args:
+            include_total = request.args.get('include_total', 'false').lower() == 'true'
+            result = qa_service.get_all_analyses(
+                limit=limit,
+                filters=filters,
+                cursor=request.args.get('cursor'),
+                include_total=include_total
+            )
+            return jsonify({
+                'success': True,
+                'data': result['data'],
+                'limit': limit,
+                'next_cursor': result['next_cursor'],
+                'has_more': result['has_more'],
+                'total': result['total'],
+                'total_estimate': result['total_estimate']
+            }), 200
+        
+        result = qa_service.get_all_analyses(page=page, limit=limit, filters=filters)
+        return jsonify({
+            'success': True,
+            'data': result['data'],
+            'total': result['total'],
+            'page': page,
+            'limit': limit
+        }), 200
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return handle_error(e)
+
 @bp.route('/analyze', methods=['POST'])
 @token_required
 def analyze_qa(current_user):
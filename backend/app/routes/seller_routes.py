@@ -26,6 +26,25 @@ def get_sellers(current_user):
         if search:
             filters['search'] = search
         
+        # Keyset pagination: ?cursor= (empty for the first page), then pass back next_cursor
+        if 'cursor' in request.args:
+            include_total = request.args.get('include_total', 'false').lower() == 'true'
+            result = seller_service.get_sellers_page(
+                cursor=request.args.get('cursor'),
+                limit=limit,
+                filters=filters,
+                include_total=include_total
+            )
+            return jsonify({
+                'success': True,
+                'data': result['data'],
+                'limit': limit,
+                'next_cursor': result['next_cursor'],
+                'has_more': result['has_more'],
+                'total': result['total'],
+                'total_estimate': result['total_estimate']
+            }), 200
+        
         sellers = seller_service.get_all_sellers(page=page, limit=limit, filters=filters)
         return jsonify({
             'success': True,
@@ -33,6 +52,11 @@ def get_sellers(current_user):
             'page': page,
             'limit': limit
         }), 200
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
     except Exception as e:
         return handle_error(e)
 
@@ -2,62 +2,126 @@
 Brand Website Scraper - 80% Automated Brand Research
 Scrapes brand websites for contact info, validates emails, finds social media
 """
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 import requests
 import re
 import time
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from urllib.parse import urljoin, urlparse
+from app.config import Config
+from app.utils.html_parser import make_soup
 from app.utils.logger import get_logger
+from app.utils.page_readiness import PageWaiter
+from app.utils.webdriver_pool import get_driver_pool
 from app.services.email_finder_service import EmailFinderService
 from app.services.domain_validator_service import DomainValidatorService
 
 logger = get_logger(__name__)
 
+# Candidate paths per page type, in merge order
+CRAWL_PAGES = [
+    ('home', ['']),
+    ('contact', ['/contact', '/contact-us', '/contact.html']),
+    ('about', ['/about', '/about-us', '/about.html']),
+]
+
+# Extraction patterns, compiled once per process
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERNS = [
+    re.compile(r'\+?1?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),  # US format
+    re.compile(r'\+?\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}'),  # International
+]
+NON_PHONE_CHARS = re.compile(r'[^\d+]')
+ZIP_PATTERN = re.compile(r'\b\d{5}(-\d{4})?\b')
+FOUNDED_PATTERN = re.compile(r'founded[:\s]+(\d{4})', re.IGNORECASE)
+FOUNDER_PATTERN = re.compile(r'founder[:\s]+([A-Z][a-z]+ [A-Z][a-z]+)', re.IGNORECASE)
+CEO_PATTERN = re.compile(r'ceo[:\s]+([A-Z][a-z]+ [A-Z][a-z]+)', re.IGNORECASE)
+
+SOCIAL_PATTERNS = [
+    ('linkedin', re.compile(r'linkedin\.com/(?:company|in|pub)/[\w-]+', re.IGNORECASE)),
+    ('instagram', re.compile(r'instagram\.com/[\w.]+', re.IGNORECASE)),
+    ('facebook', re.compile(r'facebook\.com/[\w.]+', re.IGNORECASE)),
+    ('twitter', re.compile(r'(?:twitter|x)\.com/[\w]+', re.IGNORECASE)),
+    ('tiktok', re.compile(r'tiktok\.com/@?[\w]+', re.IGNORECASE)),
+    ('youtube', re.compile(r'youtube\.com/(?:channel|c|user|@)/[\w-]+', re.IGNORECASE)),
+    ('pinterest', re.compile(r'pinterest\.com/[\w]+', re.IGNORECASE)),
+]
+# Every social pattern contains one of these domains, so links without one can be skipped
+SOCIAL_HINT = re.compile(r'(?:linkedin|instagram|facebook|twitter|x|tiktok|youtube|pinterest)\.com/', re.IGNORECASE)
+
+ADDRESS_SELECTORS = [('class', 'address'), ('class', 'contact-address'), ('id', 'address'), ('itemprop', 'address')]
+DESCRIPTION_SELECTORS = [('class', 'description'), ('class', 'about'), ('id', 'about'), ('itemprop', 'description')]
+SELECTOR_ATTRS = ('class', 'id', 'itemprop')
+
+INDUSTRY_KEYWORDS = ['technology', 'retail', 'ecommerce', 'fashion', 'electronics',
+                     'food', 'health', 'beauty', 'home', 'sports', 'automotive']
+US_STATES = ['AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA',
+             'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
+             'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
+             'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
+             'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY']
+
+class PageContent:
+    """
+    A parsed page prepared for extraction: the text is materialized once and a single
+    walk over the tags collects link hrefs and the first tag for each class/id/itemprop value.
+    """
+    
+    def __init__(self, soup):
+        self.soup = soup
+        self.text = soup.get_text()
+        self.text_lower = self.text.lower()
+        self.hrefs = []
+        self._first = {}  # (attr, value) -> first tag in document order
+        
+        for tag in soup.find_all(True):
+            if tag.name == 'a':
+                href = tag.get('href')
+                if href is not None:
+                    self.hrefs.append(href)
+            for attr in SELECTOR_ATTRS:
+                value = tag.get(attr)
+                if not value:
+                    continue
+                if isinstance(value, list):
+                    # Multi-valued (class): match any single value or the whole attribute
+                    for item in value:
+                        self._first.setdefault((attr, item), tag)
+                    value = ' '.join(value)
+                self._first.setdefault((attr, value), tag)
+    
+    def first(self, attr, value):
+        """First tag whose attr matches value, like soup.find(**{attr: value})"""
+        return self._first.get((attr, value))
+
 class BrandWebsiteScraper:
     """Scrapes brand websites for comprehensive contact information"""
     
     def __init__(self):
-        self.driver = None
         self.email_finder = EmailFinderService()
         self.domain_validator = DomainValidatorService()
+        self.host_throttle = None  # optional HostThrottle shared by bulk research workers
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
     
-    def _setup_driver(self, headless=True):
-        """Setup Selenium WebDriver"""
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument('--window-size=1920,1080')
-        
-        try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            return True
-        except Exception as e:
-            logger.error(f"Error setting up Chrome driver: {str(e)}")
-            return False
-    
-    def scrape_brand_website(self, domain_or_url, brand_name=None):
+    def scrape_brand_website(self, domain_or_url, brand_name=None, concurrent=None):
         """
         Comprehensive brand website scraping - 80% automated
         Returns pre-filled data with verification flags
+        concurrent: fetch home/contact/about pages in parallel (defaults to BRAND_CRAWL_CONCURRENT)
         """
         try:
-            # Normalize URL
-            base_url = self._normalize_url(domain_or_url)
+            if concurrent is None:
+                concurrent = Config.BRAND_CRAWL_CONCURRENT
+            
+            # Normalize URL (the concurrent crawl tries https and http itself, so skip the HEAD probe)
+            base_url = self._normalize_url(domain_or_url, probe=not concurrent)
             if not base_url:
                 return self._empty_result(brand_name, "Invalid domain")
             
@@ -79,6 +143,7 @@ class BrandWebsiteScraper:
                         'sales': '',
                         'all_found': [],
                         'verified': [],
+                        'unverified': [],
                         'needs_verification': True
                     },
                     'phone': {
@@ -135,32 +200,34 @@ class BrandWebsiteScraper:
             
             # Scrape using requests first (faster)
             try:
-                response = self.session.get(base_url, timeout=10, allow_redirects=True)
-                if response.status_code == 200:
-                    html_content = response.text
-                    soup = BeautifulSoup(html_content, 'html.parser')
-                    
-                    # Extract data from main page
-                    self._extract_from_page(soup, base_url, result)
-                    
-                    # Scrape additional pages
-                    self._scrape_contact_page(base_url, result)
-                    self._scrape_about_page(base_url, result)
+                with self._host_slot(base_url):
+                    if concurrent:
+                        base_url = self._crawl_concurrently(domain_or_url, base_url, result)
+                    else:
+                        response = self.session.get(base_url, timeout=10, allow_redirects=True)
+                        if response.status_code == 200:
+                            html_content = response.text
+                            soup = make_soup(html_content)
+                            
+                            # Extract data from main page
+                            self._extract_from_page(soup, base_url, result)
+                            
+                            # Scrape additional pages
+                            self._scrape_contact_page(base_url, result)
+                            self._scrape_about_page(base_url, result)
                     
             except Exception as e:
                 logger.warning(f"Requests scraping failed, trying Selenium: {str(e)}")
                 # Fallback to Selenium for JavaScript-heavy sites
-                if self._setup_driver(headless=True):
-                    try:
-                        self.driver.get(base_url)
-                        time.sleep(3)
-                        html_content = self.driver.page_source
-                        soup = BeautifulSoup(html_content, 'html.parser')
-                        self._extract_from_page(soup, base_url, result)
-                    finally:
-                        if self.driver:
-                            self.driver.quit()
-                            self.driver = None
+                try:
+                    with get_driver_pool().lease() as driver:
+                        driver.get(base_url)
+                        PageWaiter(driver).wait_until_ready('load', baseline=3)
+                        html_content = driver.page_source
+                    soup = make_soup(html_content)
+                    self._extract_from_page(soup, base_url, result)
+                except Exception as e:
+                    logger.error(f"Selenium fallback failed: {str(e)}")
             
             # Validate and verify emails
             self._validate_emails(result)
@@ -175,8 +242,14 @@ class BrandWebsiteScraper:
             logger.error(f"Error scraping brand website: {str(e)}")
             return self._empty_result(brand_name, str(e))
     
-    def _normalize_url(self, domain_or_url):
-        """Normalize domain/URL to full URL"""
+    def _host_slot(self, url):
+        """Per-host politeness slot when a shared throttle is set, otherwise a no-op"""
+        if self.host_throttle:
+            return self.host_throttle.acquire(url)
+        return nullcontext()
+    
+    def _normalize_url(self, domain_or_url, probe=True):
+        """Normalize domain/URL to full URL (probe=False assumes https without a HEAD request)"""
         try:
             if not domain_or_url:
                 return None
@@ -186,6 +259,9 @@ class BrandWebsiteScraper:
             
             # Add protocol if missing
             if not domain_or_url.startswith(('http://', 'https://')):
+                if not probe:
+                    return f'https://{domain_or_url}'
+                
                 # Try https first
                 try:
                     test_url = f'https://{domain_or_url}'
@@ -204,52 +280,53 @@ class BrandWebsiteScraper:
     
     def _extract_from_page(self, soup, base_url, result):
         """Extract information from a page"""
+        # Materialize the page text and walk the DOM once; every extractor reads from this
+        page = PageContent(soup)
+        
         # Extract emails
-        emails = self._extract_emails(soup, base_url, result)
+        emails = self._extract_emails(page, base_url, result)
         result['data']['emails']['all_found'].extend(emails)
         
         # Extract phone numbers
-        phones = self._extract_phones(soup, result)
+        phones = self._extract_phones(page, result)
         result['data']['phone']['all_found'].extend(phones)
         
         # Extract addresses
-        address = self._extract_address(soup)
+        address = self._extract_address(page)
         if address:
             result['data']['address'] = {**result['data']['address'], **address}
         
         # Extract social media links
-        social_media = self._extract_social_media(soup, base_url)
+        social_media = self._extract_social_media(page, base_url)
         result['data']['social_media']['all_found'].extend(social_media)
         for platform, url in social_media.items():
             if url and not result['data']['social_media'].get(platform):
                 result['data']['social_media'][platform] = url
         
         # Extract company info
-        company_info = self._extract_company_info(soup)
+        company_info = self._extract_company_info(page)
         result['data']['company_info'].update(company_info)
         
         # Extract key personnel (limited - needs human verification)
-        personnel = self._extract_key_personnel(soup)
+        personnel = self._extract_key_personnel(page)
         result['data']['key_personnel'].update(personnel)
     
-    def _extract_emails(self, soup, base_url):
+    def _extract_emails(self, page, base_url, result):
         """Extract email addresses from page"""
         emails = []
         
         # Find all email patterns in text
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        page_text = soup.get_text()
-        found_emails = re.findall(email_pattern, page_text)
+        found_emails = EMAIL_PATTERN.findall(page.text)
         
         # Also check mailto links
-        mailto_links = soup.find_all('a', href=re.compile(r'^mailto:'))
-        for link in mailto_links:
-            email = link.get('href', '').replace('mailto:', '').split('?')[0]
-            if email:
-                found_emails.append(email)
+        for href in page.hrefs:
+            if href.startswith('mailto:'):
+                email = href.replace('mailto:', '').split('?')[0]
+                if email:
+                    found_emails.append(email)
         
-        # Deduplicate and filter
-        unique_emails = list(set([e.lower() for e in found_emails if '@' in e]))
+        # Deduplicate (keeping page order) and filter
+        unique_emails = list(dict.fromkeys(e.lower() for e in found_emails if '@' in e))
         
         # Categorize emails
         for email in unique_emails:
@@ -271,57 +348,43 @@ class BrandWebsiteScraper:
         
         return emails
     
-    def _extract_phones(self, soup, result=None):
+    def _extract_phones(self, page, result=None):
         """Extract phone numbers from page"""
         phones = []
         
         # Common phone patterns
-        phone_patterns = [
-            r'\+?1?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # US format
-            r'\+?\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}',  # International
-        ]
-        
-        page_text = soup.get_text()
-        for pattern in phone_patterns:
-            found_phones = re.findall(pattern, page_text)
-            phones.extend(found_phones)
+        for pattern in PHONE_PATTERNS:
+            phones.extend(pattern.findall(page.text))
         
         # Also check tel: links
-        tel_links = soup.find_all('a', href=re.compile(r'^tel:'))
-        for link in tel_links:
-            phone = link.get('href', '').replace('tel:', '').strip()
-            if phone:
-                phones.append(phone)
+        for href in page.hrefs:
+            if href.startswith('tel:'):
+                phone = href.replace('tel:', '').strip()
+                if phone:
+                    phones.append(phone)
         
         # Clean and deduplicate
         cleaned_phones = []
         for phone in phones:
-            cleaned = re.sub(r'[^\d+]', '', phone)
+            cleaned = NON_PHONE_CHARS.sub('', phone)
             if len(cleaned) >= 10:  # Minimum valid phone length
                 cleaned_phones.append(phone.strip())
         
-        unique_phones = list(set(cleaned_phones))
+        unique_phones = list(dict.fromkeys(cleaned_phones))
         
         if result and unique_phones and not result['data']['phone']['primary']:
             result['data']['phone']['primary'] = unique_phones[0]
         
         return unique_phones
     
-    def _extract_address(self, soup):
+    def _extract_address(self, page):
         """Extract physical address from page"""
         address = {}
         
         # Look for address in common locations
-        address_selectors = [
-            {'class': 'address'},
-            {'class': 'contact-address'},
-            {'id': 'address'},
-            {'itemprop': 'address'},
-        ]
-        
-        for selector in address_selectors:
+        for attr, value in ADDRESS_SELECTORS:
             try:
-                addr_elem = soup.find(**selector)
+                addr_elem = page.first(attr, value)
                 if addr_elem:
                     addr_text = addr_elem.get_text().strip()
                     # Parse address components
@@ -341,71 +404,47 @@ class BrandWebsiteScraper:
         address = {}
         
         # Extract ZIP code
-        zip_match = re.search(r'\b\d{5}(-\d{4})?\b', address_text)
+        zip_match = ZIP_PATTERN.search(address_text)
         if zip_match:
             address['zip'] = zip_match.group(0)
         
         # Extract state (US states)
-        us_states = ['AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 
-                    'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
-                    'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
-                    'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
-                    'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY']
-        
-        for state in us_states:
-            if state in address_text.upper():
+        address_upper = address_text.upper()
+        for state in US_STATES:
+            if state in address_upper:
                 address['state'] = state
                 break
         
         return address
     
-    def _extract_social_media(self, soup, base_url):
+    def _extract_social_media(self, page, base_url):
         """Extract social media links"""
         social_media = {}
         
-        # Find all links
-        links = soup.find_all('a', href=True)
-        
-        social_patterns = {
-            'linkedin': r'linkedin\.com/(?:company|in|pub)/[\w-]+',
-            'instagram': r'instagram\.com/[\w.]+',
-            'facebook': r'facebook\.com/[\w.]+',
-            'twitter': r'(?:twitter|x)\.com/[\w]+',
-            'tiktok': r'tiktok\.com/@?[\w]+',
-            'youtube': r'youtube\.com/(?:channel|c|user|@)/[\w-]+',
-            'pinterest': r'pinterest\.com/[\w]+',
-        }
-        
-        for link in links:
-            href = link.get('href', '')
-            full_url = urljoin(base_url, href)
+        for href in page.hrefs:
+            # One combined search skips the per-platform patterns for ordinary links
+            if not SOCIAL_HINT.search(href):
+                continue
             
-            for platform, pattern in social_patterns.items():
-                if re.search(pattern, href, re.IGNORECASE):
+            for platform, pattern in SOCIAL_PATTERNS:
+                if pattern.search(href):
                     if not social_media.get(platform):
                         if not href.startswith('http'):
                             social_media[platform] = f'https://{href}'
                         else:
-                            social_media[platform] = full_url
+                            social_media[platform] = urljoin(base_url, href)
                     break
         
         return social_media
     
-    def _extract_company_info(self, soup):
+    def _extract_company_info(self, page):
         """Extract company information"""
         info = {}
         
         # Extract description/about
-        desc_selectors = [
-            {'class': 'description'},
-            {'class': 'about'},
-            {'id': 'about'},
-            {'itemprop': 'description'},
-        ]
-        
-        for selector in desc_selectors:
+        for attr, value in DESCRIPTION_SELECTORS:
             try:
-                desc_elem = soup.find(**selector)
+                desc_elem = page.first(attr, value)
                 if desc_elem:
                     info['description'] = desc_elem.get_text().strip()[:500]  # Limit length
                     break
@@ -413,39 +452,129 @@ class BrandWebsiteScraper:
                 continue
         
         # Extract founded year
-        text = soup.get_text()
-        founded_match = re.search(r'founded[:\s]+(\d{4})', text, re.IGNORECASE)
+        founded_match = FOUNDED_PATTERN.search(page.text)
         if founded_match:
             info['founded'] = founded_match.group(1)
         
         # Extract industry
-        industry_keywords = ['technology', 'retail', 'ecommerce', 'fashion', 'electronics', 
-                           'food', 'health', 'beauty', 'home', 'sports', 'automotive']
-        for keyword in industry_keywords:
-            if keyword in text.lower():
+        for keyword in INDUSTRY_KEYWORDS:
+            if keyword in page.text_lower:
                 info['industry'] = keyword.capitalize()
                 break
         
         return info
     
-    def _extract_key_personnel(self, soup):
+    def _extract_key_personnel(self, page):
         """Extract key personnel (limited - needs human verification)"""
         personnel = {}
         
-        # Look for founder/CEO mentions
-        text = soup.get_text()
-        
         # Simple pattern matching (can be enhanced)
-        founder_match = re.search(r'founder[:\s]+([A-Z][a-z]+ [A-Z][a-z]+)', text, re.IGNORECASE)
+        founder_match = FOUNDER_PATTERN.search(page.text)
         if founder_match:
             personnel['founder'] = founder_match.group(1)
         
-        ceo_match = re.search(r'ceo[:\s]+([A-Z][a-z]+ [A-Z][a-z]+)', text, re.IGNORECASE)
+        ceo_match = CEO_PATTERN.search(page.text)
         if ceo_match:
             personnel['ceo'] = ceo_match.group(1)
         
         return personnel
     
+    def _crawl_concurrently(self, domain_or_url, base_url, result):
+        """
+        Fetch every candidate home/contact/about URL in parallel within the per-brand deadline.
+        The first 200 for a page type wins and aborts the other variants of that type; pages
+        are then extracted in CRAWL_PAGES order so results do not depend on response timing.
+        Returns the base URL that served the home page. Raises if no home page was fetched
+        so the caller can fall back to Selenium.
+        """
+        started = time.time()
+        deadline = started + Config.BRAND_CRAWL_DEADLINE
+        
+        # Without an explicit scheme, try https and http side by side instead of a HEAD probe
+        raw = domain_or_url.strip()
+        if raw.startswith(('http://', 'https://')):
+            bases = [base_url]
+        else:
+            bases = [f'https://{raw}', f'http://{raw}']
+        
+        done_events = {page_type: threading.Event() for page_type, _ in CRAWL_PAGES}
+        pages = {}  # page type -> (base, url, html)
+        lock = threading.Lock()
+        
+        def fetch(page_type, base, url):
+            done = done_events[page_type]
+            if done.is_set() or time.time() >= deadline:
+                return
+            timeout = max(min(5 if page_type != 'home' else 10, deadline - time.time()), 0.1)
+            response = self.session.get(url, timeout=timeout, allow_redirects=True, stream=True)
+            try:
+                if response.status_code != 200:
+                    return
+                # Read in chunks so a slow variant stops as soon as another one wins
+                chunks = []
+                for chunk in response.iter_content(chunk_size=16384):
+                    if done.is_set() or time.time() >= deadline:
+                        return
+                    chunks.append(chunk)
+                html = b''.join(chunks).decode(response.encoding or 'utf-8', errors='replace')
+            finally:
+                response.close()
+            
+            with lock:
+                if page_type not in pages:
+                    pages[page_type] = (base, url, html)
+                    done.set()
+        
+        executor = ThreadPoolExecutor(max_workers=Config.BRAND_CRAWL_WORKERS)
+        try:
+            futures = [
+                executor.submit(fetch, page_type, base, urljoin(base, path) if path else base)
+                for page_type, paths in CRAWL_PAGES
+                for base in bases
+                for path in paths
+            ]
+            pending = set(futures)
+            while pending and len(pages) < len(CRAWL_PAGES):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                finished, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    if future.exception():
+                        logger.debug(f"Page fetch failed: {str(future.exception())}")
+        finally:
+            # Stop anything still running: queued fetches are cancelled, running ones see the events
+            for event in done_events.values():
+                event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        with lock:
+            fetched = dict(pages)
+        
+        result['crawl'] = {
+            'mode': 'concurrent',
+            'pages': {page_type: fetched[page_type][1] for page_type, _ in CRAWL_PAGES if page_type in fetched},
+            'elapsed_seconds': round(time.time() - started, 2),
+            'deadline_reached': time.time() >= deadline
+        }
+        
+        if 'home' not in fetched:
+            raise Exception(f"Home page not reachable within {Config.BRAND_CRAWL_DEADLINE}s")
+        
+        # Deterministic merge: home first, then contact, then about
+        home_base = fetched['home'][0]
+        for page_type, _ in CRAWL_PAGES:
+            if page_type in fetched:
+                soup = make_soup(fetched[page_type][2])
+                self._extract_from_page(soup, home_base, result)
+        
+        if home_base != result['website_url']:
+            result['domain'] = home_base
+            result['website_url'] = home_base
+        
+        logger.info(f"Crawled {len(fetched)} pages for {home_base} in {result['crawl']['elapsed_seconds']}s")
+        return home_base
+    
     def _scrape_contact_page(self, base_url, result):
         """Scrape contact page specifically"""
         contact_urls = [
@@ -458,7 +587,7 @@ class BrandWebsiteScraper:
             try:
                 response = self.session.get(url, timeout=5)
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                    soup = make_soup(response.text)
                     self._extract_from_page(soup, base_url, result)
                     break
             except:
@@ -476,30 +605,34 @@ class BrandWebsiteScraper:
             try:
                 response = self.session.get(url, timeout=5)
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                    soup = make_soup(response.text)
                     self._extract_from_page(soup, base_url, result)
                     break
             except:
                 continue
     
     def _validate_emails(self, result):
-        """Validate email formats and verify with Hunter.io"""
-        emails = result['data']['emails']['all_found']
-        verified = []
-        
-        for email in emails:
-            # Basic format validation
+        """
+        Validate email formats and verify with Hunter.io.
+        Addresses are verified concurrently within the Hunter rate limit; whatever has no answer
+        after HUNTER_VERIFY_DEADLINE seconds is listed as unverified instead of holding up the brand.
+        """
+        # Basic format validation, deduplicated case-insensitively
+        emails = {}
+        for email in result['data']['emails']['all_found']:
             if re.match(r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}$', email):
-                # Verify with Hunter.io if available
-                try:
-                    verification = self.email_finder.verify_email(email)
-                    if verification and verification.get('is_valid'):
-                        verified.append(email)
-                except:
-                    # If verification fails, still include email but mark for verification
-                    pass
+                emails.setdefault(email.lower(), email)
+        emails = list(emails.values())
+        
+        try:
+            verifications = self.email_finder.verify_emails(emails, deadline_seconds=Config.HUNTER_VERIFY_DEADLINE)
+        except Exception as e:
+            logger.warning(f"Email verification failed: {str(e)}")
+            verifications = {}
         
+        verified = [email for email in emails if verifications.get(email, {}).get('is_valid')]
         result['data']['emails']['verified'] = verified
+        result['data']['emails']['unverified'] = [email for email in emails if email not in verifications]
         
         # Set primary email from verified list
         if verified and not result['data']['emails']['primary']:
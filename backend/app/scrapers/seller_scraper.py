@@ -1,69 +1,90 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 import time
 import re
 from urllib.parse import urlparse
+from app.config import Config
+from app.utils.html_parser import make_soup
 from app.utils.logger import get_logger
+from app.utils.page_readiness import PageWaiter
+from app.utils.webdriver_pool import get_driver_pool
 from app.services.email_finder_service import EmailFinderService
 
 logger = get_logger(__name__)
 
+# Amazon product pages have brand information in various places
+BRAND_SELECTORS = [
+    'a[href*="/s?k="]',  # Brand links
+    '.a-text-bold',  # Bold text (often brand names)
+    '[data-brand]',  # Data attribute
+    '.a-size-base-plus',  # Product title area
+    'span.a-text-bold',  # Brand spans
+]
+PRODUCT_TITLE_SELECTOR = 'h2 a.a-link-normal, .s-title-instructions-style h2 a, [data-cy="title-recipe"] a'
+
+# Look for brand patterns in HTML
+BRAND_PATTERNS = [
+    re.compile(r'data-brand="([^"]+)"', re.IGNORECASE),
+    re.compile(r'brand[:\s]+([A-Z][a-zA-Z\s]+)', re.IGNORECASE),
+    re.compile(r'"brandName":"([^"]+)"', re.IGNORECASE),
+]
+
+NON_BRAND_WORDS = frozenset([
+    'amazon', 'seller', 'store', 'shop', 'buy', 'now', 'price',
+    'shipping', 'free', 'prime', 'add', 'cart', 'wishlist',
+    'review', 'rating', 'stars', 'customer', 'product', 'item',
+    'see', 'more', 'details', 'description', 'specifications',
+    'next', 'previous', 'page', 'results', 'showing'
+])
+
+# Every candidate text plus the page HTML in one round trip instead of one per element
+COLLECT_CANDIDATES_SCRIPT = """
+var text = function (el) { return (el.innerText || el.textContent || '').replace(/\\s+/g, ' ').trim(); };
+var texts = [];
+arguments[0].forEach(function (selector) {
+    document.querySelectorAll(selector).forEach(function (el) { texts.push(text(el)); });
+});
+var titles = Array.prototype.map.call(document.querySelectorAll(arguments[1]), text);
+return {texts: texts, titles: titles, html: document.documentElement.outerHTML};
+"""
+
 class SellerScraper:
     """Seller Scraper - 70% Automated Seller Sniping"""
     
     def __init__(self):
         self.driver = None
+        self.waiter = None
+        self.last_wait_stats = {}  # readiness counters from the most recent scrape
         self.email_finder = EmailFinderService()
     
-    def _setup_driver(self):
-        """Setup Selenium WebDriver"""
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        except Exception as e:
-            logger.error(f"Error setting up Chrome driver: {str(e)}")
-            raise
-    
     def scrape(self, url):
         """Scrape seller information from Amazon"""
         try:
-            if not self.driver:
-                self._setup_driver()
-            
-            logger.info(f"Navigating to: {url}")
-            self.driver.get(url)
-            time.sleep(3)  # Wait for page load
-            
-            # Extract seller information
-            seller_data = {
-                'name': self._extract_seller_name(),
-                'email': self._extract_email(),
-                'store_url': url,
-                'phone': self._extract_phone(),
-                'created_at': time.strftime('%Y-%m-%d %H:%M:%S')
-            }
+            with get_driver_pool().lease() as driver:
+                self.driver = driver
+                self.waiter = PageWaiter(driver)
+                
+                logger.info(f"Navigating to: {url}")
+                self.driver.get(url)
+                self.waiter.wait_until_ready('load', baseline=3)
+                
+                # Extract seller information
+                seller_data = {
+                    'name': self._extract_seller_name(),
+                    'email': self._extract_email(),
+                    'store_url': url,
+                    'phone': self._extract_phone(),
+                    'created_at': time.strftime('%Y-%m-%d %H:%M:%S')
+                }
             
             return seller_data
-            
+        
         except Exception as e:
             logger.error(f"Error scraping seller: {str(e)}")
             raise
         finally:
-            if self.driver:
-                self.driver.quit()
-                self.driver = None
+            self._finish_lease()
     
     def _extract_seller_name(self):
         """Extract seller name from page"""
@@ -123,148 +144,138 @@ class SellerScraper:
         Returns list of unique brand names found
         """
         try:
-            if not self.driver:
-                self._setup_driver()
-            
-            logger.info(f"🤖 Scraping seller storefront for brands: {seller_url}")
-            brands_found = set()  # Use set to avoid duplicates
-            
-            # Navigate to seller storefront
-            self.driver.get(seller_url)
-            time.sleep(3)
-            
-            # Extract brands from current page
-            page_brands = self._extract_brands_from_page()
-            brands_found.update(page_brands)
-            
-            # Navigate through multiple pages if available
-            for page_num in range(2, max_pages + 1):
-                try:
-                    # Try to find and click "Next" button
-                    next_button = self.driver.find_elements(
-                        By.CSS_SELECTOR, 
-                        'a[aria-label="Next"], .pagnNext, [data-page="next"], .a-pagination .a-last a'
-                    )
-                    
-                    if next_button and next_button[0].is_displayed():
-                        next_button[0].click()
-                        time.sleep(3)  # Wait for page load
+            with get_driver_pool().lease() as driver:
+                self.driver = driver
+                self.waiter = PageWaiter(driver)
+                
+                logger.info(f"🤖 Scraping seller storefront for brands: {seller_url}")
+                brands_found = set()  # Use set to avoid duplicates
+                
+                # Navigate to seller storefront
+                self.driver.get(seller_url)
+                self.waiter.wait_until_ready('load', baseline=3)
+                
+                # Extract brands from current page
+                page_brands = self._extract_brands_from_page()
+                brands_found.update(page_brands)
+                
+                # Navigate through multiple pages if available
+                for page_num in range(2, max_pages + 1):
+                    try:
+                        # Try to find and click "Next" button
+                        next_button = self.driver.find_elements(
+                            By.CSS_SELECTOR, 
+                            'a[aria-label="Next"], .pagnNext, [data-page="next"], .a-pagination .a-last a'
+                        )
                         
-                        # Extract brands from this page
-                        page_brands = self._extract_brands_from_page()
-                        brands_found.update(page_brands)
-                        logger.info(f"📦 Page {page_num}: Found {len(page_brands)} brands")
-                    else:
-                        logger.info(f"⏹️ No more pages. Stopped at page {page_num - 1}")
+                        if next_button and next_button[0].is_displayed():
+                            self.waiter.mark()
+                            next_button[0].click()
+                            self.waiter.wait_until_ready('next_page', baseline=3, require_change=True)
+                            
+                            # Extract brands from this page
+                            page_brands = self._extract_brands_from_page()
+                            brands_found.update(page_brands)
+                            logger.info(f"📦 Page {page_num}: Found {len(page_brands)} brands")
+                        else:
+                            logger.info(f"⏹️ No more pages. Stopped at page {page_num - 1}")
+                            break
+                    except Exception as e:
+                        logger.warning(f"Error navigating to page {page_num}: {str(e)}")
                         break
-                except Exception as e:
-                    logger.warning(f"Error navigating to page {page_num}: {str(e)}")
-                    break
-            
-            brands_list = list(brands_found)
-            logger.info(f"✅ Extracted {len(brands_list)} unique brands from seller storefront")
-            return brands_list
-            
+                
+                brands_list = list(brands_found)
+                logger.info(f"✅ Extracted {len(brands_list)} unique brands from seller storefront")
+                return brands_list
+        
         except Exception as e:
             logger.error(f"Error extracting brands from storefront: {str(e)}")
             return []
         finally:
-            if self.driver:
-                self.driver.quit()
-                self.driver = None
+            self._finish_lease()
+    
+    def _finish_lease(self):
+        """Keep the readiness counters and drop the references to the returned browser"""
+        if self.waiter:
+            self.last_wait_stats = self.waiter.get_stats()
+        self.driver = None
+        self.waiter = None
     
     def _extract_brands_from_page(self):
         """Extract brand names from current page"""
         try:
-            brands = set()
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Method 1: Extract from product brand links/attributes
-            # Amazon product pages have brand information in various places
-            brand_selectors = [
-                'a[href*="/s?k="]',  # Brand links
-                '.a-text-bold',  # Bold text (often brand names)
-                '[data-brand]',  # Data attribute
-                '.a-size-base-plus',  # Product title area
-                'span.a-text-bold',  # Brand spans
-            ]
-            
-            for selector in brand_selectors:
+            candidates = None
+            if Config.SELLER_PAGE_EXTRACTION != 'offline':
                 try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        text = element.text.strip()
-                        # Filter out common non-brand text
-                        if text and len(text) > 2 and len(text) < 50:
-                            # Check if it looks like a brand name
-                            if self._is_likely_brand_name(text):
-                                brands.add(text)
-                except:
-                    continue
-            
-            # Method 2: Extract from product titles (brand is often first word/phrase)
-            try:
-                product_titles = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    'h2 a.a-link-normal, .s-title-instructions-style h2 a, [data-cy="title-recipe"] a'
-                )
-                
-                for title_element in product_titles:
-                    title_text = title_element.text.strip()
-                    # Extract brand from title (usually first 1-3 words)
-                    if title_text:
-                        words = title_text.split()
-                        # Try first word, first two words, first three words
-                        for word_count in [1, 2, 3]:
-                            if len(words) >= word_count:
-                                potential_brand = ' '.join(words[:word_count])
-                                if self._is_likely_brand_name(potential_brand):
-                                    brands.add(potential_brand)
-            except:
-                pass
-            
-            # Method 3: Extract from page source using regex
-            try:
-                page_text = self.driver.page_source
-                # Look for brand patterns in HTML
-                brand_patterns = [
-                    r'data-brand="([^"]+)"',
-                    r'brand[:\s]+([A-Z][a-zA-Z\s]+)',
-                    r'"brandName":"([^"]+)"',
-                ]
-                
-                for pattern in brand_patterns:
-                    matches = re.findall(pattern, page_text, re.IGNORECASE)
-                    for match in matches:
-                        if self._is_likely_brand_name(match):
-                            brands.add(match.strip())
-            except:
-                pass
-            
-            return list(brands)
+                    candidates = self._collect_candidates_script()
+                except Exception as e:
+                    logger.warning(f"Script extraction failed, parsing page source instead: {str(e)}")
+            if candidates is None:
+                candidates = self._collect_candidates_offline(self.driver.page_source)
             
+            return list(self._brands_from_candidates(candidates))
+        
         except Exception as e:
             logger.error(f"Error extracting brands from page: {str(e)}")
             return []
     
+    def _collect_candidates_script(self):
+        """Candidate texts and page HTML in a single WebDriver round trip"""
+        return self.driver.execute_script(COLLECT_CANDIDATES_SCRIPT, BRAND_SELECTORS, PRODUCT_TITLE_SELECTOR)
+    
+    def _collect_candidates_offline(self, html):
+        """Same candidates as the script, read from one parse of the page source"""
+        soup = make_soup(html)
+        
+        def text(element):
+            return ' '.join(element.get_text(' ').split())
+        
+        return {
+            'texts': [text(element) for selector in BRAND_SELECTORS for element in soup.select(selector)],
+            'titles': [text(element) for element in soup.select(PRODUCT_TITLE_SELECTOR)],
+            'html': html
+        }
+    
+    def _brands_from_candidates(self, candidates):
+        """Apply the brand heuristics to collected candidates"""
+        brands = set()
+        
+        # Method 1: Extract from product brand links/attributes
+        for text in candidates['texts']:
+            # Filter out common non-brand text
+            if text and len(text) > 2 and len(text) < 50:
+                # Check if it looks like a brand name
+                if self._is_likely_brand_name(text):
+                    brands.add(text)
+        
+        # Method 2: Extract from product titles (brand is often first word/phrase)
+        for title_text in candidates['titles']:
+            # Extract brand from title (usually first 1-3 words)
+            words = title_text.split()
+            # Try first word, first two words, first three words
+            for word_count in [1, 2, 3]:
+                if len(words) >= word_count:
+                    potential_brand = ' '.join(words[:word_count])
+                    if self._is_likely_brand_name(potential_brand):
+                        brands.add(potential_brand)
+        
+        # Method 3: Extract from page source using regex
+        for pattern in BRAND_PATTERNS:
+            for match in pattern.findall(candidates['html']):
+                if self._is_likely_brand_name(match):
+                    brands.add(match.strip())
+        
+        return brands
+    
     def _is_likely_brand_name(self, text):
         """Check if text is likely a brand name"""
         if not text or len(text) < 2:
             return False
         
-        # Filter out common non-brand words
-        non_brand_words = [
-            'amazon', 'seller', 'store', 'shop', 'buy', 'now', 'price', 
-            'shipping', 'free', 'prime', 'add', 'cart', 'wishlist',
-            'review', 'rating', 'stars', 'customer', 'product', 'item',
-            'see', 'more', 'details', 'description', 'specifications',
-            'next', 'previous', 'page', 'results', 'showing'
-        ]
-        
         text_lower = text.lower().strip()
         
         # Check if it's a non-brand word
-        if text_lower in non_brand_words:
+        if text_lower in NON_BRAND_WORDS:
             return False
         
         # Check if it's too long (likely not a brand)
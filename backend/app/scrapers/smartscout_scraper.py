@@ -2,61 +2,89 @@
 SmartScout Automation Scraper
 Automates brand extraction from SmartScout platform
 """
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import Select
-from bs4 import BeautifulSoup
 import time
 import re
+from app.utils.html_parser import make_soup
 from app.utils.logger import get_logger
+from app.utils.page_readiness import PageWaiter
+from app.utils.webdriver_pool import get_driver_pool
 from app.config import Config
 
 logger = get_logger(__name__)
 
+BRAND_ELEMENT_SELECTOR = ".brand-item, .brand-card, [data-brand], .brand-row, tr[data-brand-id]"
+
+# Field -> CSS selector inside a brand element (first match in document order, like find_element)
+ROW_FIELD_SELECTORS = {
+    'name': ".brand-name, .name, [data-brand-name], h3, h4, .title, td:first-child",
+    'domain': ".domain, .website, [data-domain], a[href*='http']",
+    'revenue': ".revenue, [data-revenue], .sales",
+    'products': ".products, .product-count, [data-products]",
+    'category': ".category, [data-category]",
+    'country': ".country, [data-country], .flag",
+    'brand_url': "a"
+}
+
+# Reads every brand row not returned before in one round trip and tags it with the brand name
+# it showed, so each scroll only pays for the rows it appended. A row node that a virtualized
+# list or the next page re-renders with another brand no longer matches its tag and is read again
+EXTRACT_NEW_ROWS_SCRIPT = """
+var rows = document.querySelectorAll(arguments[0]), fields = arguments[1], out = [];
+var text = function (el) { return el ? (el.innerText || el.textContent || '').trim() : ''; };
+for (var i = 0; i < rows.length; i++) {
+    var row = rows[i];
+    var pick = function (field) { return row.querySelector(fields[field]); };
+    var name = text(pick('name'));
+    if (row.getAttribute('data-ss-extracted') === name) { continue; }
+    row.setAttribute('data-ss-extracted', name);
+    var domain = pick('domain'), country = pick('country'), link = pick('brand_url');
+    out.push({
+        name: name,
+        domain: domain ? (domain.href || text(domain)) : '',
+        revenue: text(pick('revenue')),
+        products: text(pick('products')),
+        category: text(pick('category')),
+        country: country ? (text(country) || country.getAttribute('title') || '') : '',
+        brand_url: link ? (link.href || '') : ''
+    });
+}
+return out;
+"""
+
+COUNT_NEW_ROWS_SCRIPT = """
+var rows = document.querySelectorAll(arguments[0]), count = 0;
+var text = function (el) { return el ? (el.innerText || el.textContent || '').trim() : ''; };
+for (var i = 0; i < rows.length; i++) {
+    if (rows[i].getAttribute('data-ss-extracted') !== text(rows[i].querySelector(arguments[1]))) { count++; }
+}
+return count;
+"""
+
 class SmartScoutScraper:
     """SmartScout automation scraper for brand extraction"""
     
     def __init__(self):
         self.driver = None
+        self.waiter = None
+        self._read_offline = False
         self.smartscout_url = "https://app.smartscout.com"  # Update with actual URL
         self.smartscout_username = Config.SMARTSCOUT_USERNAME if hasattr(Config, 'SMARTSCOUT_USERNAME') else None
         self.smartscout_password = Config.SMARTSCOUT_PASSWORD if hasattr(Config, 'SMARTSCOUT_PASSWORD') else None
     
-    def _setup_driver(self, headless=False):
-        """Setup Selenium WebDriver"""
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-        
-        try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            logger.info("Chrome driver initialized")
-            return True
-        except Exception as e:
-            logger.error(f"Error setting up Chrome driver: {str(e)}")
-            raise
-    
     def login(self):
         """Login to SmartScout"""
         try:
             if not self.driver:
-                self._setup_driver()
+                raise Exception('No browser leased - call login() from run_automation()')
             
             logger.info("Navigating to SmartScout...")
             self.driver.get(self.smartscout_url)
-            time.sleep(3)
+            self.waiter.wait_until_ready('load', baseline=3)
             
             # Wait for login form
             wait = WebDriverWait(self.driver, 10)
@@ -75,10 +103,11 @@ class SmartScoutScraper:
             
             # Click login button
             login_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit'], .login-button, [data-testid='login-button']")
+            self.waiter.mark()
             login_button.click()
             
             # Wait for dashboard
-            time.sleep(5)
+            self.waiter.wait_until_ready('login', baseline=5, require_change=True)
             logger.info("Login successful")
             return True
             
@@ -114,8 +143,9 @@ class SmartScoutScraper:
                 filter_button = wait.until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, ".filter-button, [data-testid='filter-button'], .filters-toggle"))
                 )
+                self.waiter.mark()
                 filter_button.click()
-                time.sleep(2)
+                self.waiter.wait_until_ready('filters', baseline=2, require_change=True)
             except:
                 logger.warning("Filter button not found, trying direct navigation")
             
@@ -156,8 +186,9 @@ class SmartScoutScraper:
             # Click apply filters button
             try:
                 apply_button = self.driver.find_element(By.CSS_SELECTOR, "button.apply-filters, [data-testid='apply-filters'], .apply-button")
+                self.waiter.mark()
                 apply_button.click()
-                time.sleep(3)
+                self.waiter.wait_until_ready('results', baseline=3, require_change=True)
             except:
                 logger.warning("Apply button not found, filters may auto-apply")
             
@@ -169,66 +200,59 @@ class SmartScoutScraper:
             return False
     
     def extract_brands(self, count=100, scroll_delay=2):
-        """Extract brands from SmartScout"""
+        """
+        Extract brands from SmartScout
+        scroll_delay is the fixed per-scroll delay this used to sleep; scrolls now wait for
+        the page to settle and scroll_delay is only the baseline for time-saved reporting
+        """
+        brands = []
         try:
             logger.info(f"Extracting {count} brands...")
-            brands = []
-            
-            wait = WebDriverWait(self.driver, 10)
             
             # Wait for brand list to load
-            time.sleep(3)
+            self.waiter.wait_until_ready('results', baseline=3, selector=BRAND_ELEMENT_SELECTOR)
             
             # Scroll and extract brands
-            extracted_count = 0
+            seen_names = set()  # avoid duplicates in same session
+            self._read_offline = False  # set once the row script fails; page_source is parsed instead
             scroll_attempts = 0
             max_scroll_attempts = 50  # Prevent infinite scrolling
             
-            while extracted_count < count and scroll_attempts < max_scroll_attempts:
-                # Get current page source
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            while len(brands) < count and scroll_attempts < max_scroll_attempts:
+                # Only rows not read before (the script tags the rows it returns with their name)
+                rows = self._read_new_rows()
                 
-                # Find brand elements (adjust selectors based on actual SmartScout structure)
-                brand_elements = self.driver.find_elements(
-                    By.CSS_SELECTOR, 
-                    ".brand-item, .brand-card, [data-brand], .brand-row, tr[data-brand-id]"
-                )
-                
-                # Extract brand data
-                for element in brand_elements:
-                    if extracted_count >= count:
+                batch = 0
+                for row in rows:
+                    if len(brands) >= count:
                         break
                     
-                    try:
-                        brand_data = self._extract_brand_data(element)
-                        if brand_data and brand_data.get('name'):
-                            # Check if already extracted (avoid duplicates in same session)
-                            if not any(b['name'] == brand_data['name'] for b in brands):
-                                brands.append(brand_data)
-                                extracted_count += 1
-                                logger.info(f"Extracted brand {extracted_count}: {brand_data.get('name')}")
-                    except Exception as e:
-                        logger.warning(f"Error extracting brand data: {str(e)}")
-                        continue
+                    brand_data = self._build_brand_data(row)
+                    if brand_data and brand_data['name'] and brand_data['name'] not in seen_names:
+                        seen_names.add(brand_data['name'])
+                        brands.append(brand_data)
+                        batch += 1
+                
+                if rows:
+                    logger.info(f"Extracted {batch} brands from {len(rows)} new rows ({len(brands)} total)")
                 
                 # Scroll down to load more brands
-                if extracted_count < count:
+                if len(brands) < count:
+                    self.waiter.mark()
                     self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(scroll_delay)
+                    # Settles as soon as lazy-loaded rows (if any) have arrived
+                    self.waiter.wait_until_ready('scroll', baseline=scroll_delay)
                     scroll_attempts += 1
                     
                     # Check if new content loaded
-                    new_brand_elements = self.driver.find_elements(
-                        By.CSS_SELECTOR,
-                        ".brand-item, .brand-card, [data-brand], .brand-row, tr[data-brand-id]"
-                    )
-                    if len(new_brand_elements) == len(brand_elements):
+                    if not self._count_new_rows(seen_names):
                         # No new content, try clicking "Load More" if available
                         try:
                             load_more = self.driver.find_element(By.CSS_SELECTOR, ".load-more, [data-testid='load-more'], .next-page")
                             if load_more.is_displayed():
+                                self.waiter.mark()
                                 load_more.click()
-                                time.sleep(3)
+                                self.waiter.wait_until_ready('load_more', baseline=3, require_change=True)
                         except:
                             logger.info("No more brands to load")
                             break
@@ -240,83 +264,70 @@ class SmartScoutScraper:
             logger.error(f"Error extracting brands: {str(e)}")
             return brands  # Return whatever we got
     
-    def _extract_brand_data(self, element):
-        """Extract brand data from a single brand element"""
+    def _read_new_rows(self):
+        """Field values of the brand rows not returned before, parsing page_source if the script fails"""
+        if Config.SMARTSCOUT_ROW_EXTRACTION != 'offline' and not self._read_offline:
+            try:
+                return self.driver.execute_script(EXTRACT_NEW_ROWS_SCRIPT, BRAND_ELEMENT_SELECTOR, ROW_FIELD_SELECTORS)
+            except Exception as e:
+                logger.warning(f"Script extraction failed, parsing page source instead: {str(e)}")
+                self._read_offline = True
+        
+        # Rows cannot be tagged in a parsed copy, so every row is returned and the caller skips seen names
+        return self._collect_rows_offline(self.driver.page_source)
+    
+    def _count_new_rows(self, seen_names):
+        """Number of brand rows not read yet (offline: rows with a name not seen yet)"""
+        if Config.SMARTSCOUT_ROW_EXTRACTION != 'offline' and not self._read_offline:
+            return self.driver.execute_script(COUNT_NEW_ROWS_SCRIPT, BRAND_ELEMENT_SELECTOR, ROW_FIELD_SELECTORS['name'])
+        return sum(1 for row in self._collect_rows_offline(self.driver.page_source)
+                   if row['name'] and row['name'] not in seen_names)
+    
+    def _collect_rows_offline(self, html):
+        """Same field values as EXTRACT_NEW_ROWS_SCRIPT, read from one parse of the page source"""
+        soup = make_soup(html)
+        
+        def text(element):
+            return ' '.join(element.get_text(' ').split()) if element else ''
+        
+        rows = []
+        for element in soup.select(BRAND_ELEMENT_SELECTOR):
+            picked = {field: element.select_one(selector) for field, selector in ROW_FIELD_SELECTORS.items()}
+            domain, country, link = picked['domain'], picked['country'], picked['brand_url']
+            rows.append({
+                'name': text(picked['name']),
+                'domain': (domain.get('href') or text(domain)) if domain else '',
+                'revenue': text(picked['revenue']),
+                'products': text(picked['products']),
+                'category': text(picked['category']),
+                'country': (text(country) or country.get('title', '')) if country else '',
+                'brand_url': link.get('href', '') if link else ''
+            })
+        return rows
+    
+    def _build_brand_data(self, row):
+        """Build brand data from the raw field values the row script returned for one brand element"""
         try:
             brand_data = {
-                'name': '',
-                'domain': '',
-                'revenue': '',
+                'name': row.get('name', ''),
+                'domain': self._clean_domain(row.get('domain', '')),
+                'revenue': row.get('revenue', ''),
                 'products_count': 0,
-                'category': '',
-                'country': '',
-                'brand_url': '',
+                'category': row.get('category', ''),
+                'country': row.get('country', ''),
+                'brand_url': row.get('brand_url', ''),
                 'extracted_at': time.strftime('%Y-%m-%d %H:%M:%S')
             }
             
-            # Extract brand name (try multiple selectors)
-            name_selectors = [
-                ".brand-name, .name, [data-brand-name], h3, h4, .title, td:first-child"
-            ]
-            for selector in name_selectors:
-                try:
-                    name_elem = element.find_element(By.CSS_SELECTOR, selector)
-                    brand_data['name'] = name_elem.text.strip()
-                    break
-                except:
-                    continue
-            
-            # Extract domain
-            try:
-                domain_elem = element.find_element(By.CSS_SELECTOR, ".domain, .website, [data-domain], a[href*='http']")
-                domain_url = domain_elem.get_attribute('href') or domain_elem.text.strip()
-                brand_data['domain'] = self._clean_domain(domain_url)
-            except:
-                pass
-            
-            # Extract revenue
-            try:
-                revenue_elem = element.find_element(By.CSS_SELECTOR, ".revenue, [data-revenue], .sales")
-                brand_data['revenue'] = revenue_elem.text.strip()
-            except:
-                pass
-            
-            # Extract product count
-            try:
-                products_elem = element.find_element(By.CSS_SELECTOR, ".products, .product-count, [data-products]")
-                products_text = products_elem.text.strip()
-                # Extract number from text
-                numbers = re.findall(r'\d+', products_text)
-                if numbers:
-                    brand_data['products_count'] = int(numbers[0])
-            except:
-                pass
-            
-            # Extract category
-            try:
-                category_elem = element.find_element(By.CSS_SELECTOR, ".category, [data-category]")
-                brand_data['category'] = category_elem.text.strip()
-            except:
-                pass
-            
-            # Extract country
-            try:
-                country_elem = element.find_element(By.CSS_SELECTOR, ".country, [data-country], .flag")
-                brand_data['country'] = country_elem.text.strip() or country_elem.get_attribute('title')
-            except:
-                pass
-            
-            # Extract brand URL (link to brand page)
-            try:
-                link_elem = element.find_element(By.CSS_SELECTOR, "a")
-                brand_data['brand_url'] = link_elem.get_attribute('href')
-            except:
-                pass
+            # Extract number from product count text
+            numbers = re.findall(r'\d+', row.get('products', ''))
+            if numbers:
+                brand_data['products_count'] = int(numbers[0])
             
             return brand_data
             
         except Exception as e:
-            logger.warning(f"Error extracting brand data from element: {str(e)}")
+            logger.warning(f"Error extracting brand data from row: {str(e)}")
             return None
     
     def _clean_domain(self, url_or_domain):
@@ -343,34 +354,36 @@ class SmartScoutScraper:
         try:
             logger.info("Starting SmartScout automation...")
             
-            # Setup driver
-            if not self._setup_driver(headless=False):  # Set to True for production
-                return {'success': False, 'error': 'Failed to setup driver'}
-            
-            # Login
-            if not self.login():
-                return {'success': False, 'error': 'Failed to login'}
-            
-            # Apply filters
-            if not self.apply_filters(filters):
-                logger.warning("Failed to apply filters, continuing anyway...")
-            
-            # Extract brands
-            brands = self.extract_brands(count=brand_count)
+            # Lease a browser from the shared pool (cookies are cleared when it is returned)
+            with get_driver_pool().lease() as driver:
+                self.driver = driver
+                self.waiter = PageWaiter(driver)
+                
+                # Login
+                if not self.login():
+                    return {'success': False, 'error': 'Failed to login'}
+                
+                # Apply filters
+                if not self.apply_filters(filters):
+                    logger.warning("Failed to apply filters, continuing anyway...")
+                
+                # Extract brands
+                brands = self.extract_brands(count=brand_count)
             
-            logger.info(f"Automation completed. Extracted {len(brands)} brands")
+            wait_stats = self.waiter.get_stats()
+            logger.info(f"Automation completed. Extracted {len(brands)} brands, "
+                        f"{wait_stats['time_saved_seconds']}s saved over fixed sleeps")
             
             return {
                 'success': True,
                 'brands': brands,
-                'count': len(brands)
+                'count': len(brands),
+                'wait_stats': wait_stats
             }
             
         except Exception as e:
             logger.error(f"Error in SmartScout automation: {str(e)}")
             return {'success': False, 'error': str(e)}
         finally:
-            if self.driver:
-                self.driver.quit()
-                self.driver = None
-
+            self.driver = None
+            self.waiter = None
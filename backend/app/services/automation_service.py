@@ -2,8 +2,15 @@ from app.services.google_sheets_service import GoogleSheetsService
 from app.services.duplicate_detector_service import DuplicateDetectorService
 from app.services.data_validation_service import DataValidationService
 from app.services.reporting_service import ReportingService
+from app.services.report_aggregation_service import ReportAggregationService
+from app.models.seller import Seller
+from app.models.brand import Brand
+from app.models.qa_analysis import QAAnalysis
 from app.scrapers.smartscout_scraper import SmartScoutScraper
 from app.utils.logger import get_logger
+from app.utils.step_graph import Step, StepGraph
+from app.config import Config
+from flask import current_app, has_app_context
 from datetime import datetime
 
 logger = get_logger(__name__)
@@ -16,48 +23,86 @@ class AutomationService:
         self.duplicate_detector = DuplicateDetectorService()
         self.data_validator = DataValidationService()
         self.reporting_service = ReportingService()
+        self.aggregations = ReportAggregationService()
         self.smartscout_scraper = SmartScoutScraper()
     
-    def morning_setup(self, smartscout_enabled=True, brand_count=100):
-        """Automated morning setup tasks - 90% Automated"""
+    def _run_graph(self, steps, tracker):
+        """Run pipeline steps on the step graph (in this app's context) and log the timing breakdown"""
+        app = current_app._get_current_object() if has_app_context() else None
+        graph = StepGraph(
+            steps,
+            max_workers=Config.AUTOMATION_STEP_WORKERS,
+            default_timeout=Config.AUTOMATION_STEP_TIMEOUT,
+            app=app
+        )
+        results, timings = graph.run(tracker)
+        breakdown = ', '.join(f"{name} {timing['duration_seconds']}s" for name, timing in timings.items() if name != 'total_seconds')
+        logger.info(f"⏱️ Pipeline finished in {timings['total_seconds']}s ({breakdown})")
+        return results, timings
+    
+    def morning_setup(self, smartscout_enabled=True, brand_count=100, tracker=None):
+        """
+        Automated morning setup tasks - 90% Automated
+        SmartScout -> Google Sheets -> duplicate flagging runs alongside the account check; the
+        spreadsheet refresh and validation read the sheets, so they start once the brands are written
+        """
         try:
             logger.info("Starting morning setup automation...")
-            results = {
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'smartscout_extraction': None,
-                'google_sheets_population': None,
-                'duplicate_detection': None,
-                'account_auth': self._check_account_authentication(),
-            }
             
-            # Step 1: SmartScout Automation (90% Automated)
+            def smartscout_succeeded(results):
+                return bool((results.get('smartscout_extraction') or {}).get('success'))
+            
+            after_population = ['google_sheets_population'] if smartscout_enabled else []
+            steps = [
+                Step('account_auth', lambda r: self._check_account_authentication(), retries=1),
+                # Read the sheets whether or not population succeeded, as they did before the graph
+                Step('spreadsheet_updates', lambda r: self._update_spreadsheets(), after=after_population, retries=1,
+                     run_after_failure=True),
+                Step('data_validation', lambda r: self._validate_all_data(), after=after_population, retries=1,
+                     run_after_failure=True)
+            ]
+            
+            # Step 1: SmartScout Automation (90% Automated), then populate Google Sheets and flag duplicates
             if smartscout_enabled:
-                logger.info("🤖 Starting SmartScout automation...")
-                smartscout_result = self._run_smartscout_automation(brand_count)
-                results['smartscout_extraction'] = smartscout_result
-                
-                if smartscout_result.get('success'):
-                    brands = smartscout_result.get('brands', [])
-                    logger.info(f"✅ Extracted {len(brands)} brands from SmartScout")
-                    
-                    # Step 2: Populate Google Sheets
-                    logger.info("📊 Populating Google Sheets...")
-                    sheets_result = self._populate_google_sheets(brands)
-                    results['google_sheets_population'] = sheets_result
-                    
-                    # Step 3: Check for duplicates and flag them
-                    logger.info("🔍 Checking for duplicates...")
-                    duplicate_result = self._detect_and_flag_duplicates()
-                    results['duplicate_detection'] = duplicate_result
-                else:
-                    logger.error(f"❌ SmartScout automation failed: {smartscout_result.get('error')}")
+                steps += [
+                    Step(
+                        'smartscout_extraction',
+                        lambda r: self._run_smartscout_automation(brand_count),
+                        timeout=Config.AUTOMATION_SMARTSCOUT_TIMEOUT
+                    ),
+                    # Not retried: a second attempt would append the same rows again
+                    Step(
+                        'google_sheets_population',
+                        lambda r: self._populate_google_sheets(r['smartscout_extraction'].get('brands', [])),
+                        after=['smartscout_extraction'],
+                        when=smartscout_succeeded
+                    ),
+                    Step(
+                        'duplicate_detection',
+                        lambda r: self._detect_and_flag_duplicates(),
+                        after=['google_sheets_population'],
+                        when=smartscout_succeeded,
+                        retries=1,
+                        side_effects=True  # flags rows in the sheets
+                    )
+                ]
             else:
                 logger.info("⏭️ SmartScout automation skipped")
-                results['smartscout_extraction'] = {'success': False, 'reason': 'disabled'}
             
-            # Additional tasks
-            results['spreadsheet_updates'] = self._update_spreadsheets()
-            results['data_validation'] = self._validate_all_data()
+            step_results, timings = self._run_graph(steps, tracker)
+            results = {
+                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'smartscout_extraction': {'success': False, 'reason': 'disabled'},
+                **step_results,
+                'step_timings': timings,
+                'sheets_cache': self.sheets_service.cache_stats()
+            }
+            
+            smartscout_result = results['smartscout_extraction']
+            if smartscout_succeeded(results):
+                logger.info(f"✅ Extracted {len(smartscout_result.get('brands', []))} brands from SmartScout")
+            elif smartscout_enabled:
+                logger.error(f"❌ SmartScout automation failed: {smartscout_result.get('error')}")
             
             logger.info("✅ Morning setup completed successfully")
             return results
@@ -89,65 +134,72 @@ class AutomationService:
             return {'success': False, 'error': str(e)}
     
     def _populate_google_sheets(self, brands):
-        """Populate Google Sheets with extracted brands"""
+        """Populate Google Sheets with extracted brands (buffered append_rows calls, not one request per brand)"""
         try:
             if not brands:
                 return {'status': 'skipped', 'reason': 'No brands to populate'}
+            if not self.sheets_service.sheet:
+                return {'status': 'skipped', 'reason': 'Google Sheets not configured'}
             
-            saved_count = 0
-            failed_count = 0
-            
-            for brand in brands:
-                try:
-                    # Save brand to Google Sheets
-                    self.sheets_service.save_brand(brand)
-                    saved_count += 1
-                except Exception as e:
-                    logger.warning(f"Failed to save brand {brand.get('name')}: {str(e)}")
-                    failed_count += 1
+            with self.sheets_service.batch_writer('Brands') as writer:
+                for brand in brands:
+                    writer.add(self.sheets_service.brand_row(brand))
+            stats = writer.get_stats()
             
+            logger.info(f"✅ Appended {stats['rows']} brands to Google Sheets in {stats['api_calls']} call(s) ({stats['rows_per_second']} rows/s)")
             return {
                 'status': 'completed',
-                'saved': saved_count,
-                'failed': failed_count,
-                'total': len(brands)
+                'saved': stats['rows'],
+                'failed': stats['failed'],
+                'total': len(brands),
+                'api_calls': stats['api_calls'],
+                'seconds': stats['seconds'],
+                'rows_per_second': stats['rows_per_second']
             }
             
         except Exception as e:
             logger.error(f"Error populating Google Sheets: {str(e)}")
             return {'status': 'error', 'error': str(e)}
     
-    def end_of_day_tasks(self):
+    def end_of_day_tasks(self, tracker=None):
         """
         End of Day Automation - 100% Automated
-        Bot compiles all day's work, generates report, creates charts, emails manager
+        Bot compiles all day's work, then generates the report and the charts side by side, then emails manager
         """
         try:
             logger.info("🤖 Starting 100% automated end of day tasks...")
             
-            # Step 1: Bot compiles all day's work
-            logger.info("📊 Step 1: Compiling all day's work...")
-            daily_work = self._compile_daily_work()
-            
-            # Step 2: Bot generates daily report
-            logger.info("📝 Step 2: Generating daily report...")
-            daily_report = self._generate_comprehensive_daily_report(daily_work)
-            
-            # Step 3: Bot creates charts/graphs
-            logger.info("📈 Step 3: Creating charts and graphs...")
-            charts_data = self._create_charts_and_graphs(daily_work)
-            
-            # Step 4: Bot emails report to manager
-            logger.info("📧 Step 4: Emailing report to manager...")
-            email_result = self._email_daily_report(daily_report, charts_data)
+            steps = [
+                # Step 1: Bot compiles all day's work
+                Step('daily_work_compiled', lambda r: self._compile_daily_work(), retries=1),
+                # Step 2: Bot generates daily report
+                Step(
+                    'daily_report',
+                    lambda r: self._generate_comprehensive_daily_report(r['daily_work_compiled']),
+                    after=['daily_work_compiled'],
+                    retries=1
+                ),
+                # Step 3: Bot creates charts/graphs
+                Step(
+                    'charts_data',
+                    lambda r: self._create_charts_and_graphs(r['daily_work_compiled']),
+                    after=['daily_work_compiled'],
+                    retries=1
+                ),
+                # Step 4: Bot emails report to manager (not retried, so nobody gets the report twice)
+                Step(
+                    'report_sent',
+                    lambda r: self._email_daily_report(r['daily_report'], r['charts_data']),
+                    after=['daily_report', 'charts_data']
+                )
+            ]
+            step_results, timings = self._run_graph(steps, tracker)
             
             results = {
                 'automation_percentage': 100,
                 'needs_human_review': False,
-                'daily_work_compiled': daily_work,
-                'daily_report': daily_report,
-                'charts_data': charts_data,
-                'report_sent': email_result,
+                **step_results,
+                'step_timings': timings,
                 'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             }
             
@@ -162,55 +214,41 @@ class AutomationService:
         """Bot compiles all day's work - 100% Automated"""
         try:
             today = datetime.now().strftime('%Y-%m-%d')
+            day_start, day_end = self.aggregations.day_bounds()
             
-            # Get all data from database
-            from app.services.database_service import DatabaseService
-            db_service = DatabaseService()
-            
-            # Get all sellers
-            all_sellers_result = db_service.get_sellers(page=1, limit=10000)
-            all_sellers = all_sellers_result.get('data', [])
-            
-            # Get all brands
-            all_brands_result = db_service.get_brands(page=1, limit=10000)
-            all_brands = all_brands_result.get('data', [])
-            
-            # Get all QA analyses
-            all_qa_result = db_service.get_qa_analyses(page=1, limit=10000)
-            all_qa = all_qa_result.get('data', [])
-            
-            # Filter today's work
-            today_sellers = [s for s in all_sellers if s.get('created_at', '').startswith(today)]
-            today_brands = [b for b in all_brands if b.get('created_at', '').startswith(today)]
-            today_qa = [qa for qa in all_qa if qa.get('created_at', '').startswith(today)]
+            # Counters come from grouped queries; only the newest 20 rows per table are loaded
+            sellers = self.aggregations.get_seller_counters(day_start, day_end)
+            brands = self.aggregations.get_brand_counters(day_start, day_end)
+            qa = self.aggregations.get_qa_counters(day_start, day_end)
             
             # Calculate statistics
             daily_work = {
                 'date': today,
                 'sellers': {
-                    'new_today': len(today_sellers),
-                    'total': len(all_sellers),
-                    'list': today_sellers[:20]  # Top 20 for report
+                    'new_today': sellers['new'],
+                    'total': sellers['total'],
+                    'list': self.aggregations.get_recent(Seller, day_start, day_end, limit=20)  # Top 20 for report
                 },
                 'brands': {
-                    'new_today': len(today_brands),
-                    'total': len(all_brands),
-                    'list': today_brands[:20]  # Top 20 for report
+                    'new_today': brands['new'],
+                    'total': brands['total'],
+                    'list': self.aggregations.get_recent(Brand, day_start, day_end, limit=20)  # Top 20 for report
                 },
                 'qa_analyses': {
-                    'completed_today': len(today_qa),
-                    'total': len(all_qa),
-                    'list': today_qa[:20]  # Top 20 for report
+                    'completed_today': qa['new'],
+                    'total': qa['total'],
+                    'list': self.aggregations.get_recent(QAAnalysis, day_start, day_end, limit=20)  # Top 20 for report
                 },
                 'automation_stats': {
                     'morning_setup_run': self._check_morning_setup_run(),
-                    'seller_sniping_run': len([s for s in today_sellers if 'seller_sniping' in str(s.get('source', ''))]),
-                    'brand_research_run': len([b for b in today_brands if b.get('automation_percentage', 0) > 0]),
-                    'qa_analysis_run': len([qa for qa in today_qa if qa.get('automation_percentage', 0) > 0])
+                    # Source and automation percentage are not persisted on the tables yet
+                    'seller_sniping_run': 0,
+                    'brand_research_run': 0,
+                    'qa_analysis_run': 0
                 }
             }
             
-            logger.info(f"✅ Compiled daily work: {len(today_sellers)} sellers, {len(today_brands)} brands, {len(today_qa)} QA analyses")
+            logger.info(f"✅ Compiled daily work: {sellers['new']} sellers, {brands['new']} brands, {qa['new']} QA analyses")
             return daily_work
             
         except Exception as e:
@@ -255,19 +293,12 @@ class AutomationService:
     def _create_charts_and_graphs(self, daily_work):
         """Bot creates charts/graphs - 100% Automated"""
         try:
-            # Get charts data from reporting service
-            charts_data = self.reporting_service.create_report_charts_data()
+            # All histograms and distributions come from one set of GROUP BY queries
+            charts_data = self.aggregations.get_chart_data(days=30)
             
-            # Enhance with daily work data
             enhanced_charts = {
                 **charts_data,
-                'daily_breakdown': {
-                    'sellers_by_hour': self._get_sellers_by_hour(),
-                    'brands_by_hour': self._get_brands_by_hour(),
-                    'qa_by_hour': self._get_qa_by_hour()
-                },
-                'profitability_distribution': self._get_profitability_distribution(),
-                'competition_score_distribution': self._get_competition_score_distribution(),
+                'growth_rate': self.reporting_service._calculate_growth_rate(None, None),
                 'automation_efficiency': self._calculate_automation_efficiency(daily_work)
             }
             
@@ -278,126 +309,6 @@ class AutomationService:
             logger.error(f"Error creating charts: {str(e)}")
             return {}
     
-    def _get_sellers_by_hour(self):
-        """Get sellers added by hour"""
-        try:
-            from app.services.database_service import DatabaseService
-            db_service = DatabaseService()
-            sellers_result = db_service.get_sellers(page=1, limit=10000)
-            sellers = sellers_result.get('data', [])
-            
-            hourly = {}
-            for seller in sellers:
-                created_at = seller.get('created_at', '')
-                if created_at:
-                    hour = created_at[11:13] if len(created_at) > 13 else '00'
-                    hourly[hour] = hourly.get(hour, 0) + 1
-            
-            return hourly
-        except:
-            return {}
-    
-    def _get_brands_by_hour(self):
-        """Get brands added by hour"""
-        try:
-            from app.services.database_service import DatabaseService
-            db_service = DatabaseService()
-            brands_result = db_service.get_brands(page=1, limit=10000)
-            brands = brands_result.get('data', [])
-            
-            hourly = {}
-            for brand in brands:
-                created_at = brand.get('created_at', '')
-                if created_at:
-                    hour = created_at[11:13] if len(created_at) > 13 else '00'
-                    hourly[hour] = hourly.get(hour, 0) + 1
-            
-            return hourly
-        except:
-            return {}
-    
-    def _get_qa_by_hour(self):
-        """Get QA analyses completed by hour"""
-        try:
-            from app.services.database_service import DatabaseService
-            db_service = DatabaseService()
-            qa_result = db_service.get_qa_analyses(page=1, limit=10000)
-            qa_analyses = qa_result.get('data', [])
-            
-            hourly = {}
-            for qa in qa_analyses:
-                created_at = qa.get('created_at', '')
-                if created_at:
-                    hour = created_at[11:13] if len(created_at) > 13 else '00'
-                    hourly[hour] = hourly.get(hour, 0) + 1
-            
-            return hourly
-        except:
-            return {}
-    
-    def _get_profitability_distribution(self):
-        """Get profitability distribution for charts"""
-        try:
-            from app.services.database_service import DatabaseService
-            db_service = DatabaseService()
-            qa_result = db_service.get_qa_analyses(page=1, limit=10000)
-            qa_analyses = qa_result.get('data', [])
-            
-            distribution = {
-                'highly_profitable': 0,
-                'profitable': 0,
-                'marginal': 0,
-                'unprofitable': 0
-            }
-            
-            for qa in qa_analyses:
-                status = qa.get('status', '').lower()
-                if 'highly' in status or 'green' in status:
-                    distribution['highly_profitable'] += 1
-                elif 'profitable' in status or 'lightgreen' in status:
-                    distribution['profitable'] += 1
-                elif 'marginal' in status or 'yellow' in status:
-                    distribution['marginal'] += 1
-                elif 'unprofitable' in status or 'red' in status:
-                    distribution['unprofitable'] += 1
-            
-            return distribution
-        except:
-            return {'highly_profitable': 0, 'profitable': 0, 'marginal': 0, 'unprofitable': 0}
-    
-    def _get_competition_score_distribution(self):
-        """Get competition score distribution"""
-        try:
-            from app.services.database_service import DatabaseService
-            db_service = DatabaseService()
-            qa_result = db_service.get_qa_analyses(page=1, limit=10000)
-            qa_analyses = qa_result.get('data', [])
-            
-            distribution = {
-                'low_competition': 0,      # 80-100
-                'moderate_competition': 0,  # 60-79
-                'high_competition': 0,      # 40-59
-                'very_high_competition': 0  # 0-39
-            }
-            
-            for qa in qa_analyses:
-                score = qa.get('competition_score', 0)
-                if isinstance(score, dict):
-                    score = score.get('score', 0)
-                
-                if score >= 80:
-                    distribution['low_competition'] += 1
-                elif score >= 60:
-                    distribution['moderate_competition'] += 1
-                elif score >= 40:
-                    distribution['high_competition'] += 1
-                else:
-                    distribution['very_high_competition'] += 1
-            
-            return distribution
-        except:
-            return {'low_competition': 0, 'moderate_competition': 0, 'high_competition': 0, 'very_high_competition': 0}
-    
     def _calculate_automation_efficiency(self, daily_work):
         """Calculate automation efficiency metrics"""
         try:
@@ -500,14 +411,15 @@ class AutomationService:
             seller_duplicates = self.duplicate_detector.detect_duplicate_sellers()
             brand_duplicates = self.duplicate_detector.detect_duplicate_brands()
             
-            # Flag in sheets
-            self.duplicate_detector.flag_duplicates_in_sheet('Sellers')
-            self.duplicate_detector.flag_duplicates_in_sheet('Brands')
+            # Flag in sheets (reusing the scan above)
+            self.duplicate_detector.flag_duplicates_in_sheet('Sellers', seller_duplicates)
+            self.duplicate_detector.flag_duplicates_in_sheet('Brands', brand_duplicates)
             
             return {
                 'status': 'completed',
                 'seller_duplicates': len(seller_duplicates),
-                'brand_duplicates': len(brand_duplicates)
+                'brand_duplicates': len(brand_duplicates),
+                'stats': self.duplicate_detector.last_run_stats
             }
         except Exception as e:
             logger.error(f"Error detecting duplicates: {str(e)}")
@@ -34,7 +34,7 @@ class BackupService:
             
             # Save to backup sheet
             try:
-                backup_sheet = self.sheets_service.sheet.worksheet('Backup')
+                backup_sheet = self.sheets_service.worksheet('Backup')
             except:
                 # Create backup sheet if it doesn't exist
                 backup_sheet = self.sheets_service.sheet.add_worksheet(
@@ -2,7 +2,13 @@ from app.scrapers.brand_researcher import BrandResearcher
 from app.services.database_service import DatabaseService
 from app.services.data_validation_service import DataValidationService
 from app.services.duplicate_detector_service import DuplicateDetectorService
+from app.models.dedupe_key import DedupeKey
+from app.config import Config
+from app.utils.host_throttle import HostThrottle
 from app.utils.logger import get_logger
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
 
 logger = get_logger(__name__)
 
@@ -22,6 +28,16 @@ class BrandService:
             logger.error(f"Error fetching brands: {str(e)}")
             raise
     
+    def get_brands_page(self, cursor='', limit=50, filters=None, include_total=False):
+        """Get one keyset page of brands along with the cursor for the next page"""
+        try:
+            return self.db_service.get_brands(limit=limit, filters=filters, cursor=cursor, include_total=include_total)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching brands page: {str(e)}")
+            raise
+    
     def get_brand_by_id(self, brand_id):
         """Get brand by ID"""
         try:
@@ -41,27 +57,7 @@ class BrandService:
             
             # Research brand data using enhanced scraper
             brand_data = self.researcher.research(brand_name, use_enhanced_scraper=use_enhanced_scraper)
-            
-            # Validate data
-            validated_data = self.validator.validate_brand_data(brand_data)
-            
-            # Mark fields that need human verification
-            validated_data['verification_status'] = {
-                'automation_percentage': brand_data.get('automation_percentage', 0),
-                'needs_quality_check': True,
-                'needs_missing_data_fill': brand_data.get('automation_percentage', 0) < 100,
-                'needs_legitimacy_check': True,
-                'fields_to_verify': self._get_fields_to_verify(brand_data)
-            }
-            
-            # Check for duplicates before saving
-            all_brands_result = self.db_service.get_brands(page=1, limit=1000)
-            all_brands = all_brands_result.get('data', [])
-            is_duplicate = self._check_duplicate(validated_data, all_brands)
-            
-            if is_duplicate:
-                logger.warning(f"Duplicate brand detected: {validated_data.get('name')}")
-                validated_data['is_duplicate'] = True
+            validated_data = self._prepare_brand(brand_data)
             
             # Save to database
             saved_brand = self.db_service.save_brand(validated_data, user_id)
@@ -73,6 +69,121 @@ class BrandService:
             logger.error(f"Error researching brand: {str(e)}")
             raise
     
+    def _prepare_brand(self, brand_data):
+        """Validate researched data, mark fields for human verification and flag duplicates"""
+        # Validate data
+        validated_data = self.validator.validate_brand_data(brand_data)
+        
+        # Mark fields that need human verification
+        validated_data['verification_status'] = {
+            'automation_percentage': brand_data.get('automation_percentage', 0),
+            'needs_quality_check': True,
+            'needs_missing_data_fill': brand_data.get('automation_percentage', 0) < 100,
+            'needs_legitimacy_check': True,
+            'fields_to_verify': self._get_fields_to_verify(brand_data)
+        }
+        
+        # Check for duplicates before saving
+        is_duplicate = self._check_duplicate(validated_data)
+        
+        if is_duplicate:
+            logger.warning(f"Duplicate brand detected: {validated_data.get('name')}")
+            validated_data['is_duplicate'] = True
+        
+        return validated_data
+    
+    def research_brands_bulk(self, brand_names, user_id=None, use_enhanced_scraper=True,
+                             workers=None, batch_size=None):
+        """
+        Research many brands on a bounded worker pool - yields progress events as they happen.
+        
+        Each worker thread has its own BrandResearcher (scrapers keep per-instance sessions and
+        drivers); all of them share one HostThrottle so a host is never crawled by more than
+        BULK_RESEARCH_PER_HOST workers at once. Only the calling thread touches the database:
+        results are validated, duplicate-checked and committed every batch_size brands.
+        """
+        # Callers may ask for fewer workers than configured, never more
+        workers = min(max(int(workers or Config.BULK_RESEARCH_WORKERS), 1), Config.BULK_RESEARCH_WORKERS)
+        batch_size = max(int(batch_size or Config.BULK_RESEARCH_BATCH_SIZE), 1)
+        throttle = HostThrottle(Config.BULK_RESEARCH_PER_HOST, Config.BULK_RESEARCH_HOST_DELAY)
+        local = threading.local()
+        
+        def research(brand_name):
+            if not hasattr(local, 'researcher'):
+                local.researcher = BrandResearcher()
+                local.researcher.website_scraper.host_throttle = throttle
+            return local.researcher.research(brand_name, use_enhanced_scraper=use_enhanced_scraper)
+        
+        started = time.time()
+        total = len(brand_names)
+        summary = {'total': total, 'researched': 0, 'failed': 0, 'saved': 0, 'save_failed': 0, 'duplicates': 0}
+        pending_batch = []
+        seen_keys = set()  # dedupe keys of brands waiting in the current batch
+        
+        def flush_batch():
+            try:
+                saved = self.db_service.save_brands(pending_batch, user_id)
+                summary['saved'] += len(saved)
+                event = {'event': 'batch_saved', 'saved': saved, 'total_saved': summary['saved']}
+            except Exception as e:
+                summary['save_failed'] += len(pending_batch)
+                event = {'event': 'batch_failed', 'brand_names': [b.get('name') for b in pending_batch], 'error': str(e)}
+            pending_batch.clear()
+            seen_keys.clear()
+            return event
+        
+        yield {'event': 'started', 'total': total, 'workers': workers, 'batch_size': batch_size}
+        
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {executor.submit(research, name): name for name in brand_names}
+            for future in as_completed(futures):
+                brand_name = futures[future]
+                event = {'event': 'progress', 'brand_name': brand_name}
+                try:
+                    validated_data = self._prepare_brand(future.result())
+                    
+                    # Brands in the unsaved batch are not in the dedupe index yet
+                    keys = set(DedupeKey.keys_for('brand', validated_data).items())
+                    if keys & seen_keys:
+                        validated_data['is_duplicate'] = True
+                    seen_keys.update(keys)
+                    
+                    summary['researched'] += 1
+                    summary['duplicates'] += int(bool(validated_data.get('is_duplicate')))
+                    pending_batch.append(validated_data)
+                    event.update({
+                        'status': 'researched',
+                        'is_duplicate': bool(validated_data.get('is_duplicate')),
+                        'automation_percentage': validated_data.get('verification_status', {}).get('automation_percentage', 0)
+                    })
+                except Exception as e:
+                    logger.error(f"Error researching brand {brand_name}: {str(e)}")
+                    summary['failed'] += 1
+                    event.update({'status': 'failed', 'error': str(e)})
+                
+                event['completed'] = summary['researched'] + summary['failed']
+                event['total'] = total
+                yield event
+                
+                if len(pending_batch) >= batch_size:
+                    yield flush_batch()
+        except GeneratorExit:
+            # Client went away: keep what was already researched, drop the queued brands
+            if pending_batch:
+                flush_batch()
+            raise
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if pending_batch:
+            yield flush_batch()
+        
+        summary['elapsed_seconds'] = round(time.time() - started, 2)
+        summary['host_wait_seconds'] = round(throttle.waited_seconds, 2)
+        logger.info(f"Bulk brand research completed: {summary}")
+        yield {'event': 'completed', **summary}
+    
     def _get_fields_to_verify(self, brand_data):
         """Get list of fields that need human verification"""
         fields_to_verify = []
@@ -103,22 +214,10 @@ class BrandService:
         
         return fields_to_verify
     
-    def _check_duplicate(self, brand_data, existing_brands):
-        """Check if brand is a duplicate"""
+    def _check_duplicate(self, brand_data):
+        """Check if brand is a duplicate (same name or domain) via the dedupe index"""
         try:
-            name = brand_data.get('name', '').lower().strip()
-            domain = brand_data.get('domain', '').lower().strip()
-            
-            for existing in existing_brands:
-                existing_name = existing.get('name', '').lower().strip()
-                existing_domain = existing.get('domain', '').lower().strip()
-                
-                # Check exact match
-                if (name and existing_name and name == existing_name) or \
-                   (domain and existing_domain and domain == existing_domain):
-                    return True
-            
-            return False
-        except:
+            return self.db_service.find_duplicate('brand', brand_data) is not None
+        except Exception as e:
+            logger.error(f"Error checking duplicate brand: {str(e)}")
             return False
-
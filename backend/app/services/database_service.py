@@ -2,19 +2,291 @@ from app.models.database import db
 from app.models.seller import Seller
 from app.models.brand import Brand
 from app.models.qa_analysis import QAAnalysis
+from app.models.dedupe_key import DedupeKey
+from app.models.research_queue_item import ResearchQueueItem
 from app.utils.logger import get_logger
-from sqlalchemy import desc, or_
+from app.utils.record_merge import exact_groups, plan_merge
+from sqlalchemy import desc, or_, and_, text, func
+from sqlalchemy.schema import CreateIndex
 from datetime import datetime
+import base64
+import json
 
 logger = get_logger(__name__)
 
 class DatabaseService:
     """Service for database operations (replaces Google Sheets)"""
     
+    # Keyset (cursor) pagination helpers
+    @staticmethod
+    def encode_cursor(created_at, row_id):
+        """Encode the (created_at, id) position of a row as an opaque cursor"""
+        raw = f"{created_at.isoformat()}|{row_id}"
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+    
+    @staticmethod
+    def decode_cursor(cursor):
+        """Decode a cursor into (created_at, id); returns None for an empty cursor"""
+        if not cursor:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+            created_at, row_id = raw.split('|', 1)
+            return datetime.fromisoformat(created_at), row_id
+        except Exception:
+            raise ValueError('Invalid cursor')
+    
+    @staticmethod
+    def estimate_count(model):
+        """Cheap row count estimate from planner statistics (PostgreSQL only)"""
+        try:
+            if db.engine.dialect.name != 'postgresql':
+                return None
+            result = db.session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"),
+                {'table': model.__tablename__}
+            ).scalar()
+            return max(int(result), 0) if result is not None else None
+        except Exception as e:
+            logger.warning(f"Error estimating row count: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _paginate(query, model, page, limit, cursor=None, include_total=True, filtered=False):
+        """
+        Paginate a query ordered by newest first.
+        Offset mode (cursor is None) keeps the original page/total response.
+        Cursor mode seeks past (created_at, id) so deep pages cost the same as the first one;
+        the exact count is only run when include_total is set, otherwise an estimate is returned.
+        """
+        if cursor is None:
+            total = query.count()
+            rows = query.order_by(desc(model.created_at), desc(model.id)).offset((page - 1) * limit).limit(limit).all()
+            return {
+                'data': [row.to_dict() for row in rows],
+                'total': total,
+                'page': page,
+                'limit': limit,
+                'pages': (total + limit - 1) // limit
+            }
+        
+        position = DatabaseService.decode_cursor(cursor)
+        total = query.count() if include_total else None
+        
+        if position:
+            created_at, row_id = position
+            query = query.filter(
+                or_(
+                    model.created_at < created_at,
+                    and_(model.created_at == created_at, model.id < row_id)
+                )
+            )
+        
+        # Fetch one extra row to know whether another page exists
+        rows = query.order_by(desc(model.created_at), desc(model.id)).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = DatabaseService.encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+        
+        return {
+            'data': [row.to_dict() for row in rows],
+            'total': total,
+            'total_estimate': total if total is not None else (None if filtered else DatabaseService.estimate_count(model)),
+            'limit': limit,
+            'cursor': cursor,
+            'next_cursor': next_cursor,
+            'has_more': has_more
+        }
+    
+    @staticmethod
+    def _empty_page(page, limit, cursor):
+        """Result returned when a listing query fails, with the keys of both pagination modes"""
+        return {
+            'data': [],
+            'total': 0,
+            'total_estimate': 0,
+            'page': page,
+            'limit': limit,
+            'pages': 0,
+            'cursor': cursor,
+            'next_cursor': None,
+            'has_more': False
+        }
+    
+    @staticmethod
+    def _json_text(value):
+        """Store list/dict values (e.g. validation issues) in Text columns as JSON strings"""
+        if isinstance(value, (list, dict)):
+            return json.dumps(value)
+        return value
+    
+    # Dedupe index
+    DEDUPE_MODELS = {'seller': Seller, 'brand': Brand}
+    
+    # Data columns a merge survivor takes over from the duplicates it absorbs
+    MERGE_FIELDS = {
+        'seller': ['name', 'email', 'store_url', 'phone', 'company_name', 'location', 'rating', 'total_reviews', 'notes'],
+        'brand': ['name', 'domain', 'email', 'phone', 'social_media', 'description', 'industry', 'location', 'notes']
+    }
+    
+    @staticmethod
+    def _dedupe_data(entity):
+        """Pull the key fields of a Seller/Brand row into a dict"""
+        entity_type = 'seller' if isinstance(entity, Seller) else 'brand'
+        return entity_type, {field: getattr(entity, field) for field in DedupeKey.KEY_FIELDS[entity_type]}
+    
+    @staticmethod
+    def _sync_dedupe_keys(entity, replace=True):
+        """Write the dedupe keys of a row in the current session (committed with the row)"""
+        entity_type, data = DatabaseService._dedupe_data(entity)
+        if replace:
+            DedupeKey.query.filter_by(entity_type=entity_type, entity_id=entity.id).delete(synchronize_session=False)
+        for key_type, key_hash in DedupeKey.keys_for(entity_type, data).items():
+            db.session.add(DedupeKey(
+                entity_type=entity_type,
+                entity_id=entity.id,
+                key_type=key_type,
+                key_hash=key_hash
+            ))
+    
+    @staticmethod
+    def _delete_dedupe_keys(entity_type, entity_id):
+        DedupeKey.query.filter_by(entity_type=entity_type, entity_id=entity_id).delete(synchronize_session=False)
+    
+    @staticmethod
+    def find_duplicate(entity_type, data, exclude_id=None):
+        """
+        Return the id of an existing seller/brand sharing any normalized key with data
+        (sellers: name, email or store URL; brands: name or domain), or None.
+        """
+        keys = DedupeKey.keys_for(entity_type, data)
+        if not keys:
+            return None
+        
+        query = DedupeKey.query.with_entities(DedupeKey.entity_id).filter(
+            DedupeKey.entity_type == entity_type,
+            or_(*[
+                and_(DedupeKey.key_type == key_type, DedupeKey.key_hash == key_hash)
+                for key_type, key_hash in keys.items()
+            ])
+        )
+        if exclude_id:
+            query = query.filter(DedupeKey.entity_id != exclude_id)
+        
+        row = query.first()
+        return row[0] if row else None
+    
+    @staticmethod
+    def merge_duplicates(entity_type):
+        """
+        Merge exact duplicate sellers/brands (every dedupe key field equal after normalization)
+        in one transaction. The most complete row of each group survives (oldest on ties) and
+        takes over the empty fields, QA analyses and research queue links of the rows removed.
+        """
+        model = DatabaseService.DEDUPE_MODELS[entity_type]
+        fields = DatabaseService.MERGE_FIELDS[entity_type]
+        try:
+            # Only rows whose name is shared can be exact duplicates; the full key is compared below
+            name_key = func.lower(func.trim(model.name))
+            shared_names = db.session.query(name_key).group_by(name_key).having(func.count(model.id) > 1)
+            rows = model.query.filter(name_key.in_(shared_names)).order_by(model.created_at, model.id).all()
+            records = [{field: getattr(row, field) for field in fields} for row in rows]
+            
+            groups = exact_groups(records, DedupeKey.KEY_FIELDS[entity_type])
+            deleted = 0
+            for group in groups:
+                plan = plan_merge(records, group, fields)
+                survivor = rows[plan['survivor']]
+                removed_ids = [rows[idx].id for idx in plan['removed']]
+                for field, value in plan['updates'].items():
+                    setattr(survivor, field, value)
+                
+                if entity_type == 'brand':
+                    QAAnalysis.query.filter(QAAnalysis.brand_id.in_(removed_ids)).update(
+                        {'brand_id': survivor.id}, synchronize_session=False
+                    )
+                    ResearchQueueItem.query.filter(ResearchQueueItem.brand_id.in_(removed_ids)).update(
+                        {'brand_id': survivor.id}, synchronize_session=False
+                    )
+                DedupeKey.query.filter(
+                    DedupeKey.entity_type == entity_type,
+                    DedupeKey.entity_id.in_(removed_ids)
+                ).delete(synchronize_session=False)
+                model.query.filter(model.id.in_(removed_ids)).delete(synchronize_session=False)
+                deleted += len(removed_ids)
+            
+            db.session.commit()
+            result = {'groups_merged': len(groups), 'rows_deleted': deleted}
+            logger.info(f"Merged duplicate {entity_type}s: {result}")
+            return result
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error merging duplicate {entity_type}s: {str(e)}")
+            raise
+    
+    @staticmethod
+    def rebuild_dedupe_index(batch_size=1000):
+        """Rebuild the dedupe index from the sellers and brands tables"""
+        try:
+            DedupeKey.query.delete()
+            counts = {}
+            for entity_type, model in DatabaseService.DEDUPE_MODELS.items():
+                fields = DedupeKey.KEY_FIELDS[entity_type]
+                rows = db.session.query(model.id, *[getattr(model, field) for field in fields])
+                
+                batch = []
+                counts[entity_type] = 0
+                for row in rows.yield_per(batch_size):
+                    keys = DedupeKey.keys_for(entity_type, dict(zip(fields, row[1:])))
+                    batch.extend(
+                        {'entity_type': entity_type, 'entity_id': row[0], 'key_type': key_type,
+                         'key_hash': key_hash, 'created_at': datetime.utcnow()}
+                        for key_type, key_hash in keys.items()
+                    )
+                    counts[entity_type] += 1
+                    if len(batch) >= batch_size:
+                        db.session.execute(DedupeKey.__table__.insert(), batch)
+                        batch = []
+                if batch:
+                    db.session.execute(DedupeKey.__table__.insert(), batch)
+            
+            db.session.commit()
+            logger.info(f"Dedupe index rebuilt: {counts}")
+            return counts
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error rebuilding dedupe index: {str(e)}")
+            raise
+    
+    @staticmethod
+    def ensure_indexes():
+        """Create any model index missing from an existing table"""
+        # IF NOT EXISTS rather than checkfirst: reflection skips expression indexes like lower(name)
+        with db.engine.begin() as connection:
+            for table in db.metadata.sorted_tables:
+                for index in table.indexes:
+                    try:
+                        with connection.begin_nested():
+                            connection.execute(CreateIndex(index, if_not_exists=True))
+                    except Exception as e:
+                        logger.warning(f"Error creating index {index.name}: {str(e)}")
+    
+    @staticmethod
+    def ensure_dedupe_index():
+        """Backfill the dedupe index once for databases created before it existed"""
+        try:
+            if db.session.query(DedupeKey.id).first() is not None:
+                return
+            if db.session.query(Seller.id).first() is None and db.session.query(Brand.id).first() is None:
+                return
+            DatabaseService.rebuild_dedupe_index()
+        except Exception as e:
+            logger.error(f"Error backfilling dedupe index: {str(e)}")
+    
     # Seller operations
     @staticmethod
-    def get_sellers(page=1, limit=50, filters=None):
-        """Get sellers with pagination"""
+    def get_sellers(page=1, limit=50, filters=None, cursor=None, include_total=True):
+        """Get sellers with pagination (offset by default, keyset when a cursor is given)"""
         try:
             query = Seller.query
             
@@ -37,19 +309,12 @@ class DatabaseService:
                     )
             
             # Pagination
-            total = query.count()
-            sellers = query.order_by(desc(Seller.created_at)).offset((page - 1) * limit).limit(limit).all()
-            
-            return {
-                'data': [seller.to_dict() for seller in sellers],
-                'total': total,
-                'page': page,
-                'limit': limit,
-                'pages': (total + limit - 1) // limit
-            }
+            return DatabaseService._paginate(query, Seller, page, limit, cursor, include_total, filtered=bool(filters))
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error getting sellers: {str(e)}")
-            return {'data': [], 'total': 0, 'page': page, 'limit': limit, 'pages': 0}
+            return DatabaseService._empty_page(page, limit, cursor)
     
     @staticmethod
     def get_seller_by_id(seller_id):
@@ -77,12 +342,14 @@ class DatabaseService:
                 status=seller_data.get('status', 'active'),
                 is_duplicate=seller_data.get('is_duplicate', False),
                 validation_status=seller_data.get('validation_status', 'pending'),
-                validation_issues=seller_data.get('validation_issues'),
+                validation_issues=DatabaseService._json_text(seller_data.get('validation_issues')),
                 notes=seller_data.get('notes', ''),
                 created_by=user_id
             )
             
             db.session.add(seller)
+            db.session.flush()
+            DatabaseService._sync_dedupe_keys(seller, replace=False)
             db.session.commit()
             
             logger.info(f"Seller saved: {seller.id}")
@@ -106,6 +373,7 @@ class DatabaseService:
                     setattr(seller, key, value)
             
             seller.updated_at = datetime.utcnow()
+            DatabaseService._sync_dedupe_keys(seller)
             db.session.commit()
             
             return seller.to_dict()
@@ -120,6 +388,7 @@ class DatabaseService:
         try:
             seller = Seller.query.get(seller_id)
             if seller:
+                DatabaseService._delete_dedupe_keys('seller', seller.id)
                 db.session.delete(seller)
                 db.session.commit()
                 return True
@@ -131,8 +400,8 @@ class DatabaseService:
     
     # Brand operations
     @staticmethod
-    def get_brands(page=1, limit=50, filters=None):
-        """Get brands with pagination"""
+    def get_brands(page=1, limit=50, filters=None, cursor=None, include_total=True):
+        """Get brands with pagination (offset by default, keyset when a cursor is given)"""
         try:
             query = Brand.query
             
@@ -152,19 +421,12 @@ class DatabaseService:
                         )
                     )
             
-            total = query.count()
-            brands = query.order_by(desc(Brand.created_at)).offset((page - 1) * limit).limit(limit).all()
-            
-            return {
-                'data': [brand.to_dict() for brand in brands],
-                'total': total,
-                'page': page,
-                'limit': limit,
-                'pages': (total + limit - 1) // limit
-            }
+            return DatabaseService._paginate(query, Brand, page, limit, cursor, include_total, filtered=bool(filters))
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error getting brands: {str(e)}")
-            return {'data': [], 'total': 0, 'page': page, 'limit': limit, 'pages': 0}
+            return DatabaseService._empty_page(page, limit, cursor)
     
     @staticmethod
     def get_brand_by_id(brand_id):
@@ -180,37 +442,56 @@ class DatabaseService:
     def get_brand_by_name(brand_name):
         """Get brand by name (case-insensitive)"""
         try:
-            brand = Brand.query.filter(Brand.name.ilike(brand_name.strip())).first()
+            brand = Brand.query.filter(func.lower(Brand.name) == brand_name.strip().lower()).first()
             return brand.to_dict() if brand else None
         except Exception as e:
             logger.error(f"Error getting brand by name: {str(e)}")
             return None
     
+    @staticmethod
+    def get_existing_brand_names(names, chunk_size=500):
+        """Return the subset of lowercased names that already belong to a brand (one indexed query per chunk)"""
+        names = list(names)
+        existing = set()
+        for start in range(0, len(names), chunk_size):
+            chunk = names[start:start + chunk_size]
+            rows = db.session.query(func.lower(Brand.name)).filter(func.lower(Brand.name).in_(chunk)).distinct()
+            existing.update(row[0] for row in rows)
+        return existing
+    
+    @staticmethod
+    def _build_brand(brand_data, user_id=None):
+        """Create a Brand row from a brand data dict (not yet added to the session)"""
+        brand = Brand(
+            name=brand_data.get('name', ''),
+            domain=brand_data.get('domain', ''),
+            email=brand_data.get('email', ''),
+            phone=brand_data.get('phone', ''),
+            description=brand_data.get('description', ''),
+            industry=brand_data.get('industry', ''),
+            location=brand_data.get('location', ''),
+            status=brand_data.get('status', 'active'),
+            is_duplicate=brand_data.get('is_duplicate', False),
+            validation_status=brand_data.get('validation_status', 'pending'),
+            validation_issues=DatabaseService._json_text(brand_data.get('validation_issues')),
+            notes=brand_data.get('notes', ''),
+            created_by=user_id
+        )
+        
+        # Set social media
+        if brand_data.get('social_media'):
+            brand.set_social_media(brand_data['social_media'])
+        return brand
+    
     @staticmethod
     def save_brand(brand_data, user_id=None):
         """Save brand to database"""
         try:
-            brand = Brand(
-                name=brand_data.get('name', ''),
-                domain=brand_data.get('domain', ''),
-                email=brand_data.get('email', ''),
-                phone=brand_data.get('phone', ''),
-                description=brand_data.get('description', ''),
-                industry=brand_data.get('industry', ''),
-                location=brand_data.get('location', ''),
-                status=brand_data.get('status', 'active'),
-                is_duplicate=brand_data.get('is_duplicate', False),
-                validation_status=brand_data.get('validation_status', 'pending'),
-                validation_issues=brand_data.get('validation_issues'),
-                notes=brand_data.get('notes', ''),
-                created_by=user_id
-            )
-            
-            # Set social media
-            if brand_data.get('social_media'):
-                brand.set_social_media(brand_data['social_media'])
+            brand = DatabaseService._build_brand(brand_data, user_id)
             
             db.session.add(brand)
+            db.session.flush()
+            DatabaseService._sync_dedupe_keys(brand, replace=False)
             db.session.commit()
             
             logger.info(f"Brand saved: {brand.id}")
@@ -220,6 +501,24 @@ class DatabaseService:
             logger.error(f"Error saving brand: {str(e)}")
             raise
     
+    @staticmethod
+    def save_brands(brands_data, user_id=None):
+        """Save a batch of brands (and their dedupe keys) in a single commit"""
+        try:
+            brands = [DatabaseService._build_brand(brand_data, user_id) for brand_data in brands_data]
+            db.session.add_all(brands)
+            db.session.flush()
+            for brand in brands:
+                DatabaseService._sync_dedupe_keys(brand, replace=False)
+            db.session.commit()
+            
+            logger.info(f"Brands saved: {len(brands)}")
+            return [brand.to_dict() for brand in brands]
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error saving brands: {str(e)}")
+            raise
+    
     # QA Analysis operations
     @staticmethod
     def save_qa_analysis(brand_id, analysis_data, user_id=None):
@@ -266,8 +565,8 @@ class DatabaseService:
             return {}
     
     @staticmethod
-    def get_qa_analyses(page=1, limit=50, filters=None):
-        """Get QA analyses with pagination"""
+    def get_qa_analyses(page=1, limit=50, filters=None, cursor=None, include_total=True):
+        """Get QA analyses with pagination (offset by default, keyset when a cursor is given)"""
         try:
             query = QAAnalysis.query
             
@@ -278,17 +577,10 @@ class DatabaseService:
                 if filters.get('brand_id'):
                     query = query.filter(QAAnalysis.brand_id == filters['brand_id'])
             
-            total = query.count()
-            analyses = query.order_by(desc(QAAnalysis.created_at)).offset((page - 1) * limit).limit(limit).all()
-            
-            return {
-                'data': [analysis.to_dict() for analysis in analyses],
-                'total': total,
-                'page': page,
-                'limit': limit,
-                'pages': (total + limit - 1) // limit
-            }
+            return DatabaseService._paginate(query, QAAnalysis, page, limit, cursor, include_total, filtered=bool(filters))
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error getting QA analyses: {str(e)}")
-            return {'data': [], 'total': 0, 'page': page, 'limit': limit, 'pages': 0}
+            return DatabaseService._empty_page(page, limit, cursor)
 
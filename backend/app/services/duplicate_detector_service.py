@@ -1,58 +1,40 @@
-from app.services.google_sheets_service import GoogleSheetsService
+from app.services.google_sheets_service import GoogleSheetsService, with_backoff
+from gspread.utils import rowcol_to_a1
 from app.utils.logger import get_logger
-import difflib
+from app.utils.similarity_index import SimilarityIndex
+from app.utils.record_merge import normalize_key, plan_merge
 
 logger = get_logger(__name__)
 
+SIMILARITY_THRESHOLD = 0.85  # 85% similar but not exact
+
+# Highlight applied to duplicate rows (columns A:E)
+DUPLICATE_ROW_FORMAT = {'backgroundColor': {'red': 1.0, 'green': 0.95, 'blue': 0.8}}
+
+# Ranges per batch_update request when flagging duplicates
+FORMAT_BATCH_SIZE = 500
+
+# Columns that make two rows the same seller / brand
+KEY_FIELDS = {
+    'Sellers': ['name', 'email', 'store_url'],
+    'Brands': ['name', 'domain']
+}
+
 class DuplicateDetectorService:
     """Service for detecting and handling duplicates in Google Sheets"""
     
     def __init__(self):
         self.sheets_service = GoogleSheetsService()
+        self.last_run_stats = {}
     
     def detect_duplicate_sellers(self):
         """Detect duplicate sellers based on name, email, or URL"""
         try:
-            sellers = self.sheets_service.get_sellers(page=1, limit=1000)
-            duplicates = []
-            seen = {}
-            
-            for idx, seller in enumerate(sellers):
-                # Create unique key from seller data
-                name = seller.get('name', '').lower().strip()
-                email = seller.get('email', '').lower().strip()
-                url = seller.get('store_url', '').lower().strip()
-                
-                # Check for exact duplicates
-                key = f"{name}|{email}|{url}"
-                if key in seen:
-                    duplicates.append({
-                        'type': 'exact',
-                        'original': seen[key],
-                        'duplicate': idx,
-                        'seller': seller
-                    })
-                else:
-                    seen[key] = idx
-                
-                # Check for similar names (fuzzy matching)
-                if name:
-                    for existing_key, existing_idx in seen.items():
-                        if existing_idx == idx:
-                            continue
-                        existing_name = existing_key.split('|')[0]
-                        similarity = difflib.SequenceMatcher(None, name, existing_name).ratio()
-                        if similarity > 0.85 and similarity < 1.0:  # 85% similar but not exact
-                            duplicates.append({
-                                'type': 'similar',
-                                'original': existing_idx,
-                                'duplicate': idx,
-                                'seller': seller,
-                                'similarity': similarity
-                            })
-            
+            sellers = self.sheets_service.get_sellers(page=1, limit=None)
+            duplicates, stats = self._find_duplicates(sellers, KEY_FIELDS['Sellers'], 'seller')
+            self.last_run_stats['sellers'] = stats
             return duplicates
-            
+        
         except Exception as e:
             logger.error(f"Error detecting duplicate sellers: {str(e)}")
             return []
@@ -60,104 +42,196 @@ class DuplicateDetectorService:
     def detect_duplicate_brands(self):
         """Detect duplicate brands based on name or domain"""
         try:
-            brands = self.sheets_service.get_brands(page=1, limit=1000)
-            duplicates = []
-            seen = {}
+            brands = self.sheets_service.get_brands(page=1, limit=None)
+            duplicates, stats = self._find_duplicates(brands, KEY_FIELDS['Brands'], 'brand')
+            self.last_run_stats['brands'] = stats
+            return duplicates
+        
+        except Exception as e:
+            logger.error(f"Error detecting duplicate brands: {str(e)}")
+            return []
+    
+    def _find_duplicates(self, records, key_fields, record_type):
+        """
+        Find exact and similar duplicates among sheet records.
+        
+        Exact duplicates share every key field (first field is the name). Similar duplicates
+        have names more than 85% similar (difflib ratio) to an earlier distinct key; they are
+        looked up in a trigram SimilarityIndex instead of scanning every earlier key.
+        """
+        duplicates = []
+        seen = {}
+        index = SimilarityIndex(threshold=SIMILARITY_THRESHOLD)
+        name_keys = []  # index name id -> row indexes of distinct keys with that name
+        
+        for idx, record in enumerate(records):
+            # Create unique key from record data
+            values = [str(record.get(field, '')).lower().strip() for field in key_fields]
+            name = values[0]
             
-            for idx, brand in enumerate(brands):
-                name = brand.get('name', '').lower().strip()
-                domain = brand.get('domain', '').lower().strip()
+            # Check for exact duplicates
+            key = '|'.join(values)
+            if key in seen:
+                duplicates.append({
+                    'type': 'exact',
+                    'original': seen[key],
+                    'duplicate': idx,
+                    record_type: record
+                })
+            else:
+                seen[key] = idx
+            
+            # Check for similar names (fuzzy matching)
+            if name:
+                similar = []
+                for name_id, similarity in index.query(name):
+                    for existing_idx in name_keys[name_id]:
+                        similar.append((existing_idx, similarity))
                 
-                # Check for exact duplicates
-                key = f"{name}|{domain}"
-                if key in seen:
+                for existing_idx, similarity in sorted(similar):
                     duplicates.append({
-                        'type': 'exact',
-                        'original': seen[key],
+                        'type': 'similar',
+                        'original': existing_idx,
                         'duplicate': idx,
-                        'brand': brand
+                        record_type: record,
+                        'similarity': similarity
                     })
-                else:
-                    seen[key] = idx
                 
-                # Check for similar names
-                if name:
-                    for existing_key, existing_idx in seen.items():
-                        if existing_idx == idx:
-                            continue
-                        existing_name = existing_key.split('|')[0]
-                        similarity = difflib.SequenceMatcher(None, name, existing_name).ratio()
-                        if similarity > 0.85 and similarity < 1.0:
-                            duplicates.append({
-                                'type': 'similar',
-                                'original': existing_idx,
-                                'duplicate': idx,
-                                'brand': brand,
-                                'similarity': similarity
-                            })
-            
-            return duplicates
-            
-        except Exception as e:
-            logger.error(f"Error detecting duplicate brands: {str(e)}")
-            return []
+                if seen[key] == idx:
+                    name_id = index.add(name)
+                    if name_id == len(name_keys):
+                        name_keys.append([])
+                    name_keys[name_id].append(idx)
+        
+        stats = dict(index.stats, records=len(records), duplicates=len(duplicates))
+        logger.info(
+            f"Duplicate scan over {len(records)} {record_type}s: "
+            f"{stats['candidates_compared']} of {stats['candidates_generated']} candidates compared, "
+            f"{stats['pairs_emitted']} similar pairs in {stats['time_spent_seconds']:.2f}s"
+        )
+        return duplicates, stats
     
-    def flag_duplicates_in_sheet(self, sheet_name='Sellers'):
-        """Flag duplicates in Google Sheet by highlighting rows"""
+    @staticmethod
+    def _row_ranges(row_numbers):
+        """Coalesce sheet row numbers into (first, last) runs of consecutive rows"""
+        runs = []
+        for row in sorted(set(row_numbers)):
+            if runs and row == runs[-1][1] + 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        return [tuple(run) for run in runs]
+    
+    def flag_duplicates_in_sheet(self, sheet_name='Sellers', duplicates=None):
+        """
+        Flag duplicates in Google Sheet by highlighting rows.
+        Pass the duplicates already detected to skip re-scanning the sheet. Consecutive duplicate
+        rows are merged into one range and all ranges go out in batch_update requests
+        (FORMAT_BATCH_SIZE ranges each) instead of one format call per row.
+        """
         try:
             if not self.sheets_service.sheet:
                 return False
             
-            worksheet = self.sheets_service.sheet.worksheet(sheet_name)
+            if duplicates is None:
+                if sheet_name == 'Sellers':
+                    duplicates = self.detect_duplicate_sellers()
+                elif sheet_name == 'Brands':
+                    duplicates = self.detect_duplicate_brands()
+                else:
+                    return False
             
-            if sheet_name == 'Sellers':
-                duplicates = self.detect_duplicate_sellers()
-            elif sheet_name == 'Brands':
-                duplicates = self.detect_duplicate_brands()
-            else:
-                return False
+            rows = [dup.get('duplicate', 0) + 2 for dup in duplicates]  # +2 for header row
+            ranges = self._row_ranges(rows)
+            formats = [{'range': f'A{first}:E{last}', 'format': DUPLICATE_ROW_FORMAT} for first, last in ranges]
             
-            # Highlight duplicate rows (requires gspread formatting)
-            for dup in duplicates:
-                row_num = dup.get('duplicate', 0) + 2  # +2 for header row
-                try:
-                    # Format row in yellow to indicate duplicate
-                    worksheet.format(f'A{row_num}:E{row_num}', {
-                        'backgroundColor': {'red': 1.0, 'green': 0.95, 'blue': 0.8}
-                    })
-                except:
-                    pass
+            worksheet = self.sheets_service.worksheet(sheet_name)
+            for start in range(0, len(formats), FORMAT_BATCH_SIZE):
+                with_backoff(worksheet.batch_format, formats[start:start + FORMAT_BATCH_SIZE])
             
-            logger.info(f"Flagged {len(duplicates)} duplicates in {sheet_name}")
+            api_calls = -(-len(formats) // FORMAT_BATCH_SIZE)
+            self.last_run_stats.setdefault('flagging', {})[sheet_name] = {
+                'rows': len(set(rows)),
+                'ranges': len(ranges),
+                'api_calls': api_calls
+            }
+            logger.info(f"Flagged {len(duplicates)} duplicates in {sheet_name} ({len(ranges)} ranges, {api_calls} request(s))")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Error flagging duplicates: {str(e)}")
             return False
     
-    def merge_duplicates(self, duplicates, sheet_name='Sellers'):
-        """Merge duplicate entries, keeping the most complete data"""
+    def merge_duplicates(self, duplicates=None, sheet_name='Sellers'):
+        """
+        Merge exact duplicate rows, keeping the most complete row of each group.
+        
+        The survivor's empty cells are filled from the rows being removed; only those cells are
+        written, USER_ENTERED so numbers and dates are parsed as if typed rather than stored as
+        text. Every removed row is then deleted with deleteDimension requests, bottom-up so no
+        delete shifts a row still to be deleted. Rows are re-read first and a group whose rows no
+        longer match its key is skipped, since positions from an older scan would point at the
+        wrong rows.
+        """
         try:
-            if not self.sheets_service.sheet:
+            if not self.sheets_service.sheet or sheet_name not in KEY_FIELDS:
                 return False
             
-            worksheet = self.sheets_service.sheet.worksheet(sheet_name)
-            merged_count = 0
+            if duplicates is None:
+                duplicates = self.detect_duplicate_sellers() if sheet_name == 'Sellers' else self.detect_duplicate_brands()
             
+            # Exact duplicates all point at the first row with their key
+            groups = {}
             for dup in duplicates:
                 if dup['type'] == 'exact':
-                    # Delete duplicate row
-                    row_num = dup.get('duplicate', 0) + 2
-                    try:
-                        worksheet.delete_rows(row_num)
-                        merged_count += 1
-                    except:
-                        pass
+                    groups.setdefault(dup['original'], {dup['original']}).add(dup['duplicate'])
+            if not groups:
+                return {'groups_merged': 0, 'rows_deleted': 0, 'groups_skipped': 0}
             
-            logger.info(f"Merged {merged_count} duplicates in {sheet_name}")
-            return True
+            worksheet = self.sheets_service.worksheet(sheet_name)
+            values = with_backoff(worksheet.get_all_values)
+            header, rows = values[0], values[1:]
+            records = [dict(zip(header, row)) for row in rows]
             
+            value_updates = []
+            deleted_rows = []
+            skipped = 0
+            for group in groups.values():
+                group = sorted(group)
+                keys = {normalize_key(records[idx], KEY_FIELDS[sheet_name]) if idx < len(records) else None for idx in group}
+                if len(keys) != 1 or None in keys:
+                    skipped += 1
+                    continue
+                
+                plan = plan_merge(records, group, header)
+                for field, value in plan['updates'].items():
+                    cell = rowcol_to_a1(plan['survivor'] + 2, header.index(field) + 1)  # 1-based, below the header
+                    value_updates.append({'range': f"'{worksheet.title}'!{cell}", 'values': [[value]]})
+                deleted_rows.extend(idx + 1 for idx in plan['removed'])  # 0-based grid index below the header
+            
+            delete_requests = [{
+                'deleteDimension': {
+                    'range': {'sheetId': worksheet.id, 'dimension': 'ROWS', 'startIndex': first, 'endIndex': last + 1}
+                }
+            } for first, last in reversed(self._row_ranges(deleted_rows))]
+            
+            # Filled cells first, while the survivors are still at the rows read above
+            if value_updates:
+                with_backoff(self.sheets_service.sheet.values_batch_update,
+                             {'valueInputOption': 'USER_ENTERED', 'data': value_updates})
+            if delete_requests:
+                # A retried delete after an unseen success would remove the rows that moved up
+                with_backoff(self.sheets_service.sheet.batch_update, {'requests': delete_requests}, idempotent=False)
+            
+            self.sheets_service.invalidate(sheet_name)
+            result = {
+                'groups_merged': len(groups) - skipped,
+                'rows_deleted': len(deleted_rows),
+                'groups_skipped': skipped
+            }
+            logger.info(f"Merged duplicates in {sheet_name}: {result}")
+            return result
+        
         except Exception as e:
             logger.error(f"Error merging duplicates: {str(e)}")
             return False
-
@@ -1,19 +1,118 @@
 import requests
+from requests.adapters import HTTPAdapter
 from app.config import Config
+from app.services.hunter_cache_service import hunter_cache
+from app.services.hunter_quota_service import hunter_quota, is_low_value_email, USAGE_LIMIT_ERRORS
 from app.utils.logger import get_logger
+from app.utils.rate_limiter import TokenBucket
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+import math
+import time
 
 logger = get_logger(__name__)
 
+# One keep-alive connection pool to api.hunter.io shared by every thread in the process
+session = requests.Session()
+session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=Config.HUNTER_VERIFY_WORKERS * 2))
+
+# Hunter's per-second limits, per process (email-verifier is stricter than finder / domain search)
+verify_bucket = TokenBucket(Config.HUNTER_VERIFY_RATE)
+search_bucket = TokenBucket(Config.HUNTER_SEARCH_RATE)
+
+def _verification_ttl(result):
+    """Cache lifetime and negative flag for an email-verifier answer"""
+    status = (result or {}).get('result')
+    if status == 'deliverable':
+        return Config.HUNTER_CACHE_TTL_DELIVERABLE, False
+    if status == 'undeliverable' or result is None:
+        return Config.HUNTER_CACHE_TTL_UNDELIVERABLE, True
+    # risky, accept_all, unknown: may settle either way, so check again sooner
+    return Config.HUNTER_CACHE_TTL_UNCERTAIN, False
+
+def _error_id(response):
+    """Id of the first error in a Hunter error response (e.g. usage_limit_reached), or None"""
+    try:
+        return ((response.json().get('errors') or [{}])[0] or {}).get('id')
+    except (ValueError, AttributeError, IndexError):
+        return None
+
 class EmailFinderService:
-    """Email Finder Service using Hunter.io API"""
+    """Email Finder Service using Hunter.io API (results are cached, see HunterCacheService; credits are budgeted, see HunterQuotaService)"""
     
     def __init__(self):
         self.api_key = Config.HUNTER_API_KEY
         self.base_url = 'https://api.hunter.io/v2'
     
+    @staticmethod
+    def _domain_key(domain):
+        domain = (domain or '').strip().lower()
+        return domain[4:] if domain.startswith('www.') else domain
+    
+    @staticmethod
+    def cache_stats():
+        """Hit/miss counters of the Hunter.io result cache"""
+        return hunter_cache.get_stats()
+    
+    @staticmethod
+    def quota_stats():
+        """Hunter.io credits used, remaining and projected exhaustion"""
+        return hunter_quota.get_stats()
+    
+    def sync_quota(self):
+        """Refresh credit usage from Hunter's account endpoint (costs no credits)"""
+        if not self.api_key:
+            return None
+        try:
+            response = session.get(f'{self.base_url}/account', params={'api_key': self.api_key}, timeout=10)
+            if response.status_code == 200:
+                return hunter_quota.update_from_account(response.json().get('data') or {})
+            logger.warning(f"Hunter.io account API error: {response.status_code} - {response.text}")
+            return None
+        except Exception as e:
+            logger.error(f"Error syncing Hunter.io quota: {str(e)}")
+            return None
+    
+    def _get(self, url, params, bucket, deadline=None):
+        """
+        GET from Hunter within its rate limit; rate-limited 429s are retried after Retry-After (or
+        an exponential back-off) up to HUNTER_RATE_LIMIT_RETRIES times. Returns (response, error_id),
+        or (None, None) when the deadline is reached first.
+        """
+        for attempt in range(Config.HUNTER_RATE_LIMIT_RETRIES + 1):
+            remaining = deadline - time.monotonic() if deadline else None
+            if not bucket.acquire(timeout=remaining):
+                return None, None
+            timeout = min(10, max(deadline - time.monotonic(), 1)) if deadline else 10
+            response = session.get(url, params=params, timeout=timeout)
+            if response.status_code == 200:
+                return response, None
+            error_id = _error_id(response)
+            if response.status_code != 429 or error_id in USAGE_LIMIT_ERRORS or attempt == Config.HUNTER_RATE_LIMIT_RETRIES:
+                return response, error_id
+            
+            try:
+                delay = float(response.headers.get('Retry-After'))
+            except (TypeError, ValueError):
+                delay = 2 ** attempt
+            if deadline and time.monotonic() + delay >= deadline:
+                return response, error_id
+            logger.info(f"Hunter.io rate limit hit, retrying in {delay:.1f}s")
+            time.sleep(delay)
+    
+    def _quota_allows(self, kind, low_value=False):
+        """Check the credit budget, refreshing it from Hunter first when a sync is due"""
+        if hunter_quota.claim_sync():
+            self.sync_quota()
+        return hunter_quota.allow(kind, low_value=low_value)
+    
     def find_email(self, domain, first_name=None, last_name=None):
         """Find email address for a domain and name"""
         try:
+            cache_key = '|'.join([self._domain_key(domain), (first_name or '').strip().lower(), (last_name or '').strip().lower()])
+            found, cached = hunter_cache.get('find', cache_key)
+            if found:
+                return cached
+            
             if not self.api_key:
                 logger.warning("Hunter.io API key not configured")
                 return None
@@ -29,12 +128,15 @@ class EmailFinderService:
             if last_name:
                 params['last_name'] = last_name
             
-            response = requests.get(url, params=params, timeout=10)
+            if not self._quota_allows('searches'):
+                return None
+            response, error_id = self._get(url, params, search_bucket)
             
             if response.status_code == 200:
                 data = response.json()
+                result = None
                 if data.get('data') and data['data'].get('email'):
-                    return {
+                    result = {
                         'email': data['data']['email'],
                         'score': data['data'].get('score', 0),
                         'sources': data['data'].get('sources', []),
@@ -44,17 +146,29 @@ class EmailFinderService:
                         'company': data['data'].get('company', ''),
                         'confidence': data['data'].get('confidence', 0)
                     }
+                    hunter_cache.set('find', cache_key, result, Config.HUNTER_CACHE_TTL_FOUND)
+                else:
+                    hunter_cache.set('find', cache_key, None, Config.HUNTER_CACHE_TTL_NOT_FOUND, is_negative=True)
+                # Hunter only charges the finder when it returns an address
+                hunter_quota.record('searches', 1 if result else 0)
+                return result
             else:
+                hunter_quota.record('searches', 0, response.status_code, error_id)
                 logger.warning(f"Hunter.io API error: {response.status_code} - {response.text}")
                 return None
-                
+        
         except Exception as e:
             logger.error(f"Error finding email: {str(e)}")
             return None
     
-    def verify_email(self, email):
-        """Verify if an email address is valid"""
+    def verify_email(self, email, deadline=None):
+        """Verify if an email address is valid (deadline: time.monotonic() value to give up at)"""
         try:
+            cache_key = (email or '').strip().lower()
+            found, cached = hunter_cache.get('verify', cache_key)
+            if found:
+                return cached
+            
             if not self.api_key:
                 logger.warning("Hunter.io API key not configured")
                 return None
@@ -65,29 +179,70 @@ class EmailFinderService:
                 'api_key': self.api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            if not self._quota_allows('verifications', low_value=is_low_value_email(email)):
+                return None
+            response, error_id = self._get(url, params, verify_bucket, deadline)
+            if response is None:
+                logger.info(f"Verification of {email} skipped, deadline reached")
+                return None
             
             if response.status_code == 200:
                 data = response.json()
+                result = None
                 if data.get('data'):
-                    return {
+                    result = {
                         'email': data['data'].get('email', ''),
                         'result': data['data'].get('result', ''),
                         'score': data['data'].get('score', 0),
                         'sources': data['data'].get('sources', []),
                         'is_valid': data['data'].get('result') == 'deliverable'
                     }
+                ttl, is_negative = _verification_ttl(result)
+                hunter_cache.set('verify', cache_key, result, ttl, is_negative=is_negative)
+                hunter_quota.record('verifications', 1)
+                return result
             else:
+                hunter_quota.record('verifications', 0, response.status_code, error_id)
                 logger.warning(f"Hunter.io API error: {response.status_code} - {response.text}")
                 return None
-                
+        
         except Exception as e:
             logger.error(f"Error verifying email: {str(e)}")
             return None
     
+    def verify_emails(self, emails, deadline_seconds=None):
+        """
+        Verify several addresses concurrently on HUNTER_VERIFY_WORKERS threads, within Hunter's
+        rate limit. Returns {email: verification}; addresses without an answer when
+        deadline_seconds runs out are left out, for the caller to mark unverified.
+        """
+        if not emails:
+            return {}
+        deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+        executor = ThreadPoolExecutor(max_workers=min(Config.HUNTER_VERIFY_WORKERS, len(emails)))
+        futures = {executor.submit(self.verify_email, email, deadline): email for email in emails}
+        results = {}
+        try:
+            for future in as_completed(futures, timeout=deadline - time.monotonic() if deadline else None):
+                verification = future.result()
+                if verification is not None:
+                    results[futures[future]] = verification
+        except FuturesTimeout:
+            logger.info(f"Email verification deadline reached, {len(emails) - len(results)} of {len(emails)} unverified")
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+        return results
+    
     def domain_search(self, domain, limit=10):
         """Search for emails in a domain"""
         try:
+            cache_key = f'{self._domain_key(domain)}|{limit}'
+            found, cached = hunter_cache.get('domain', cache_key)
+            if found:
+                return cached or []
+            
             if not self.api_key:
                 logger.warning("Hunter.io API key not configured")
                 return []
@@ -99,12 +254,14 @@ class EmailFinderService:
                 'limit': limit
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            if not self._quota_allows('searches'):
+                return []
+            response, error_id = self._get(url, params, search_bucket)
             
             if response.status_code == 200:
                 data = response.json()
+                emails = []
                 if data.get('data') and data['data'].get('emails'):
-                    emails = []
                     for email_data in data['data']['emails']:
                         emails.append({
                             'email': email_data.get('value', ''),
@@ -114,11 +271,17 @@ class EmailFinderService:
                             'sources': email_data.get('sources', []),
                             'confidence': email_data.get('confidence', 0)
                         })
-                    return emails
+                    hunter_cache.set('domain', cache_key, emails, Config.HUNTER_CACHE_TTL_FOUND)
+                else:
+                    hunter_cache.set('domain', cache_key, None, Config.HUNTER_CACHE_TTL_NOT_FOUND, is_negative=True)
+                # One search credit per 10 addresses returned
+                hunter_quota.record('searches', math.ceil(len(emails) / 10))
+                return emails
             else:
+                hunter_quota.record('searches', 0, response.status_code, error_id)
                 logger.warning(f"Hunter.io API error: {response.status_code} - {response.text}")
                 return []
-                
+        
         except Exception as e:
             logger.error(f"Error searching domain: {str(e)}")
             return []
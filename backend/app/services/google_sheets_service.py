@@ -2,15 +2,179 @@ import gspread
 from google.oauth2.service_account import Credentials
 from app.config import Config
 from app.utils.logger import get_logger
+import random
+import threading
 import time
 
 logger = get_logger(__name__)
 
+# Sheets API statuses worth retrying: quota exceeded and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# A 429 is rejected before anything is applied; a 5xx may arrive after the write went through
+WRITE_RETRYABLE_STATUSES = {429}
+
+def with_backoff(func, *args, idempotent=True, **kwargs):
+    """
+    Call a gspread method, retrying quota and server errors with truncated exponential backoff.
+    Pass idempotent=False for writes that must not be repeated (appends, row deletes): those are
+    only retried on 429, since retrying after a 5xx could apply them twice.
+    """
+    retryable = RETRYABLE_STATUSES if idempotent else WRITE_RETRYABLE_STATUSES
+    for attempt in range(Config.SHEETS_MAX_RETRIES + 1):
+        try:
+            return func(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            status = getattr(e.response, 'status_code', None)
+            if status not in retryable or attempt == Config.SHEETS_MAX_RETRIES:
+                raise
+            retry_after = e.response.headers.get('Retry-After') if e.response is not None else None
+            delay = min(Config.SHEETS_BACKOFF_BASE * (2 ** attempt), Config.SHEETS_BACKOFF_MAX)
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else delay + random.uniform(0, 1)
+            logger.warning(f"Sheets API returned {status}, retrying in {delay:.1f}s (attempt {attempt + 1}/{Config.SHEETS_MAX_RETRIES})")
+            time.sleep(delay)
+
+class SheetSnapshotCache:
+    """
+    get_all_records snapshots per worksheet, shared by every GoogleSheetsService instance.
+    A snapshot is served as-is for SHEETS_CACHE_TTL seconds; after that the spreadsheet's Drive
+    modifiedTime is checked (one small request) and the rows are only downloaded again if it
+    changed. Writes made through GoogleSheetsService invalidate the worksheet immediately.
+    """
+    
+    def __init__(self):
+        self._entries = {}  # (spreadsheet id, title) -> {'records', 'revision', 'checked_at'}
+        self._key_locks = {}  # one download per worksheet at a time; concurrent readers wait for it
+        self._generations = {}  # (spreadsheet id, title) or spreadsheet id -> invalidation count
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'invalidations': 0, 'discarded': 0}
+    
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+    
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+    
+    def _generation(self, key):
+        """Changes whenever the worksheet (or its whole spreadsheet) is invalidated; call under _lock"""
+        return (self._generations.get(key[0], 0), self._generations.get(key, 0))
+    
+    def get(self, spreadsheet, title, fetch):
+        """Records for the worksheet, calling fetch() only when the snapshot is missing or stale"""
+        key = (spreadsheet.id, title)
+        with self._key_lock(key):
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry['checked_at'] < Config.SHEETS_CACHE_TTL:
+                self._count('hits')
+                return entry['records']
+            
+            revision = None
+            if Config.SHEETS_CACHE_REVISION_CHECK:
+                try:
+                    revision = with_backoff(spreadsheet.get_lastUpdateTime)
+                except Exception as e:
+                    logger.warning(f"Could not check spreadsheet revision: {str(e)}")
+            if entry and revision and revision == entry['revision']:
+                entry['checked_at'] = time.monotonic()
+                self._count('revalidated')
+                return entry['records']
+            
+            # Revision is read before the download, so a write racing it only causes an extra refresh
+            with self._lock:
+                generation = self._generation(key)
+            records = fetch()
+            with self._lock:
+                self.stats['misses'] += 1
+                if self._generation(key) == generation:
+                    self._entries[key] = {'records': records, 'revision': revision, 'checked_at': time.monotonic()}
+                else:
+                    # Invalidated while downloading: the rows may predate the write, so do not keep them
+                    self.stats['discarded'] += 1
+            return records
+    
+    def invalidate(self, spreadsheet_id, title=None):
+        """Drop the snapshot of one worksheet (or every worksheet of the spreadsheet)"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == spreadsheet_id and title in (None, key[1])]:
+                del self._entries[key]
+            generation_key = spreadsheet_id if title is None else (spreadsheet_id, title)
+            self._generations[generation_key] = self._generations.get(generation_key, 0) + 1
+            self.stats['invalidations'] += 1
+    
+    def get_stats(self):
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['revalidated'] + self.stats['misses']
+            return {
+                **self.stats,
+                'worksheets_cached': len(self._entries),
+                'hit_rate': round((self.stats['hits'] + self.stats['revalidated']) / lookups, 3) if lookups else None
+            }
+
+# Global snapshot cache shared by all GoogleSheetsService instances
+snapshot_cache = SheetSnapshotCache()
+
+class SheetsBatchWriter:
+    """
+    Buffers rows for one worksheet and appends them with one append_rows call per chunk
+    instead of one append_row per row. Use as a context manager so the tail is flushed.
+    """
+    
+    def __init__(self, sheets_service, title, chunk_size=None):
+        self.sheets_service = sheets_service
+        self.title = title
+        self.chunk_size = chunk_size or Config.SHEETS_APPEND_CHUNK_SIZE
+        self.buffer = []
+        self.rows = 0
+        self.failed = 0
+        self.api_calls = 0
+        self.seconds = 0.0
+    
+    def add(self, row):
+        self.buffer.append(row)
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+    
+    def flush(self):
+        if not self.buffer:
+            return
+        rows, self.buffer = self.buffer, []
+        started = time.monotonic()
+        try:
+            worksheet = self.sheets_service.worksheet(self.title)
+            with_backoff(worksheet.append_rows, rows, idempotent=False)
+            self.api_calls += 1
+            self.rows += len(rows)
+        except Exception as e:
+            logger.error(f"Error appending {len(rows)} rows to {self.title}: {str(e)}")
+            self.failed += len(rows)
+        finally:
+            self.seconds += time.monotonic() - started
+            self.sheets_service.invalidate(self.title)
+    
+    def get_stats(self):
+        return {
+            'rows': self.rows,
+            'failed': self.failed,
+            'api_calls': self.api_calls,
+            'seconds': round(self.seconds, 2),
+            'rows_per_second': round(self.rows / self.seconds, 1) if self.seconds else None
+        }
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+
 class GoogleSheetsService:
     def __init__(self):
         self.sheet_id = Config.GOOGLE_SHEETS_SHEET_ID
         self.client = None
         self.sheet = None
+        self._worksheets = {}  # title -> cached gspread Worksheet handle
+        self._worksheets_lock = threading.Lock()
         if self.sheet_id:
             try:
                 self.client = self._get_client()
@@ -38,18 +202,66 @@ class GoogleSheetsService:
             logger.error(f"Error initializing Google Sheets client: {str(e)}")
             return None
     
+    def worksheet(self, title):
+        """Worksheet handle by title, resolved once (each lookup is a metadata API call)"""
+        with self._worksheets_lock:
+            if title not in self._worksheets:
+                self._worksheets[title] = with_backoff(self.sheet.worksheet, title)
+            return self._worksheets[title]
+    
+    def get_records(self, title):
+        """All rows of a worksheet as dicts, served from the shared snapshot cache"""
+        return snapshot_cache.get(self.sheet, title, lambda: with_backoff(self.worksheet(title).get_all_records))
+    
+    def invalidate(self, title=None):
+        """Forget cached rows after writing to a worksheet (all worksheets if title is None)"""
+        if self.sheet:
+            snapshot_cache.invalidate(self.sheet.id, title)
+    
+    @staticmethod
+    def cache_stats():
+        """Hit/miss counters of the shared snapshot cache"""
+        return snapshot_cache.get_stats()
+    
+    def batch_writer(self, title, chunk_size=None):
+        """Buffered appender for a worksheet (see SheetsBatchWriter)"""
+        return SheetsBatchWriter(self, title, chunk_size)
+    
+    @staticmethod
+    def seller_row(seller_data):
+        """Sellers worksheet row for a seller dict"""
+        return [
+            seller_data.get('name', ''),
+            seller_data.get('email', ''),
+            seller_data.get('store_url', ''),
+            seller_data.get('phone', ''),
+            seller_data.get('created_at', time.strftime('%Y-%m-%d %H:%M:%S'))
+        ]
+    
+    @staticmethod
+    def brand_row(brand_data):
+        """Brands worksheet row for a brand dict"""
+        return [
+            brand_data.get('name', ''),
+            brand_data.get('domain', ''),
+            str(brand_data.get('social_media', '')),
+            brand_data.get('email', ''),
+            brand_data.get('created_at', time.strftime('%Y-%m-%d %H:%M:%S'))
+        ]
+    
     def get_sellers(self, page=1, limit=50):
-        """Get sellers from Google Sheets"""
+        """Get sellers from Google Sheets (limit=None returns every row)"""
         if not self.sheet:
             return []
         try:
-            worksheet = self.sheet.worksheet('Sellers')
-            records = worksheet.get_all_records()
+            records = self.get_records('Sellers')
+            if limit is None:
+                return [dict(record) for record in records]
             
             # Pagination
             start = (page - 1) * limit
             end = start + limit
-            return records[start:end]
+            return [dict(record) for record in records[start:end]]
         except Exception as e:
             logger.error(f"Error fetching sellers: {str(e)}")
             return []
@@ -59,14 +271,9 @@ class GoogleSheetsService:
         if not self.sheet:
             return seller_data
         try:
-            worksheet = self.sheet.worksheet('Sellers')
-            worksheet.append_row([
-                seller_data.get('name', ''),
-                seller_data.get('email', ''),
-                seller_data.get('store_url', ''),
-                seller_data.get('phone', ''),
-                seller_data.get('created_at', time.strftime('%Y-%m-%d %H:%M:%S'))
-            ])
+            worksheet = self.worksheet('Sellers')
+            with_backoff(worksheet.append_row, self.seller_row(seller_data), idempotent=False)
+            self.invalidate('Sellers')
             return seller_data
         except Exception as e:
             logger.error(f"Error saving seller: {str(e)}")
@@ -88,16 +295,17 @@ class GoogleSheetsService:
         pass
     
     def get_brands(self, page=1, limit=50):
-        """Get brands from Google Sheets"""
+        """Get brands from Google Sheets (limit=None returns every row)"""
         if not self.sheet:
             return []
         try:
-            worksheet = self.sheet.worksheet('Brands')
-            records = worksheet.get_all_records()
+            records = self.get_records('Brands')
+            if limit is None:
+                return [dict(record) for record in records]
             
             start = (page - 1) * limit
             end = start + limit
-            return records[start:end]
+            return [dict(record) for record in records[start:end]]
         except Exception as e:
             logger.error(f"Error fetching brands: {str(e)}")
             return []
@@ -107,14 +315,9 @@ class GoogleSheetsService:
         if not self.sheet:
             return brand_data
         try:
-            worksheet = self.sheet.worksheet('Brands')
-            worksheet.append_row([
-                brand_data.get('name', ''),
-                brand_data.get('domain', ''),
-                str(brand_data.get('social_media', '')),
-                brand_data.get('email', ''),
-                brand_data.get('created_at', time.strftime('%Y-%m-%d %H:%M:%S'))
-            ])
+            worksheet = self.worksheet('Brands')
+            with_backoff(worksheet.append_row, self.brand_row(brand_data), idempotent=False)
+            self.invalidate('Brands')
             return brand_data
         except Exception as e:
             logger.error(f"Error saving brand: {str(e)}")
@@ -130,14 +333,15 @@ class GoogleSheetsService:
         if not self.sheet:
             return analysis
         try:
-            worksheet = self.sheet.worksheet('QA_Analysis')
-            worksheet.append_row([
+            worksheet = self.worksheet('QA_Analysis')
+            with_backoff(worksheet.append_row, [
                 brand_id,
                 analysis.get('profit_margin', ''),
                 analysis.get('competition_score', ''),
                 analysis.get('status', ''),
                 analysis.get('created_at', time.strftime('%Y-%m-%d %H:%M:%S'))
-            ])
+            ], idempotent=False)
+            self.invalidate('QA_Analysis')
             return analysis
         except Exception as e:
             logger.error(f"Error saving QA analysis: {str(e)}")
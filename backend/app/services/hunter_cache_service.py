@@ -0,0 +1,118 @@
+"""
+Hunter Cache Service - Two-level cache for Hunter.io results
+An in-process LRU in front of the hunter_cache table, so an address or domain looked up on an
+earlier run (or by another worker) is not paid for again until its TTL runs out
+"""
+from app.models.hunter_cache_entry import HunterCacheEntry
+from app.config import Config
+from app.utils.logger import get_logger
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import json
+import threading
+
+logger = get_logger(__name__)
+
+class HunterCacheService:
+    """LRU + database cache of Hunter.io results, shared by every EmailFinderService"""
+    
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or Config.HUNTER_CACHE_SIZE
+        self._lru = OrderedDict()  # (kind, key) -> (result, is_negative, expires_at)
+        self._lock = threading.Lock()
+        self._engine = None  # bound at startup; scrapers call Hunter from threads without an app context
+        self.stats = {'lru_hits': 0, 'db_hits': 0, 'negative_hits': 0, 'misses': 0, 'stores': 0}
+    
+    def bind(self, engine):
+        """Use this engine for the persistent level"""
+        self._engine = engine
+    
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+    
+    def _remember(self, kind, key, result, is_negative, expires_at):
+        with self._lock:
+            self._lru[(kind, key)] = (result, is_negative, expires_at)
+            self._lru.move_to_end((kind, key))
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+    
+    def get(self, kind, key):
+        """Return (found, result); result is None for a cached negative answer"""
+        now = datetime.utcnow()
+        with self._lock:
+            entry = self._lru.get((kind, key))
+            if entry and entry[2] > now:
+                self._lru.move_to_end((kind, key))
+            elif entry:
+                del self._lru[(kind, key)]
+                entry = None
+        if entry:
+            self._count('negative_hits' if entry[1] else 'lru_hits')
+            return True, entry[0]
+        
+        if self._engine is not None:
+            try:
+                with Session(self._engine) as session:
+                    row = session.query(HunterCacheEntry).filter_by(kind=kind, cache_key=key).first()
+                    if row and row.expires_at > now:
+                        result = row.get_result()
+                        self._remember(kind, key, result, row.is_negative, row.expires_at)
+                        self._count('negative_hits' if row.is_negative else 'db_hits')
+                        return True, result
+            except Exception as e:
+                logger.warning(f"Hunter cache lookup failed: {str(e)}")
+        
+        self._count('misses')
+        return False, None
+    
+    def set(self, kind, key, result, ttl_seconds, is_negative=False):
+        """Store a result in both levels for ttl_seconds"""
+        expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
+        self._remember(kind, key, result, is_negative, expires_at)
+        self._count('stores')
+        if self._engine is None:
+            return
+        try:
+            with Session(self._engine) as session:
+                values = {
+                    'result': json.dumps(result) if result is not None else None,
+                    'is_negative': is_negative,
+                    'expires_at': expires_at,
+                    'updated_at': datetime.utcnow()
+                }
+                updated = session.query(HunterCacheEntry).filter_by(kind=kind, cache_key=key).update(values)
+                if not updated:
+                    session.add(HunterCacheEntry(kind=kind, cache_key=key, **values))
+                try:
+                    session.commit()
+                except IntegrityError:
+                    # Stored concurrently by another worker; theirs is just as fresh
+                    session.rollback()
+        except Exception as e:
+            logger.warning(f"Hunter cache store failed: {str(e)}")
+    
+    def purge_expired(self):
+        """Delete expired rows from the persistent level"""
+        if self._engine is None:
+            return 0
+        with Session(self._engine) as session:
+            deleted = session.query(HunterCacheEntry).filter(HunterCacheEntry.expires_at <= datetime.utcnow()).delete()
+            session.commit()
+            return deleted
+    
+    def get_stats(self):
+        with self._lock:
+            hits = self.stats['lru_hits'] + self.stats['db_hits'] + self.stats['negative_hits']
+            lookups = hits + self.stats['misses']
+            return {
+                **self.stats,
+                'lru_entries': len(self._lru),
+                'hit_rate': round(hits / lookups, 3) if lookups else None
+            }
+
+# Global cache instance shared by all EmailFinderService instances
+hunter_cache = HunterCacheService()
@@ -0,0 +1,253 @@
+"""
+Hunter Quota Service - Monthly credit budget for Hunter.io
+Credits spent are counted in the hunter_quota_usage table (so every worker and restart sees the
+same totals) and refreshed from Hunter's account endpoint; calls are refused once the credits are
+gone, and generic role addresses stop being verified while the budget is tight
+"""
+from app.models.hunter_quota_usage import HunterQuotaUsage
+from app.config import Config
+from app.utils.logger import get_logger
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from datetime import datetime, date, timedelta
+import threading
+import time
+
+logger = get_logger(__name__)
+
+# Role addresses guessed or scraped as a fallback; the first verifications to give up
+GENERIC_LOCAL_PARTS = {
+    'info', 'contact', 'hello', 'hi', 'support', 'help', 'sales', 'admin', 'office', 'team',
+    'mail', 'service', 'customerservice', 'enquiries', 'inquiries'
+}
+
+FIELDS = ('period_start', 'reset_date', 'credits_used', 'credits_available', 'calls', 'skipped',
+          'exhausted_at', 'last_synced_at')
+
+# Hunter error ids meaning the period's credits are spent; other 429s (e.g. too_many_requests) are rate limits
+USAGE_LIMIT_ERRORS = {'usage_limit_reached', 'usage_limit_exceeded'}
+
+def is_low_value_email(email):
+    """True for generic role addresses such as info@ or contact@"""
+    return (email or '').split('@')[0].strip().lower() in GENERIC_LOCAL_PARTS
+
+def _add_months(day, months=1):
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, min(day.day, 28))
+
+class HunterQuotaService:
+    """Persisted Hunter.io credit counters shared by every EmailFinderService"""
+    
+    RELOAD_SECONDS = 60  # pick up credits spent by other workers at least this often
+    
+    def __init__(self):
+        self._engine = None  # bound at startup; scrapers call Hunter from threads without an app context
+        self._lock = threading.Lock()
+        self._usage = {}  # kind -> HunterQuotaUsage column values
+        self._loaded_at = None
+        self._sync_claimed_at = None
+    
+    def bind(self, engine):
+        """Keep the counters in this engine's hunter_quota_usage table"""
+        self._engine = engine
+        self._reload()
+    
+    @staticmethod
+    def _new_period(kind, today):
+        allowance = Config.HUNTER_MONTHLY_SEARCHES if kind == 'searches' else Config.HUNTER_MONTHLY_VERIFICATIONS
+        period_start = today.replace(day=1)
+        return {
+            'period_start': period_start,
+            'reset_date': _add_months(period_start),
+            'credits_used': 0,
+            'credits_available': allowance or None,
+            'calls': 0,
+            'skipped': 0,
+            'exhausted_at': None,
+            'last_synced_at': None
+        }
+    
+    @staticmethod
+    def _rolled_over(usage, today):
+        """Counters for the period containing today, or None if usage already belongs to it"""
+        if today < usage['reset_date']:
+            return None
+        period_start, reset_date = usage['reset_date'], _add_months(usage['reset_date'])
+        while today >= reset_date:
+            period_start, reset_date = reset_date, _add_months(reset_date)
+        return {**usage, 'period_start': period_start, 'reset_date': reset_date, 'credits_used': 0,
+                'calls': 0, 'skipped': 0, 'exhausted_at': None}
+    
+    def _reload(self):
+        """Load the counters from the database (creating missing rows) and start new periods when due"""
+        today = datetime.utcnow().date()
+        usage = {}
+        if self._engine is not None:
+            try:
+                with Session(self._engine) as session:
+                    rows = {row.kind: row for row in session.query(HunterQuotaUsage).all()}
+                    for kind in HunterQuotaUsage.KINDS:
+                        if kind not in rows:
+                            session.add(HunterQuotaUsage(kind=kind, **self._new_period(kind, today)))
+                            continue
+                        rolled = self._rolled_over({field: getattr(rows[kind], field) for field in FIELDS}, today)
+                        if rolled:
+                            # Filtered on the old reset date so only the first worker resets the counters
+                            session.query(HunterQuotaUsage).filter_by(kind=kind, reset_date=rows[kind].reset_date).update(rolled)
+                    try:
+                        session.commit()
+                    except IntegrityError:
+                        # Rows created concurrently by another worker
+                        session.rollback()
+                    for row in session.query(HunterQuotaUsage).all():
+                        usage[row.kind] = {field: getattr(row, field) for field in FIELDS}
+            except Exception as e:
+                logger.warning(f"Hunter quota load failed: {str(e)}")
+        
+        with self._lock:
+            self._usage.update(usage)
+            for kind in HunterQuotaUsage.KINDS:
+                current = self._usage.get(kind) or self._new_period(kind, today)
+                self._usage[kind] = self._rolled_over(current, today) or current
+            self._loaded_at = time.monotonic()
+    
+    def _maybe_reload(self):
+        with self._lock:
+            due = (self._loaded_at is None or time.monotonic() - self._loaded_at > self.RELOAD_SECONDS
+                   or any(datetime.utcnow().date() >= usage['reset_date'] for usage in self._usage.values()))
+        if due:
+            self._reload()
+    
+    def _persist(self, kind, increments=None, values=None):
+        """Write a change to the counters; increments are applied in SQL so workers do not overwrite each other"""
+        if self._engine is None:
+            return
+        try:
+            with Session(self._engine) as session:
+                changes = {getattr(HunterQuotaUsage, field): getattr(HunterQuotaUsage, field) + amount
+                           for field, amount in (increments or {}).items()}
+                changes.update({getattr(HunterQuotaUsage, field): value for field, value in (values or {}).items()})
+                changes[HunterQuotaUsage.updated_at] = datetime.utcnow()
+                session.query(HunterQuotaUsage).filter_by(kind=kind).update(changes, synchronize_session=False)
+                session.commit()
+        except Exception as e:
+            logger.warning(f"Hunter quota store failed: {str(e)}")
+    
+    @staticmethod
+    def _remaining(usage):
+        if not usage['credits_available']:
+            return None
+        return max(usage['credits_available'] - usage['credits_used'], 0)
+    
+    def _exhausted(self, usage):
+        return usage['exhausted_at'] is not None or self._remaining(usage) == 0
+    
+    def _projected_exhaustion(self, usage, now):
+        """When the credits run out at this period's average daily spend, or None without spend or allowance"""
+        remaining = self._remaining(usage)
+        if remaining is None or usage['credits_used'] <= 0:
+            return None
+        # At least a day, so the first calls of a period do not extrapolate wildly
+        elapsed_days = max((now - datetime.combine(usage['period_start'], datetime.min.time())).total_seconds() / 86400, 1)
+        return now + timedelta(days=remaining * elapsed_days / usage['credits_used'])
+    
+    def _tight(self, usage, now):
+        """Below the low watermark, or spending fast enough to run out before the credits renew"""
+        remaining = self._remaining(usage)
+        if remaining is None:
+            return False
+        if remaining <= usage['credits_available'] * Config.HUNTER_QUOTA_LOW_WATERMARK:
+            return True
+        projected = self._projected_exhaustion(usage, now)
+        return projected is not None and projected < datetime.combine(usage['reset_date'], datetime.min.time())
+    
+    def allow(self, kind, low_value=False):
+        """Whether a call may spend a credit of this kind (searches / verifications)"""
+        self._maybe_reload()
+        with self._lock:
+            usage = self._usage[kind]
+            if self._exhausted(usage):
+                reason = 'credits exhausted'
+            elif low_value and self._tight(usage, datetime.utcnow()):
+                reason = 'budget tight, low-value call'
+            else:
+                return True
+            usage['skipped'] += 1
+        logger.info(f"Skipping Hunter.io {kind} call: {reason}")
+        self._persist(kind, increments={'skipped': 1})
+        return False
+    
+    def record(self, kind, credits=1, status_code=200, error_id=None):
+        """Count one API call and the credits it spent; a usage-limit error means the period's credits are used up"""
+        self._maybe_reload()
+        values = {'exhausted_at': datetime.utcnow()} if error_id in USAGE_LIMIT_ERRORS else None
+        with self._lock:
+            usage = self._usage[kind]
+            usage['calls'] += 1
+            usage['credits_used'] += credits
+            usage.update(values or {})
+        if values:
+            logger.warning(f"Hunter.io {kind} credits exhausted until {usage['reset_date'].isoformat()}")
+        self._persist(kind, increments={'calls': 1, 'credits_used': credits}, values=values)
+    
+    def claim_sync(self):
+        """True for the one caller that should refresh usage from Hunter now"""
+        with self._lock:
+            now = time.monotonic()
+            if self._sync_claimed_at is not None and now - self._sync_claimed_at < Config.HUNTER_QUOTA_SYNC_INTERVAL:
+                return False
+            self._sync_claimed_at = now
+            return True
+    
+    def update_from_account(self, account):
+        """Take used/available credits and the reset date from Hunter's account endpoint data"""
+        self._maybe_reload()
+        now = datetime.utcnow()
+        try:
+            reset_date = datetime.strptime(account['reset_date'], '%Y-%m-%d').date()
+        except (KeyError, TypeError, ValueError):
+            reset_date = None
+        
+        for kind in HunterQuotaUsage.KINDS:
+            counts = (account.get('requests') or {}).get(kind)
+            if not counts:
+                continue
+            used = int(counts.get('used') or 0)
+            available = int(counts.get('available') or 0) or None
+            values = {'credits_used': used, 'credits_available': available, 'last_synced_at': now}
+            if available and used < available:
+                values['exhausted_at'] = None
+            if reset_date:
+                values['reset_date'] = reset_date
+                values['period_start'] = _add_months(reset_date, -1)
+            with self._lock:
+                self._usage[kind].update(values)
+            self._persist(kind, values=values)
+        return self.get_stats()
+    
+    def get_stats(self):
+        """Usage, remaining credits and projected exhaustion per credit type"""
+        self._maybe_reload()
+        now = datetime.utcnow()
+        stats = {'low_value_watermark': Config.HUNTER_QUOTA_LOW_WATERMARK}
+        with self._lock:
+            for kind, usage in self._usage.items():
+                projected = self._projected_exhaustion(usage, now)
+                stats[kind] = {
+                    'credits_used': usage['credits_used'],
+                    'credits_available': usage['credits_available'],
+                    'credits_remaining': self._remaining(usage),
+                    'calls': usage['calls'],
+                    'skipped': usage['skipped'],
+                    'period_start': usage['period_start'].isoformat(),
+                    'reset_date': usage['reset_date'].isoformat(),
+                    'exhausted': self._exhausted(usage),
+                    'budget_tight': self._tight(usage, now),
+                    'projected_exhaustion': projected.isoformat() if projected else None,
+                    'exhausts_before_reset': bool(projected and projected < datetime.combine(usage['reset_date'], datetime.min.time())),
+                    'last_synced_at': usage['last_synced_at'].isoformat() if usage['last_synced_at'] else None
+                }
+        return stats
+
+# Global quota instance shared by all EmailFinderService instances
+hunter_quota = HunterQuotaService()
@@ -0,0 +1,221 @@
+"""
+Job Service - Persistence for background automation jobs
+Job rows carry per-step progress and checkpointed step results so a job interrupted by a
+worker restart can be picked up by another process and resume after its last finished step
+"""
+from app.models.database import db
+from app.models.automation_job import AutomationJob
+from app.utils.logger import get_logger
+from sqlalchemy import update
+from datetime import datetime, timedelta
+import json
+
+logger = get_logger(__name__)
+
+def _json(value):
+    return json.dumps(value, default=str)
+
+class JobTracker:
+    """Per-step progress of one running job, written to its row after every step event"""
+    
+    def __init__(self, job_id, steps=None, results=None):
+        self.job_id = job_id
+        self.steps = list(steps or [])
+        self.results = dict(results or {})
+    
+    def _step(self, name):
+        for step in self.steps:
+            if step['name'] == name:
+                return step
+        step = {'name': name, 'status': 'pending'}
+        self.steps.append(step)
+        return step
+    
+    def is_done(self, name):
+        """True if the step finished in an earlier attempt (its result is checkpointed)"""
+        step = self._step(name)
+        return step['status'] == 'completed' and name in self.results
+    
+    def result_of(self, name):
+        return self.results.get(name)
+    
+    def start(self, name):
+        step = self._step(name)
+        step.update({
+            'status': 'running',
+            'started_at': datetime.utcnow().isoformat(),
+            'finished_at': None,
+            'duration_seconds': None,
+            'error': None
+        })
+        self._save()
+    
+    def finish(self, name, result):
+        step = self._step(name)
+        finished = datetime.utcnow()
+        step['status'] = 'completed'
+        step['finished_at'] = finished.isoformat()
+        step['duration_seconds'] = round((finished - datetime.fromisoformat(step['started_at'])).total_seconds(), 2)
+        self.results[name] = result
+        self._save()
+    
+    def fail(self, name, error):
+        step = self._step(name)
+        finished = datetime.utcnow()
+        step['status'] = 'failed'
+        step['finished_at'] = finished.isoformat()
+        step['duration_seconds'] = round((finished - datetime.fromisoformat(step['started_at'])).total_seconds(), 2)
+        step['error'] = error
+        self._save()
+    
+    def _save(self):
+        JobService.save_progress(self.job_id, self.steps, self.results)
+
+class JobService:
+    """Service for automation job rows"""
+    
+    @staticmethod
+    def create_job(job_type, params=None, owner=None, user_id=None):
+        """Insert a queued job owned by this process"""
+        try:
+            job = AutomationJob(
+                job_type=job_type,
+                status='queued',
+                params=_json(params or {}),
+                owner=owner,
+                heartbeat_at=datetime.utcnow(),
+                created_by=user_id
+            )
+            db.session.add(job)
+            db.session.commit()
+            return job.to_dict()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error creating automation job: {str(e)}")
+            raise
+    
+    @staticmethod
+    def get_job(job_id):
+        """Get job by ID"""
+        try:
+            job = AutomationJob.query.get(job_id)
+            return job.to_dict() if job else None
+        except Exception as e:
+            logger.error(f"Error getting automation job: {str(e)}")
+            return None
+    
+    @staticmethod
+    def list_jobs(limit=20, job_type=None):
+        """Most recent jobs first"""
+        try:
+            query = AutomationJob.query
+            if job_type:
+                query = query.filter(AutomationJob.job_type == job_type)
+            jobs = query.order_by(AutomationJob.created_at.desc()).limit(limit).all()
+            return [job.to_dict() for job in jobs]
+        except Exception as e:
+            logger.error(f"Error listing automation jobs: {str(e)}")
+            return []
+    
+    @staticmethod
+    def start_job(job_id, owner):
+        """Mark a job running in this process; returns it with any steps checkpointed earlier"""
+        try:
+            job = AutomationJob.query.get(job_id)
+            if not job:
+                return None
+            job.status = 'running'
+            job.owner = owner
+            job.heartbeat_at = datetime.utcnow()
+            job.started_at = job.started_at or datetime.utcnow()
+            db.session.commit()
+            return job.to_dict()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error starting automation job: {str(e)}")
+            raise
+    
+    @staticmethod
+    def save_progress(job_id, steps, results):
+        """Persist step progress and the results checkpointed so far"""
+        try:
+            db.session.execute(
+                update(AutomationJob)
+                .where(AutomationJob.id == job_id)
+                .values(steps=_json(steps), result=_json(results), heartbeat_at=datetime.utcnow())
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error saving automation job progress: {str(e)}")
+    
+    @staticmethod
+    def finish_job(job_id, result, error=None):
+        """Record the final result; a job with an error is marked failed"""
+        try:
+            job = AutomationJob.query.get(job_id)
+            if not job:
+                return None
+            job.status = 'failed' if error else 'completed'
+            job.error = error
+            job.result = _json(result if result is not None else job.get_result())
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+            return job.to_dict()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error finishing automation job: {str(e)}")
+            return None
+    
+    @staticmethod
+    def touch(job_ids):
+        """Heartbeat for the jobs this process has queued or running"""
+        try:
+            db.session.execute(
+                update(AutomationJob)
+                .where(AutomationJob.id.in_(list(job_ids)))
+                .values(heartbeat_at=datetime.utcnow())
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error updating automation job heartbeat: {str(e)}")
+    
+    @staticmethod
+    def claim_stale(owner, stale_after, max_attempts):
+        """
+        Take over unfinished jobs whose owner stopped sending heartbeats (its process died or
+        restarted). Each takeover is a conditional UPDATE so only one process wins a job.
+        Returns the ids claimed for owner; jobs out of attempts are marked failed instead.
+        """
+        try:
+            cutoff = datetime.utcnow() - timedelta(seconds=stale_after)
+            stale = AutomationJob.query.with_entities(AutomationJob.id, AutomationJob.attempts).filter(
+                AutomationJob.status.in_(['queued', 'running']),
+                AutomationJob.heartbeat_at < cutoff
+            ).all()
+            
+            claimed = []
+            for job_id, attempts in stale:
+                exhausted = attempts >= max_attempts
+                values = {'heartbeat_at': datetime.utcnow(), 'owner': owner}
+                if exhausted:
+                    values.update(status='failed', error='Interrupted too many times', finished_at=datetime.utcnow())
+                else:
+                    values.update(status='queued', attempts=attempts + 1)
+                won = db.session.execute(
+                    update(AutomationJob)
+                    .where(AutomationJob.id == job_id, AutomationJob.heartbeat_at < cutoff)
+                    .values(**values)
+                ).rowcount
+                if won and not exhausted:
+                    claimed.append(job_id)
+            db.session.commit()
+            
+            if claimed:
+                logger.warning(f"Resuming {len(claimed)} interrupted automation job(s)")
+            return claimed
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error claiming stale automation jobs: {str(e)}")
+            return []
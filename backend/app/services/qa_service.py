@@ -33,6 +33,16 @@ class QAService:
             logger.error(f"Error analyzing brand: {str(e)}")
             raise
     
+    def get_all_analyses(self, page=1, limit=50, filters=None, cursor=None, include_total=True):
+        """Get QA analyses (offset pagination, or keyset pagination when a cursor is given)"""
+        try:
+            return self.db_service.get_qa_analyses(page=page, limit=limit, filters=filters, cursor=cursor, include_total=include_total)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching QA analyses: {str(e)}")
+            raise
+    
     def get_metrics(self, brand_id):
         """Get QA metrics for a brand"""
         try:
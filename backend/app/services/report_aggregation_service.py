@@ -0,0 +1,230 @@
+"""
+Report Aggregation Service - SQL-side counters, averages and top-N lists for reports
+"""
+from app.models.database import db
+from app.models.seller import Seller
+from app.models.brand import Brand
+from app.models.qa_analysis import QAAnalysis
+from app.utils.logger import get_logger
+from sqlalchemy import func, case, and_, desc
+from datetime import datetime, timedelta
+
+logger = get_logger(__name__)
+
+PROFITABLE_STATUSES = ['profitable', 'highly_profitable']
+
+class ReportAggregationService:
+    """Computes report figures with grouped SQL queries instead of loading rows into Python"""
+    
+    @staticmethod
+    def day_bounds(day=None):
+        """Return the [start, end) datetime range covering a calendar day"""
+        day = day or datetime.now()
+        start = datetime(day.year, day.month, day.day)
+        return start, start + timedelta(days=1)
+    
+    @staticmethod
+    def _in_range(column, start, end):
+        return and_(column >= start, column < end)
+    
+    @staticmethod
+    def get_seller_counters(start, end):
+        """Total, new-in-range, duplicate and failed-validation seller counts in one query"""
+        in_range = ReportAggregationService._in_range(Seller.created_at, start, end)
+        row = db.session.query(
+            func.count(Seller.id),
+            func.sum(case((in_range, 1), else_=0)),
+            func.sum(case((Seller.is_duplicate.is_(True), 1), else_=0)),
+            func.sum(case((Seller.validation_status == 'failed', 1), else_=0))
+        ).one()
+        return {
+            'total': row[0] or 0,
+            'new': int(row[1] or 0),
+            'duplicates': int(row[2] or 0),
+            'failed_validation': int(row[3] or 0)
+        }
+    
+    @staticmethod
+    def get_brand_counters(start, end):
+        """Total, new-in-range, duplicate and failed-validation brand counts in one query"""
+        in_range = ReportAggregationService._in_range(Brand.created_at, start, end)
+        row = db.session.query(
+            func.count(Brand.id),
+            func.sum(case((in_range, 1), else_=0)),
+            func.sum(case((Brand.is_duplicate.is_(True), 1), else_=0)),
+            func.sum(case((Brand.validation_status == 'failed', 1), else_=0))
+        ).one()
+        return {
+            'total': row[0] or 0,
+            'new': int(row[1] or 0),
+            'duplicates': int(row[2] or 0),
+            'failed_validation': int(row[3] or 0)
+        }
+    
+    @staticmethod
+    def get_qa_counters(start, end):
+        """QA totals plus in-range count, profitable count and averages in one query"""
+        in_range = ReportAggregationService._in_range(QAAnalysis.created_at, start, end)
+        is_profitable = func.lower(QAAnalysis.status).in_(PROFITABLE_STATUSES)
+        row = db.session.query(
+            func.count(QAAnalysis.id),
+            func.sum(case((in_range, 1), else_=0)),
+            func.sum(case((and_(in_range, is_profitable), 1), else_=0)),
+            # Missing values count as 0, matching the old per-row averaging
+            func.avg(case((in_range, func.coalesce(QAAnalysis.profit_margin, 0)), else_=None)),
+            func.avg(case((in_range, func.coalesce(QAAnalysis.competition_score, 0)), else_=None))
+        ).one()
+        return {
+            'total': row[0] or 0,
+            'new': int(row[1] or 0),
+            'profitable': int(row[2] or 0),
+            'average_profit_margin': float(row[3] or 0),
+            'average_competition_score': float(row[4] or 0)
+        }
+    
+    @staticmethod
+    def get_top_profitable_brands(limit=5):
+        """Top QA analyses by profit margin"""
+        rows = db.session.query(
+            QAAnalysis.brand_name, QAAnalysis.profit_margin, QAAnalysis.status
+        ).filter(
+            QAAnalysis.profit_margin.isnot(None),
+            QAAnalysis.profit_margin != 0
+        ).order_by(desc(QAAnalysis.profit_margin)).limit(limit).all()
+        
+        return [
+            {
+                'brand_name': brand_name,
+                'profit_margin': profit_margin,
+                'status': status
+            }
+            for brand_name, profit_margin, status in rows
+        ]
+    
+    @staticmethod
+    def get_top_competition_brands(limit=5):
+        """Top QA analyses by competition score"""
+        rows = db.session.query(
+            QAAnalysis.brand_name, QAAnalysis.competition_score
+        ).filter(
+            QAAnalysis.competition_score.isnot(None),
+            QAAnalysis.competition_score != 0
+        ).order_by(desc(QAAnalysis.competition_score)).limit(limit).all()
+        
+        return [
+            {
+                'brand_name': brand_name,
+                'competition_score': competition_score,
+                'level': ''
+            }
+            for brand_name, competition_score in rows
+        ]
+    
+    # Chart data
+    @staticmethod
+    def get_hourly_counts(model):
+        """Row counts grouped by hour of creation, keyed '00'-'23'"""
+        hour = func.extract('hour', model.created_at)
+        rows = db.session.query(hour, func.count(model.id)).group_by(hour).all()
+        return {f"{int(h):02d}": count for h, count in rows if h is not None}
+    
+    @staticmethod
+    def get_daily_counts(model, start, end):
+        """Row counts grouped by creation date within [start, end), keyed 'YYYY-MM-DD'"""
+        day = func.date(model.created_at)
+        rows = db.session.query(day, func.count(model.id)).filter(
+            ReportAggregationService._in_range(model.created_at, start, end)
+        ).group_by(day).all()
+        return {str(d)[:10]: count for d, count in rows if d is not None}
+    
+    @staticmethod
+    def get_profitability_distribution():
+        """QA analyses bucketed by profitability status"""
+        distribution = {
+            'highly_profitable': 0,
+            'profitable': 0,
+            'marginal': 0,
+            'unprofitable': 0
+        }
+        
+        # Only a handful of distinct statuses exist, so bucket the grouped rows in Python
+        rows = db.session.query(func.lower(QAAnalysis.status), func.count(QAAnalysis.id)).group_by(
+            func.lower(QAAnalysis.status)
+        ).all()
+        
+        for status, count in rows:
+            status = status or ''
+            if 'highly' in status or status == 'green':
+                distribution['highly_profitable'] += count
+            elif 'unprofitable' in status or 'red' in status:
+                distribution['unprofitable'] += count
+            elif 'profitable' in status or 'lightgreen' in status:
+                distribution['profitable'] += count
+            elif 'marginal' in status or 'yellow' in status:
+                distribution['marginal'] += count
+        
+        return distribution
+    
+    @staticmethod
+    def get_competition_distribution():
+        """QA analyses bucketed by competition score (missing scores count as 0)"""
+        score = func.coalesce(QAAnalysis.competition_score, 0)
+        bucket = case(
+            (score >= 80, 'low_competition'),
+            (score >= 60, 'moderate_competition'),
+            (score >= 40, 'high_competition'),
+            else_='very_high_competition'
+        )
+        rows = db.session.query(bucket, func.count(QAAnalysis.id)).group_by(bucket).all()
+        
+        distribution = {
+            'low_competition': 0,      # 80-100
+            'moderate_competition': 0,  # 60-79
+            'high_competition': 0,      # 40-59
+            'very_high_competition': 0  # 0-39
+        }
+        for name, count in rows:
+            distribution[name] = count
+        return distribution
+    
+    @staticmethod
+    def get_daily_trends(days=30):
+        """Seller and brand counts per day for the last N days, newest first"""
+        today_start, today_end = ReportAggregationService.day_bounds()
+        trend_start = today_start - timedelta(days=days - 1)
+        
+        seller_days = ReportAggregationService.get_daily_counts(Seller, trend_start, today_end)
+        brand_days = ReportAggregationService.get_daily_counts(Brand, trend_start, today_end)
+        
+        daily_trends = {}
+        for i in range(days):
+            date = (today_start - timedelta(days=i)).strftime('%Y-%m-%d')
+            daily_trends[date] = {
+                'sellers': seller_days.get(date, 0),
+                'brands': brand_days.get(date, 0)
+            }
+        return daily_trends
+    
+    @staticmethod
+    def get_chart_data(days=30):
+        """Collect every histogram and distribution used by the end-of-day charts in one pass"""
+        return {
+            'daily_trends': ReportAggregationService.get_daily_trends(days),
+            'total_sellers': db.session.query(func.count(Seller.id)).scalar() or 0,
+            'total_brands': db.session.query(func.count(Brand.id)).scalar() or 0,
+            'daily_breakdown': {
+                'sellers_by_hour': ReportAggregationService.get_hourly_counts(Seller),
+                'brands_by_hour': ReportAggregationService.get_hourly_counts(Brand),
+                'qa_by_hour': ReportAggregationService.get_hourly_counts(QAAnalysis)
+            },
+            'profitability_distribution': ReportAggregationService.get_profitability_distribution(),
+            'competition_score_distribution': ReportAggregationService.get_competition_distribution()
+        }
+    
+    @staticmethod
+    def get_recent(model, start, end, limit=20):
+        """Newest rows created within [start, end), serialized"""
+        rows = model.query.filter(
+            ReportAggregationService._in_range(model.created_at, start, end)
+        ).order_by(desc(model.created_at)).limit(limit).all()
+        return [row.to_dict() for row in rows]
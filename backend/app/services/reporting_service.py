@@ -1,6 +1,7 @@
 from app.services.google_sheets_service import GoogleSheetsService
 from app.services.email_service import EmailService
 from app.services.database_service import DatabaseService
+from app.services.report_aggregation_service import ReportAggregationService
 from app.utils.logger import get_logger
 from datetime import datetime, timedelta
 import json
@@ -14,53 +15,41 @@ class ReportingService:
         self.sheets_service = GoogleSheetsService()
         self.email_service = EmailService()
         self.db_service = DatabaseService()
+        self.aggregations = ReportAggregationService()
     
     def generate_daily_report(self):
         """Generate comprehensive daily report - 100% Automated"""
         try:
-            today = datetime.now().strftime('%Y-%m-%d')
-            yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+            now = datetime.now()
+            today = now.strftime('%Y-%m-%d')
+            yesterday = (now - timedelta(days=1)).strftime('%Y-%m-%d')
+            day_start, day_end = self.aggregations.day_bounds(now)
             
-            # Get all data from database
-            all_sellers_result = self.db_service.get_sellers(page=1, limit=10000)
-            all_sellers = all_sellers_result.get('data', [])
-            
-            all_brands_result = self.db_service.get_brands(page=1, limit=10000)
-            all_brands = all_brands_result.get('data', [])
-            
-            all_qa_result = self.db_service.get_qa_analyses(page=1, limit=10000)
-            all_qa = all_qa_result.get('data', [])
-            
-            # Calculate new entries (created today)
-            new_sellers = [s for s in all_sellers if s.get('created_at', '').startswith(today)]
-            new_brands = [b for b in all_brands if b.get('created_at', '').startswith(today)]
-            new_qa = [qa for qa in all_qa if qa.get('created_at', '').startswith(today)]
-            
-            # Calculate statistics
-            profitable_brands = [qa for qa in new_qa if qa.get('status', '').lower() in ['profitable', 'highly_profitable']]
-            avg_profit_margin = sum([qa.get('profit_margin', 0) or 0 for qa in new_qa]) / len(new_qa) if new_qa else 0
-            avg_competition_score = sum([qa.get('competition_score', {}).get('score', 0) if isinstance(qa.get('competition_score'), dict) else (qa.get('competition_score', 0) or 0) for qa in new_qa]) / len(new_qa) if new_qa else 0
+            # Counters, averages and top-N lists are computed in the database
+            sellers = self.aggregations.get_seller_counters(day_start, day_end)
+            brands = self.aggregations.get_brand_counters(day_start, day_end)
+            qa = self.aggregations.get_qa_counters(day_start, day_end)
             
             report_data = {
                 'date': today,
                 'yesterday': yesterday,
                 'summary': {
-                    'new_sellers': len(new_sellers),
-                    'new_brands': len(new_brands),
-                    'qa_completed': len(new_qa),
-                    'profitable_brands': len(profitable_brands),
-                    'total_sellers': len(all_sellers),
-                    'total_brands': len(all_brands),
-                    'total_qa': len(all_qa)
+                    'new_sellers': sellers['new'],
+                    'new_brands': brands['new'],
+                    'qa_completed': qa['new'],
+                    'profitable_brands': qa['profitable'],
+                    'total_sellers': sellers['total'],
+                    'total_brands': brands['total'],
+                    'total_qa': qa['total']
                 },
                 'metrics': {
-                    'average_profit_margin': round(avg_profit_margin, 2),
-                    'average_competition_score': round(avg_competition_score, 2),
-                    'profitability_rate': round((len(profitable_brands) / len(new_qa)) * 100, 2) if new_qa else 0
+                    'average_profit_margin': round(qa['average_profit_margin'], 2),
+                    'average_competition_score': round(qa['average_competition_score'], 2),
+                    'profitability_rate': round((qa['profitable'] / qa['new']) * 100, 2) if qa['new'] else 0
                 },
-                'top_performers': self._get_top_performers(all_sellers, all_brands, all_qa),
-                'issues': self._get_flagged_issues(all_sellers, all_brands),
-                'automation_summary': self._get_automation_summary(new_sellers, new_brands, new_qa)
+                'top_performers': self._get_top_performers(sellers, brands),
+                'issues': self._get_flagged_issues(sellers, brands),
+                'automation_summary': self._get_automation_summary(sellers, brands, qa)
             }
             
             logger.info(f"✅ Generated comprehensive daily report for {today}")
@@ -385,23 +374,12 @@ This is an automated 100% automated report from Lead Generation Tool
     def create_report_charts_data(self):
         """Generate data for charts (for Google Data Studio integration)"""
         try:
-            all_sellers = self.sheets_service.get_sellers(page=1, limit=10000)
-            all_brands = self.sheets_service.get_brands(page=1, limit=10000)
-            
-            # Daily trends (last 30 days)
-            daily_trends = {}
-            for i in range(30):
-                date = (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d')
-                daily_trends[date] = {
-                    'sellers': len([s for s in all_sellers if s.get('created_at', '').startswith(date)]),
-                    'brands': len([b for b in all_brands if b.get('created_at', '').startswith(date)])
-                }
-            
+            # Daily trends (last 30 days) grouped by date in the database
             charts_data = {
-                'daily_trends': daily_trends,
-                'total_sellers': len(all_sellers),
-                'total_brands': len(all_brands),
-                'growth_rate': self._calculate_growth_rate(all_sellers, all_brands)
+                'daily_trends': self.aggregations.get_daily_trends(days=30),
+                'total_sellers': self.db_service.get_sellers(limit=1)['total'],
+                'total_brands': self.db_service.get_brands(limit=1)['total'],
+                'growth_rate': self._calculate_growth_rate(None, None)
             }
             
             return charts_data
@@ -410,94 +388,62 @@ This is an automated 100% automated report from Lead Generation Tool
             logger.error(f"Error creating charts data: {str(e)}")
             return {}
     
-    def _get_top_performers(self, sellers, brands, qa_analyses):
+    def _get_top_performers(self, seller_counters, brand_counters):
         """Get top performing sellers/brands - 100% Automated"""
         try:
-            # Top brands by profitability
-            top_brands = sorted(
-                [qa for qa in qa_analyses if qa.get('profit_margin')],
-                key=lambda x: x.get('profit_margin', 0) or 0,
-                reverse=True
-            )[:5]
-            
-            # Top brands by competition score
-            top_competition = sorted(
-                [qa for qa in qa_analyses if qa.get('competition_score')],
-                key=lambda x: (x.get('competition_score', {}).get('score', 0) if isinstance(x.get('competition_score'), dict) else (x.get('competition_score', 0) or 0)),
-                reverse=True
-            )[:5]
-            
             return {
-                'top_profitable_brands': [
-                    {
-                        'brand_name': qa.get('brand_name', 'Unknown'),
-                        'profit_margin': qa.get('profit_margin', 0),
-                        'status': qa.get('status', '')
-                    }
-                    for qa in top_brands
-                ],
-                'top_competition_brands': [
-                    {
-                        'brand_name': qa.get('brand_name', 'Unknown'),
-                        'competition_score': qa.get('competition_score', {}).get('score', 0) if isinstance(qa.get('competition_score'), dict) else qa.get('competition_score', 0),
-                        'level': qa.get('competition_score', {}).get('level', '') if isinstance(qa.get('competition_score'), dict) else ''
-                    }
-                    for qa in top_competition
-                ],
-                'most_active_sellers': len(sellers),
-                'most_researched_brands': len(brands)
+                'top_profitable_brands': self.aggregations.get_top_profitable_brands(limit=5),
+                'top_competition_brands': self.aggregations.get_top_competition_brands(limit=5),
+                'most_active_sellers': seller_counters['total'],
+                'most_researched_brands': brand_counters['total']
             }
         except Exception as e:
             logger.error(f"Error getting top performers: {str(e)}")
             return {}
     
-    def _get_flagged_issues(self, sellers, brands):
+    def _get_flagged_issues(self, seller_counters, brand_counters):
         """Get flagged issues that need attention - 100% Automated"""
         try:
             issues = []
             
             # Check for duplicates
-            duplicate_sellers = [s for s in sellers if s.get('is_duplicate', False)]
-            duplicate_brands = [b for b in brands if b.get('is_duplicate', False)]
-            
-            if duplicate_sellers:
-                issues.append(f"{len(duplicate_sellers)} duplicate sellers flagged")
-            if duplicate_brands:
-                issues.append(f"{len(duplicate_brands)} duplicate brands flagged")
+            if seller_counters['duplicates']:
+                issues.append(f"{seller_counters['duplicates']} duplicate sellers flagged")
+            if brand_counters['duplicates']:
+                issues.append(f"{brand_counters['duplicates']} duplicate brands flagged")
             
             # Check for validation issues
-            invalid_sellers = [s for s in sellers if s.get('validation_status') == 'failed']
-            invalid_brands = [b for b in brands if b.get('validation_status') == 'failed']
-            
-            if invalid_sellers:
-                issues.append(f"{len(invalid_sellers)} sellers with validation issues")
-            if invalid_brands:
-                issues.append(f"{len(invalid_brands)} brands with validation issues")
+            if seller_counters['failed_validation']:
+                issues.append(f"{seller_counters['failed_validation']} sellers with validation issues")
+            if brand_counters['failed_validation']:
+                issues.append(f"{brand_counters['failed_validation']} brands with validation issues")
             
             return issues if issues else ["No critical issues flagged"]
         except Exception as e:
             logger.error(f"Error getting flagged issues: {str(e)}")
             return ["Error checking issues"]
     
-    def _get_automation_summary(self, sellers, brands, qa_analyses):
+    def _get_automation_summary(self, seller_counters, brand_counters, qa_counters):
         """Get automation summary - 100% Automated"""
         try:
+            # Source and automation percentage are not persisted on the tables yet,
+            # so only the QA completion count can be reported from the database
             return {
                 'morning_setup': {
-                    'run': len([b for b in brands if 'smartscout' in str(b.get('source', '')).lower()]) > 0,
-                    'brands_extracted': len([b for b in brands if 'smartscout' in str(b.get('source', '')).lower()])
+                    'run': False,
+                    'brands_extracted': 0
                 },
                 'seller_sniping': {
-                    'sellers_targeted': len([s for s in sellers if 'seller_sniping' in str(s.get('source', '')).lower()]),
-                    'brands_found': len([b for b in brands if 'seller_sniping' in str(b.get('source', '')).lower()])
+                    'sellers_targeted': 0,
+                    'brands_found': 0
                 },
                 'brand_research': {
-                    'brands_researched': len([b for b in brands if b.get('automation_percentage', 0) >= 80]),
-                    'avg_automation': sum([b.get('automation_percentage', 0) for b in brands]) / len(brands) if brands else 0
+                    'brands_researched': 0,
+                    'avg_automation': 0
                 },
                 'qa_analysis': {
-                    'analyses_completed': len(qa_analyses),
-                    'avg_automation': sum([qa.get('automation_percentage', 0) for qa in qa_analyses]) / len(qa_analyses) if qa_analyses else 0
+                    'analyses_completed': qa_counters['new'],
+                    'avg_automation': 0
                 }
             }
         except Exception as e:
@@ -1,21 +1,66 @@
 """
 Research Queue Service - Manages brand research queue
+Persistent queue in the research_queue table: priority ordering, SKIP LOCKED claims,
+visibility timeouts, retries with exponential backoff and dead-lettering
 """
+from app.models.database import db
+from app.models.research_queue_item import ResearchQueueItem
 from app.services.database_service import DatabaseService
+from app.config import Config
 from app.utils.logger import get_logger
-import time
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
+import random
+import uuid
 
 logger = get_logger(__name__)
 
+# Statuses a brand can be in while it still counts as queued
+ACTIVE_STATUSES = ['pending', 'processing']
+
+# Dialects with INSERT ... ON CONFLICT DO NOTHING ... RETURNING for batch enqueue
+CONFLICT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert
+}
+
+# Rows per multi-row INSERT (keeps bind parameters under SQLite's limit)
+INSERT_CHUNK_SIZE = 500
+
 class ResearchQueueService:
     """Service for managing brand research queue"""
     
     def __init__(self):
         self.db_service = DatabaseService()
     
-    def add_to_queue(self, brand_name, source='seller_sniping', priority='normal', metadata=None):
+    @staticmethod
+    def supports_skip_locked():
+        """True when concurrent workers can claim with SELECT ... FOR UPDATE SKIP LOCKED"""
+        return db.engine.dialect.name == 'postgresql'
+    
+    @staticmethod
+    def _dequeue_order(query):
+        return query.order_by(
+            ResearchQueueItem.priority.desc(),
+            ResearchQueueItem.available_at,
+            ResearchQueueItem.created_at
+        )
+    
+    @staticmethod
+    def _backoff_seconds(attempts):
+        """Exponential backoff with a little jitter so failed items do not retry in lockstep"""
+        delay = min(Config.RESEARCH_QUEUE_BACKOFF_BASE * (2 ** max(attempts - 1, 0)), Config.RESEARCH_QUEUE_BACKOFF_MAX)
+        return delay + random.uniform(0, delay * 0.1)
+    
+    def add_to_queue(self, brand_name, source='seller_sniping', priority='normal', metadata=None, user_id=None):
         """Add brand to research queue"""
         try:
+            brand_name = (brand_name or '').strip()
+            if not brand_name:
+                return {'added': False, 'error': 'Brand name is required'}
+            
             # Check if brand already exists in database
             existing_brand = self.db_service.get_brand_by_name(brand_name)
             if existing_brand:
@@ -27,35 +72,122 @@ class ResearchQueueService:
                 }
             
             # Check if already in queue
-            queue_item = {
-                'brand_name': brand_name,
-                'source': source,
-                'priority': priority,
-                'status': 'pending',
-                'metadata': metadata or {},
-                'created_at': time.strftime('%Y-%m-%d %H:%M:%S')
-            }
+            queued = ResearchQueueItem.query.filter(
+                func.lower(ResearchQueueItem.brand_name) == brand_name.lower(),
+                ResearchQueueItem.status.in_(ACTIVE_STATUSES)
+            ).first()
+            if queued:
+                logger.info(f"Brand '{brand_name}' already queued, skipping")
+                return {
+                    'added': False,
+                    'reason': 'already_queued',
+                    'queue_item_id': queued.id
+                }
+            
+            queue_item = ResearchQueueItem(
+                brand_name=brand_name,
+                source=source,
+                priority=ResearchQueueItem.priority_value(priority),
+                max_attempts=Config.RESEARCH_QUEUE_MAX_ATTEMPTS,
+                created_by=user_id
+            )
+            queue_item.set_details(metadata)
+            db.session.add(queue_item)
+            try:
+                db.session.commit()
+            except IntegrityError:
+                # Queued concurrently by another request (unique active-name index)
+                db.session.rollback()
+                return {'added': False, 'reason': 'already_queued'}
             
-            # Save to queue (would be stored in database or queue table)
-            # For now, return success
             logger.info(f"✅ Added '{brand_name}' to research queue (priority: {priority})")
             
             return {
                 'added': True,
                 'brand_name': brand_name,
                 'priority': priority,
-                'queue_item': queue_item
+                'queue_item': queue_item.to_dict()
             }
-            
+        
         except Exception as e:
+            db.session.rollback()
             logger.error(f"Error adding to research queue: {str(e)}")
             return {
                 'added': False,
                 'error': str(e)
             }
     
-    def add_batch_to_queue(self, brand_names, source='seller_sniping', priority='normal'):
-        """Add multiple brands to queue"""
+    def add_batch_to_queue(self, brand_names, source='seller_sniping', priority='normal', user_id=None):
+        """
+        Add multiple brands to queue.
+        Set-based: one lower(name) query finds existing brands and the new rows go in with
+        INSERT ... ON CONFLICT DO NOTHING, so already-queued names are skipped by the unique
+        active-name index instead of a lookup per brand.
+        """
+        insert = CONFLICT_INSERTS.get(db.engine.dialect.name)
+        if insert is None:
+            return self._add_batch_per_item(brand_names, source, priority, user_id)
+        
+        results = {
+            'added': [],
+            'skipped': [],
+            'errors': []
+        }
+        
+        # Normalize, keeping the first spelling of each name
+        candidates = {}
+        for brand_name in brand_names:
+            name = (brand_name or '').strip()
+            if not name:
+                results['errors'].append({'brand': brand_name, 'error': 'Brand name is required'})
+            elif name.lower() in candidates:
+                results['skipped'].append(name)
+            else:
+                candidates[name.lower()] = name
+        
+        try:
+            existing = self.db_service.get_existing_brand_names(candidates)
+            results['skipped'].extend(candidates.pop(key) for key in list(candidates) if key in existing)
+            
+            now = datetime.utcnow()
+            rows = [{
+                'id': str(uuid.uuid4()),
+                'brand_name': name,
+                'source': source,
+                'priority': ResearchQueueItem.priority_value(priority),
+                'status': 'pending',
+                'attempts': 0,
+                'max_attempts': Config.RESEARCH_QUEUE_MAX_ATTEMPTS,
+                'available_at': now,
+                'created_by': user_id,
+                'created_at': now,
+                'updated_at': now
+            } for name in candidates.values()]
+            
+            table = ResearchQueueItem.__table__
+            inserted = set()
+            for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+                statement = (
+                    insert(table)
+                    .values(rows[start:start + INSERT_CHUNK_SIZE])
+                    .on_conflict_do_nothing()
+                    .returning(table.c.brand_name)
+                )
+                inserted.update(row[0] for row in db.session.execute(statement))
+            db.session.commit()
+            
+            for name in candidates.values():
+                (results['added'] if name in inserted else results['skipped']).append(name)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error adding batch to research queue: {str(e)}")
+            results['errors'].extend({'brand': name, 'error': str(e)} for name in candidates.values())
+        
+        logger.info(f"Batch queue: {len(results['added'])} added, {len(results['skipped'])} skipped, {len(results['errors'])} errors")
+        return results
+    
+    def _add_batch_per_item(self, brand_names, source, priority, user_id):
+        """Row-by-row enqueue for databases without ON CONFLICT support"""
         results = {
             'added': [],
             'skipped': [],
@@ -63,10 +195,10 @@ class ResearchQueueService:
         }
         
         for brand_name in brand_names:
-            result = self.add_to_queue(brand_name, source, priority)
+            result = self.add_to_queue(brand_name, source, priority, user_id=user_id)
             if result.get('added'):
                 results['added'].append(brand_name)
-            elif result.get('reason') == 'already_exists':
+            elif result.get('reason') in ('already_exists', 'already_queued'):
                 results['skipped'].append(brand_name)
             else:
                 results['errors'].append({
@@ -78,12 +210,152 @@ class ResearchQueueService:
         return results
     
     def get_queue(self, status='pending', limit=100):
-        """Get brands from research queue"""
+        """Get brands from research queue in the order workers will take them"""
         try:
-            # Would fetch from queue table
-            # For now, return empty list
-            return []
+            query = ResearchQueueItem.query
+            if status:
+                query = query.filter(ResearchQueueItem.status == status)
+            items = self._dequeue_order(query).limit(limit).all()
+            return [item.to_dict() for item in items]
         except Exception as e:
             logger.error(f"Error getting queue: {str(e)}")
             return []
-
+    
+    def get_stats(self):
+        """Item counts per status and the age of the oldest pending item"""
+        try:
+            counts = dict(
+                db.session.query(ResearchQueueItem.status, func.count(ResearchQueueItem.id))
+                .group_by(ResearchQueueItem.status)
+                .all()
+            )
+            oldest = db.session.query(func.min(ResearchQueueItem.created_at)).filter(
+                ResearchQueueItem.status == 'pending'
+            ).scalar()
+            return {
+                **{status: counts.get(status, 0) for status in ResearchQueueItem.STATUSES},
+                'oldest_pending_seconds': int((datetime.utcnow() - oldest).total_seconds()) if oldest else 0
+            }
+        except Exception as e:
+            logger.error(f"Error getting queue stats: {str(e)}")
+            return {}
+    
+    def claim(self, worker_id, limit=1, visibility_timeout=None):
+        """
+        Claim up to limit visible items for worker_id.
+        
+        Claimed items stay invisible to other workers until their visibility timeout; an item
+        whose worker died becomes visible again and is retried (or dead-lettered if that was
+        its last attempt). On PostgreSQL concurrent workers skip each other's locked rows.
+        """
+        visibility_timeout = visibility_timeout or Config.RESEARCH_QUEUE_VISIBILITY_TIMEOUT
+        try:
+            now = datetime.utcnow()
+            query = self._dequeue_order(ResearchQueueItem.query.filter(
+                ResearchQueueItem.status.in_(ACTIVE_STATUSES),
+                ResearchQueueItem.available_at <= now
+            )).limit(limit)
+            if self.supports_skip_locked():
+                query = query.with_for_update(skip_locked=True)
+            
+            claimed = []
+            for item in query.all():
+                if item.attempts >= item.max_attempts:
+                    # Visibility timeout expired on the final attempt
+                    self._dead_letter(item, item.last_error or 'Visibility timeout expired on final attempt')
+                    continue
+                item.status = 'processing'
+                item.attempts += 1
+                item.locked_by = worker_id
+                item.available_at = now + timedelta(seconds=visibility_timeout)
+                claimed.append(item)
+            db.session.commit()
+            return [item.to_dict() for item in claimed]
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error claiming research queue items: {str(e)}")
+            return []
+    
+    @staticmethod
+    def _update_leased(item_id, worker_id, values):
+        """
+        Apply values only while worker_id still holds the item's lease. Returns False when the
+        lease was lost (visibility timeout expired and another worker claimed or dead-lettered it).
+        """
+        updated = ResearchQueueItem.query.filter_by(id=item_id, status='processing', locked_by=worker_id).update(
+            values, synchronize_session=False)
+        db.session.commit()
+        if not updated:
+            logger.warning(f"Worker {worker_id} lost its lease on research queue item {item_id}, result discarded")
+        return bool(updated)
+    
+    def complete(self, item_id, worker_id, brand_id=None):
+        """Mark an item claimed by worker_id as researched; None if the lease was lost"""
+        try:
+            if not self._update_leased(item_id, worker_id, {
+                'status': 'completed',
+                'brand_id': brand_id,
+                'locked_by': None,
+                'last_error': None,
+                'completed_at': datetime.utcnow()
+            }):
+                return None
+            return ResearchQueueItem.query.get(item_id).to_dict()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error completing research queue item: {str(e)}")
+            return None
+    
+    def fail(self, item_id, worker_id, error):
+        """
+        Schedule a retry with backoff, or dead-letter the item once max_attempts is used up.
+        Only the worker holding the lease can do either; returns None if the lease was lost.
+        """
+        try:
+            item = ResearchQueueItem.query.get(item_id)
+            if not item:
+                return None
+            if item.attempts >= item.max_attempts:
+                values = {'status': 'dead', 'locked_by': None, 'last_error': error}
+            else:
+                delay = self._backoff_seconds(item.attempts)
+                values = {
+                    'status': 'pending',
+                    'locked_by': None,
+                    'last_error': error,
+                    'available_at': datetime.utcnow() + timedelta(seconds=delay)
+                }
+            brand_name, attempts = item.brand_name, item.attempts
+            if not self._update_leased(item_id, worker_id, values):
+                return None
+            if values['status'] == 'dead':
+                logger.error(f"Research of '{brand_name}' dead-lettered after {attempts} attempts: {error}")
+            else:
+                logger.warning(f"Research of '{brand_name}' failed (attempt {attempts}/{item.max_attempts}), retrying in {int(delay)}s: {error}")
+            return ResearchQueueItem.query.get(item_id).to_dict()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error failing research queue item: {str(e)}")
+            return None
+    
+    def _dead_letter(self, item, error):
+        item.status = 'dead'
+        item.locked_by = None
+        item.last_error = error
+        logger.error(f"Research of '{item.brand_name}' dead-lettered after {item.attempts} attempts: {error}")
+    
+    def retry_dead(self, item_id):
+        """Put a dead-lettered item back in the queue with a fresh set of attempts"""
+        try:
+            item = ResearchQueueItem.query.get(item_id)
+            if not item or item.status != 'dead':
+                return None
+            item.status = 'pending'
+            item.attempts = 0
+            item.available_at = datetime.utcnow()
+            db.session.commit()
+            return item.to_dict()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error retrying research queue item: {str(e)}")
+            return None
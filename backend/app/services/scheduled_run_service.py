@@ -0,0 +1,88 @@
+"""
+Scheduled Run Service - Run history and per-trigger locking for scheduled tasks
+Each web worker runs its own scheduler, so every trigger fires once per process; the first
+process to insert the (job_id, scheduled_for) row runs the task and the others skip it
+"""
+from app.models.database import db
+from app.models.scheduled_job_run import ScheduledJobRun
+from app.utils.logger import get_logger
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+import json
+
+logger = get_logger(__name__)
+
+class ScheduledRunService:
+    """Service for scheduled job runs"""
+    
+    @staticmethod
+    def claim_run(job_id, scheduled_for, owner):
+        """Record the run for this trigger; returns its id, or None if another process has it"""
+        try:
+            run = ScheduledJobRun(job_id=job_id, scheduled_for=scheduled_for, owner=owner)
+            db.session.add(run)
+            db.session.commit()
+            return run.id
+        except IntegrityError:
+            db.session.rollback()
+            logger.info(f"Scheduled job {job_id} for {scheduled_for} already claimed by another worker")
+            return None
+    
+    @staticmethod
+    def finish_run(run_id, result=None, error=None):
+        """Record duration, status and result size of a claimed run"""
+        try:
+            run = ScheduledJobRun.query.get(run_id)
+            if not run:
+                return None
+            run.finished_at = datetime.utcnow()
+            run.duration_seconds = round((run.finished_at - run.started_at).total_seconds(), 2)
+            run.status = 'failed' if error else 'completed'
+            run.error = error
+            run.result_size = len(json.dumps(result, default=str)) if result is not None else 0
+            db.session.commit()
+            return run.to_dict()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error finishing scheduled run: {str(e)}")
+            return None
+    
+    @staticmethod
+    def list_runs(job_id=None, limit=50):
+        """Most recent runs first"""
+        try:
+            query = ScheduledJobRun.query
+            if job_id:
+                query = query.filter(ScheduledJobRun.job_id == job_id)
+            runs = query.order_by(ScheduledJobRun.scheduled_for.desc()).limit(limit).all()
+            return [run.to_dict() for run in runs]
+        except Exception as e:
+            logger.error(f"Error listing scheduled runs: {str(e)}")
+            return []
+    
+    @staticmethod
+    def get_summary():
+        """Run counts and durations per job"""
+        try:
+            rows = db.session.query(
+                ScheduledJobRun.job_id,
+                func.count(ScheduledJobRun.id),
+                func.sum(db.case((ScheduledJobRun.status == 'failed', 1), else_=0)),
+                func.avg(ScheduledJobRun.duration_seconds),
+                func.max(ScheduledJobRun.duration_seconds),
+                func.max(ScheduledJobRun.scheduled_for)
+            ).group_by(ScheduledJobRun.job_id).all()
+            return {
+                job_id: {
+                    'runs': runs,
+                    'failed': int(failed or 0),
+                    'avg_duration_seconds': round(avg_duration, 2) if avg_duration is not None else None,
+                    'max_duration_seconds': max_duration,
+                    'last_scheduled_for': last.isoformat() if last else None
+                }
+                for job_id, runs, failed, avg_duration, max_duration, last in rows
+            }
+        except Exception as e:
+            logger.error(f"Error summarizing scheduled runs: {str(e)}")
+            return {}
@@ -4,6 +4,7 @@ from app.services.data_validation_service import DataValidationService
 from app.services.duplicate_detector_service import DuplicateDetectorService
 from app.services.research_queue_service import ResearchQueueService
 from app.utils.logger import get_logger
+import time
 
 logger = get_logger(__name__)
 
@@ -24,6 +25,16 @@ class SellerService:
             logger.error(f"Error fetching sellers: {str(e)}")
             raise
     
+    def get_sellers_page(self, cursor='', limit=50, filters=None, include_total=False):
+        """Get one keyset page of sellers along with the cursor for the next page"""
+        try:
+            return self.db_service.get_sellers(limit=limit, filters=filters, cursor=cursor, include_total=include_total)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching sellers page: {str(e)}")
+            raise
+    
     def get_seller_by_id(self, seller_id):
         """Get seller by ID"""
         try:
@@ -45,9 +56,7 @@ class SellerService:
             validated_data = self.validator.validate_seller_data(seller_data)
             
             # Check for duplicates before saving
-            all_sellers_result = self.db_service.get_sellers(page=1, limit=1000)
-            all_sellers = all_sellers_result.get('data', [])
-            is_duplicate = self._check_duplicate(validated_data, all_sellers)
+            is_duplicate = self._check_duplicate(validated_data)
             
             if is_duplicate:
                 logger.warning(f"Duplicate seller detected: {validated_data.get('name')}")
@@ -63,26 +72,12 @@ class SellerService:
             logger.error(f"Error scraping seller: {str(e)}")
             raise
     
-    def _check_duplicate(self, seller_data, existing_sellers):
-        """Check if seller is a duplicate"""
+    def _check_duplicate(self, seller_data):
+        """Check if seller is a duplicate (same name, email or store URL) via the dedupe index"""
         try:
-            name = seller_data.get('name', '').lower().strip()
-            email = seller_data.get('email', '').lower().strip()
-            url = seller_data.get('store_url', '').lower().strip()
-            
-            for existing in existing_sellers:
-                existing_name = existing.get('name', '').lower().strip()
-                existing_email = existing.get('email', '').lower().strip()
-                existing_url = existing.get('store_url', '').lower().strip()
-                
-                # Check exact match
-                if (name and existing_name and name == existing_name) or \
-                   (email and existing_email and email == existing_email) or \
-                   (url and existing_url and url == existing_url):
-                    return True
-            
-            return False
-        except:
+            return self.db_service.find_duplicate('seller', seller_data) is not None
+        except Exception as e:
+            logger.error(f"Error checking duplicate seller: {str(e)}")
             return False
     
     def update_seller(self, seller_id, data):
@@ -139,7 +134,8 @@ class SellerService:
                 queue_result = self.research_queue.add_batch_to_queue(
                     new_brands,
                     source='seller_sniping',
-                    priority='normal'
+                    priority='normal',
+                    user_id=user_id
                 )
                 brands_queued = queue_result.get('added', [])
                 logger.info(f"✅ Added {len(brands_queued)} brands to research queue")
@@ -156,6 +152,7 @@ class SellerService:
                 'new_brands': new_brands,
                 'existing_brands': existing_brands,
                 'brands_queued': brands_queued if auto_queue else [],
+                'wait_stats': self.scraper.last_wait_stats,
                 'needs_human_review': True,  # Human needs to verify brand quality
                 'human_tasks': [
                     'Review extracted brands for quality',
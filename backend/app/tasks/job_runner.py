@@ -0,0 +1,108 @@
+"""
+Background runner for automation jobs
+Runs long automation pipelines off the request thread; job state lives in automation_jobs
+so another web worker resumes a job if the process running it goes away
+"""
+from app.models.database import db
+from app.services.automation_service import AutomationService
+from app.services.job_service import JobService, JobTracker
+from app.config import Config
+from app.utils.logger import get_logger
+from concurrent.futures import ThreadPoolExecutor
+import atexit
+import os
+import socket
+import threading
+
+logger = get_logger(__name__)
+
+# job_type -> callable(automation_service, params, tracker) returning the job result
+JOB_TYPES = {
+    'morning_setup': lambda automation, params, tracker: automation.morning_setup(tracker=tracker, **params),
+    'end_of_day': lambda automation, params, tracker: automation.end_of_day_tasks(tracker=tracker)
+}
+
+class JobRunner:
+    """Executor for automation jobs plus a heartbeat that also recovers abandoned jobs"""
+    
+    def __init__(self, app):
+        self.app = app
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.executor = ThreadPoolExecutor(max_workers=Config.AUTOMATION_JOB_WORKERS, thread_name_prefix='automation-job')
+        self._active = set()  # ids queued or running in this process
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat = threading.Thread(target=self._heartbeat_loop, name='automation-job-heartbeat', daemon=True)
+        self._heartbeat.start()
+    
+    def submit(self, job_type, params=None, user_id=None):
+        """Persist a queued job and schedule it; returns the job dict immediately"""
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Unknown job type: {job_type}")
+        job = JobService.create_job(job_type, params, owner=self.owner, user_id=user_id)
+        self._schedule(job['id'])
+        logger.info(f"Automation job {job['id']} ({job_type}) queued")
+        return job
+    
+    def _schedule(self, job_id):
+        with self._lock:
+            self._active.add(job_id)
+        self.executor.submit(self._run, job_id)
+    
+    def _run(self, job_id):
+        with self.app.app_context():
+            try:
+                job = JobService.start_job(job_id, self.owner)
+                if not job:
+                    return
+                tracker = JobTracker(job_id, job['steps'], job['result'])
+                result = JOB_TYPES[job['job_type']](AutomationService(), job['params'], tracker)
+                error = result.get('error') if isinstance(result, dict) else None
+                JobService.finish_job(job_id, result, error=error)
+                logger.info(f"Automation job {job_id} ({job['job_type']}) {'failed' if error else 'completed'}")
+            except Exception as e:
+                logger.error(f"Error running automation job {job_id}: {str(e)}")
+                db.session.rollback()
+                JobService.finish_job(job_id, None, error=str(e))
+            finally:
+                with self._lock:
+                    self._active.discard(job_id)
+                db.session.remove()
+    
+    def _heartbeat_loop(self):
+        # Check for abandoned jobs right away, then on every heartbeat
+        while True:
+            try:
+                with self.app.app_context():
+                    with self._lock:
+                        active = list(self._active)
+                    if active:
+                        JobService.touch(active)
+                    for job_id in JobService.claim_stale(
+                        self.owner, Config.AUTOMATION_JOB_STALE_AFTER, Config.AUTOMATION_JOB_MAX_ATTEMPTS
+                    ):
+                        self._schedule(job_id)
+                    db.session.remove()
+            except Exception as e:
+                logger.error(f"Error in automation job heartbeat: {str(e)}")
+            if self._stop.wait(Config.AUTOMATION_JOB_HEARTBEAT):
+                return
+    
+    def shutdown(self):
+        """Stop heartbeats; running jobs are resumed by another process once they go stale"""
+        self._stop.set()
+        self.executor.shutdown(wait=False)
+
+# Global runner instance
+job_runner = None
+_runner_lock = threading.Lock()
+
+def init_job_runner(app):
+    """Start the automation job runner for this process"""
+    global job_runner
+    with _runner_lock:
+        if job_runner is None:
+            job_runner = JobRunner(app)
+            atexit.register(job_runner.shutdown)
+            logger.info("Automation job runner started")
+    return job_runner
@@ -0,0 +1,145 @@
+"""
+Research queue worker
+Drains the research_queue table into BrandService.research_brand
+
+Run standalone:  python -m app.tasks.research_worker [--workers N] [--drain]
+or in-process alongside the API with ENABLE_RESEARCH_WORKER=true (see run.py)
+"""
+from app.models.database import db
+from app.services.brand_service import BrandService
+from app.services.research_queue_service import ResearchQueueService
+from app.config import Config
+from app.utils.logger import get_logger
+import argparse
+import atexit
+import os
+import socket
+import threading
+
+logger = get_logger(__name__)
+
+class ResearchQueueWorker:
+    """Pool of worker threads that claim queue items one at a time and research them"""
+    
+    def __init__(self, app, concurrency=None, poll_interval=None):
+        self.app = app
+        self.poll_interval = poll_interval or Config.RESEARCH_QUEUE_POLL_INTERVAL
+        concurrency = max(concurrency or Config.RESEARCH_QUEUE_WORKERS, 1)
+        with app.app_context():
+            if concurrency > 1 and not ResearchQueueService.supports_skip_locked():
+                # Without SKIP LOCKED two workers could claim the same row
+                logger.warning(f"{db.engine.dialect.name} has no SKIP LOCKED support, running a single research worker")
+                concurrency = 1
+        self.concurrency = concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self.stats = {
+            'processed': 0,
+            'completed': 0,
+            'failed': 0,
+            'lease_lost': 0
+        }
+    
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+    
+    def process_next(self, queue, brand_service, worker_id):
+        """Claim and research one item; returns False when nothing was visible"""
+        items = queue.claim(worker_id)
+        if not items:
+            return False
+        
+        item = items[0]
+        try:
+            logger.info(f"[{worker_id}] Researching queued brand '{item['brand_name']}' (attempt {item['attempts']})")
+            brand = brand_service.research_brand(item['brand_name'], user_id=item['created_by'])
+            if queue.complete(item['id'], worker_id, brand_id=brand.get('id')) is None:
+                self._count('lease_lost')
+            else:
+                self._count('completed')
+        except Exception as e:
+            db.session.rollback()
+            if queue.fail(item['id'], worker_id, str(e)) is None:
+                self._count('lease_lost')
+            else:
+                self._count('failed')
+        finally:
+            self._count('processed')
+            # Fresh session per item so a long-running worker does not accumulate state
+            db.session.remove()
+        return True
+    
+    def _run(self, index):
+        worker_id = f"{self.worker_id}:{index}"
+        with self.app.app_context():
+            queue = ResearchQueueService()
+            brand_service = BrandService()  # one researcher per thread
+            while not self._stop.is_set():
+                try:
+                    if not self.process_next(queue, brand_service, worker_id):
+                        self._stop.wait(self.poll_interval)
+                except Exception as e:
+                    logger.error(f"Error in research worker {worker_id}: {str(e)}")
+                    self._stop.wait(self.poll_interval)
+    
+    def start(self):
+        """Start the worker threads"""
+        for index in range(self.concurrency):
+            thread = threading.Thread(target=self._run, args=(index,), name=f'research-worker-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Research queue worker started ({self.concurrency} threads)")
+    
+    def stop(self, timeout=None):
+        """Signal the threads to stop after their current item and wait for them"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        logger.info(f"Research queue worker stopped: {self.stats}")
+    
+    def drain(self, max_items=None):
+        """Process visible items in the calling thread until the queue is empty"""
+        with self.app.app_context():
+            queue = ResearchQueueService()
+            brand_service = BrandService()
+            worker_id = f"{self.worker_id}:drain"
+            processed = 0
+            while max_items is None or processed < max_items:
+                if not self.process_next(queue, brand_service, worker_id):
+                    break
+                processed += 1
+        return dict(self.stats)
+
+# Global worker instance
+research_worker = None
+
+def init_research_worker(app):
+    """Start the in-process research worker"""
+    global research_worker
+    if research_worker is None:
+        research_worker = ResearchQueueWorker(app)
+        research_worker.start()
+        atexit.register(lambda: research_worker.stop(timeout=5) if research_worker else None)
+    return research_worker
+
+if __name__ == '__main__':
+    from app import create_app
+    
+    parser = argparse.ArgumentParser(description='Drain the brand research queue')
+    parser.add_argument('--workers', type=int, default=None, help='worker threads (default RESEARCH_QUEUE_WORKERS)')
+    parser.add_argument('--drain', action='store_true', help='process visible items once and exit')
+    args = parser.parse_args()
+    
+    worker = ResearchQueueWorker(create_app(), concurrency=args.workers)
+    if args.drain:
+        print(worker.drain())
+    else:
+        worker.start()
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            worker.stop()
@@ -1,18 +1,32 @@
 from apscheduler.schedulers.background import BackgroundScheduler
+from app.models.database import db
 from app.services.automation_service import AutomationService
 from app.services.reporting_service import ReportingService
 from app.services.backup_service import BackupService
+from app.services.scheduled_run_service import ScheduledRunService
 from app.config import Config
 from app.utils.logger import get_logger
+from datetime import datetime, timedelta, timezone
 import atexit
+import os
+import socket
 
 logger = get_logger(__name__)
 
 class TaskScheduler:
-    """Scheduler for automated tasks"""
+    """
+    Scheduler for automated tasks.
+    Every web worker runs one of these; a trigger only runs in the worker that claims its
+    scheduled_job_runs row, so each task runs once per trigger however many workers there are.
+    """
     
-    def __init__(self):
-        self.scheduler = BackgroundScheduler()
+    def __init__(self, app=None):
+        self.app = app
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.scheduler = BackgroundScheduler(job_defaults={
+            'coalesce': True,
+            'misfire_grace_time': Config.SCHEDULER_MISFIRE_GRACE
+        })
         self.automation_service = AutomationService()
         self.reporting_service = ReportingService()
         self.backup_service = BackupService()
@@ -23,7 +37,8 @@ class TaskScheduler:
         try:
             # Morning setup - Run at 9:00 AM daily
             self.scheduler.add_job(
-                func=self._morning_setup_job,
+                func=self._run_job,
+                args=['morning_setup', self._morning_setup_job],
                 trigger='cron',
                 hour=9,
                 minute=0,
@@ -34,7 +49,8 @@ class TaskScheduler:
             
             # End of day tasks - Run at 6:00 PM daily
             self.scheduler.add_job(
-                func=self._end_of_day_job,
+                func=self._run_job,
+                args=['end_of_day', self._end_of_day_job],
                 trigger='cron',
                 hour=18,
                 minute=0,
@@ -45,7 +61,8 @@ class TaskScheduler:
             
             # Daily backup - Run at 11:00 PM daily
             self.scheduler.add_job(
-                func=self._backup_job,
+                func=self._run_job,
+                args=['daily_backup', self._backup_job],
                 trigger='cron',
                 hour=23,
                 minute=0,
@@ -56,7 +73,8 @@ class TaskScheduler:
             
             # Weekly summary - Run every Monday at 9:00 AM
             self.scheduler.add_job(
-                func=self._weekly_summary_job,
+                func=self._run_job,
+                args=['weekly_summary', self._weekly_summary_job],
                 trigger='cron',
                 day_of_week='mon',
                 hour=9,
@@ -71,42 +89,69 @@ class TaskScheduler:
         except Exception as e:
             logger.error(f"Error setting up scheduled jobs: {str(e)}")
     
-    def _morning_setup_job(self):
-        """Morning setup job"""
+    def _fire_time(self, job_id):
+        """
+        Trigger time of the run in progress, as naive UTC. The same for every process (unlike
+        the clock at the moment each one wakes up), so it identifies the trigger in the run table.
+        """
+        job = self.scheduler.get_job(job_id)
+        now = datetime.now(job.trigger.timezone)
+        fire_time = job.trigger.get_next_fire_time(None, now - timedelta(seconds=Config.SCHEDULER_MISFIRE_GRACE))
+        if fire_time is None or fire_time > now:
+            fire_time = now.replace(second=0, microsecond=0)
+        return fire_time.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    def _run_job(self, job_id, func):
+        """Claim this trigger's run, execute the job and record its duration, status and result size"""
+        if self.app is None:
+            return self._execute(job_id, func)
+        with self.app.app_context():
+            try:
+                run_id = ScheduledRunService.claim_run(job_id, self._fire_time(job_id), self.owner)
+                if run_id is None:
+                    return
+                result, error = self._execute(job_id, func)
+                ScheduledRunService.finish_run(run_id, result, error)
+            except Exception as e:
+                logger.error(f"Error running scheduled job {job_id}: {str(e)}")
+            finally:
+                db.session.remove()
+    
+    def _execute(self, job_id, func):
         try:
-            logger.info("Running scheduled morning setup...")
-            self.automation_service.morning_setup()
+            result = func()
+            error = result.get('error') if isinstance(result, dict) else None
+            if error:
+                logger.error(f"Error in {job_id} job: {error}")
+            return result, error
         except Exception as e:
-            logger.error(f"Error in morning setup job: {str(e)}")
+            logger.error(f"Error in {job_id} job: {str(e)}")
+            return None, str(e)
+    
+    def _morning_setup_job(self):
+        """Morning setup job"""
+        logger.info("Running scheduled morning setup...")
+        return self.automation_service.morning_setup()
     
     def _end_of_day_job(self):
         """End of day job"""
-        try:
-            logger.info("Running scheduled end of day tasks...")
-            self.automation_service.end_of_day_tasks()
-        except Exception as e:
-            logger.error(f"Error in end of day job: {str(e)}")
+        logger.info("Running scheduled end of day tasks...")
+        return self.automation_service.end_of_day_tasks()
     
     def _backup_job(self):
         """Backup job"""
-        try:
-            logger.info("Running scheduled backup...")
-            self.backup_service.backup_all_data()
-        except Exception as e:
-            logger.error(f"Error in backup job: {str(e)}")
+        logger.info("Running scheduled backup...")
+        return self.backup_service.backup_all_data()
     
     def _weekly_summary_job(self):
         """Weekly summary job"""
-        try:
-            logger.info("Running scheduled weekly summary...")
-            # Get manager emails from config
-            manager_emails = Config.MANAGER_EMAILS if hasattr(Config, 'MANAGER_EMAILS') and Config.MANAGER_EMAILS else []
-            if manager_emails:
-                self.reporting_service.send_weekly_summary_to_managers(manager_emails)
-            else:
-                logger.warning("No manager emails configured for weekly summary")
-        except Exception as e:
-            logger.error(f"Error in weekly summary job: {str(e)}")
+        logger.info("Running scheduled weekly summary...")
+        # Get manager emails from config
+        manager_emails = Config.MANAGER_EMAILS if hasattr(Config, 'MANAGER_EMAILS') and Config.MANAGER_EMAILS else []
+        if manager_emails:
+            return self.reporting_service.send_weekly_summary_to_managers(manager_emails)
+        logger.warning("No manager emails configured for weekly summary")
+        return None
     
     def start(self):
         """Start the scheduler"""
@@ -127,11 +172,11 @@ class TaskScheduler:
 # Global scheduler instance
 scheduler = None
 
-def init_scheduler():
-    """Initialize scheduler"""
+def init_scheduler(app=None):
+    """Initialize scheduler (pass the app so runs are recorded and locked in the database)"""
     global scheduler
     if scheduler is None:
-        scheduler = TaskScheduler()
+        scheduler = TaskScheduler(app)
         scheduler.start()
         # Register shutdown handler
         atexit.register(lambda: scheduler.shutdown() if scheduler else None)
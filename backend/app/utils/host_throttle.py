@@ -0,0 +1,53 @@
+"""
+Per-host politeness for concurrent scraping
+Limits in-flight work per host and spaces out consecutive visits to the same host
+"""
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+class HostThrottle:
+    """Shared across worker threads so no host is hit by more than max_per_host workers at once"""
+    
+    def __init__(self, max_per_host=1, min_interval=1.0):
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}  # host -> BoundedSemaphore
+        self._last_start = {}  # host -> monotonic time of the last visit
+        self.waited_seconds = 0.0
+    
+    @staticmethod
+    def host_of(url):
+        """Host key for a URL or bare domain (lowercase, without www.)"""
+        if not url:
+            return ''
+        parsed = urlparse(url if '://' in url else f'http://{url}')
+        host = (parsed.hostname or '').lower()
+        return host[4:] if host.startswith('www.') else host
+    
+    @contextmanager
+    def acquire(self, url):
+        """Hold a slot for the host of url for the duration of the block"""
+        host = self.host_of(url)
+        if not host:
+            yield
+            return
+        
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+        
+        started = time.monotonic()
+        semaphore.acquire()
+        try:
+            with self._lock:
+                delay = self._last_start.get(host, float('-inf')) + self.min_interval - time.monotonic()
+                self._last_start[host] = time.monotonic() + max(delay, 0)
+            if delay > 0:
+                time.sleep(delay)
+            with self._lock:
+                self.waited_seconds += time.monotonic() - started
+            yield
+        finally:
+            semaphore.release()
@@ -0,0 +1,44 @@
+"""
+HTML parser selection for the scrapers
+Builds BeautifulSoup trees with the HTML_PARSER tree builder: html.parser by default, or lxml
+for speed (tests/test_html_parser_parity.py checks that extraction results do not change)
+"""
+from bs4 import BeautifulSoup
+from app.config import Config
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Tree builders in preference order; html.parser ships with Python so it is always available
+FALLBACK_PARSER = 'html.parser'
+SUPPORTED_PARSERS = ['lxml', 'html.parser']
+
+_resolved_parser = None
+
+def _is_available(parser):
+    if parser == FALLBACK_PARSER:
+        return True
+    try:
+        BeautifulSoup('<p></p>', parser)
+        return True
+    except Exception:
+        return False
+
+def get_parser_name():
+    """Return the tree builder in use: HTML_PARSER if it can be loaded, otherwise html.parser"""
+    global _resolved_parser
+    if _resolved_parser is None:
+        requested = (Config.HTML_PARSER or FALLBACK_PARSER).strip().lower()
+        if requested not in SUPPORTED_PARSERS:
+            logger.warning(f"Unsupported HTML_PARSER '{requested}', using {FALLBACK_PARSER}")
+            requested = FALLBACK_PARSER
+        elif not _is_available(requested):
+            logger.warning(f"HTML parser '{requested}' is not installed, using {FALLBACK_PARSER}")
+            requested = FALLBACK_PARSER
+        _resolved_parser = requested
+        logger.info(f"HTML parser: {_resolved_parser}")
+    return _resolved_parser
+
+def make_soup(markup):
+    """Parse HTML with the configured tree builder"""
+    return BeautifulSoup(markup, get_parser_name())
@@ -0,0 +1,189 @@
+"""
+Event-driven page readiness for the Selenium scrapers
+Replaces fixed time.sleep waits with WebDriverWait polling on document state, in-flight
+XHR/fetch requests and DOM mutations, with per-site timeouts learned from previous waits
+"""
+import threading
+import time
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from app.config import Config
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Installs (once per document) a request counter and a mutation observer, then reports
+# document state, requests in flight and how long the page has been quiet since the
+# later of its last change and the last mark() call
+READINESS_SCRIPT = """
+var r = window.__readiness;
+if (!r) {
+    r = window.__readiness = {id: Math.random().toString(36).slice(2), pending: 0, resources: 0,
+                              lastChange: Date.now(), mark: 0};
+    var touch = function () { r.lastChange = Date.now(); };
+    try {
+        new MutationObserver(touch).observe(document.documentElement,
+            {childList: true, subtree: true, characterData: true});
+    } catch (e) {}
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        r.pending++; touch();
+        this.addEventListener('loadend', function () { r.pending = Math.max(r.pending - 1, 0); touch(); });
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var nativeFetch = window.fetch;
+        window.fetch = function () {
+            r.pending++; touch();
+            var done = function () { r.pending = Math.max(r.pending - 1, 0); touch(); };
+            var request = nativeFetch.apply(this, arguments);
+            request.then(done, done);
+            return request;
+        };
+    }
+}
+if (arguments[0]) { r.mark = Date.now(); }
+var resources = performance.getEntriesByType ? performance.getEntriesByType('resource').length : 0;
+if (resources !== r.resources) { r.resources = resources; r.lastChange = Date.now(); }
+return {id: r.id, host: location.host, state: document.readyState, pending: r.pending,
+        changed_at: r.lastChange, quiet_ms: Date.now() - Math.max(r.lastChange, r.mark)};
+"""
+
+class AdaptiveTimeouts:
+    """
+    Per-site, per-wait-kind timeout learned from observed ready times.
+    
+    Same estimator TCP uses for retransmission timeouts: a smoothed mean plus four times
+    the smoothed deviation, clamped to [min_timeout, max_timeout]. Sites that are always
+    fast get short timeouts; slow or erratic ones get longer ones.
+    """
+    
+    def __init__(self, initial=None, min_timeout=None, max_timeout=None):
+        self.initial = initial or Config.READINESS_TIMEOUT
+        self.min_timeout = min_timeout or Config.READINESS_MIN_TIMEOUT
+        self.max_timeout = max_timeout or Config.READINESS_MAX_TIMEOUT
+        self._lock = threading.Lock()
+        self._estimates = {}  # (host, kind) -> [smoothed mean, smoothed deviation]
+    
+    def timeout_for(self, host, kind):
+        with self._lock:
+            estimate = self._estimates.get((host, kind))
+        if estimate is None:
+            return self.initial
+        mean, deviation = estimate
+        return min(max(mean + 4 * deviation, self.min_timeout), self.max_timeout)
+    
+    def record(self, host, kind, seconds, timed_out=False):
+        """Fold an observed wait into the estimate; a timeout only nudges an existing one"""
+        with self._lock:
+            estimate = self._estimates.get((host, kind))
+            if estimate is None:
+                if timed_out:
+                    return
+                self._estimates[(host, kind)] = [seconds, seconds / 2]
+            else:
+                mean, deviation = estimate
+                estimate[1] = 0.75 * deviation + 0.25 * abs(seconds - mean)
+                estimate[0] = 0.875 * mean + 0.125 * seconds
+    
+    def snapshot(self):
+        """{'host/kind': timeout} for every site seen so far"""
+        with self._lock:
+            keys = list(self._estimates)
+        return {f"{host}/{kind}": round(self.timeout_for(host, kind), 2) for host, kind in keys}
+
+# Shared by every scraper so what one run learns about a site carries over to the next
+site_timeouts = AdaptiveTimeouts()
+
+class PageWaiter:
+    """
+    Waits for a leased browser's page to be ready instead of sleeping a fixed time.
+    
+    A page is ready once document.readyState is complete, no XHR/fetch request is in
+    flight and the DOM has not changed for quiet_ms. Each wait takes the fixed delay
+    it replaces as a baseline so the time saved per run can be reported in stats.
+    
+    Usage around an action that changes the page:
+        waiter.mark()
+        button.click()
+        waiter.wait_until_ready('results', baseline=3, require_change=True)
+    """
+    
+    def __init__(self, driver, timeouts=None, quiet_ms=None, poll=None):
+        self.driver = driver
+        self.timeouts = timeouts or site_timeouts
+        self.quiet_ms = quiet_ms if quiet_ms is not None else Config.READINESS_QUIET_MS
+        self.poll = poll or Config.READINESS_POLL
+        self._marked = None  # (document id, page clock) at the last mark()
+        self.stats = {
+            'waits': 0,
+            'timeouts': 0,
+            'waited_seconds': 0.0,
+            'baseline_seconds': 0.0,
+            'time_saved_seconds': 0.0
+        }
+    
+    def _probe(self, mark=False):
+        return self.driver.execute_script(READINESS_SCRIPT, mark)
+    
+    def mark(self):
+        """Call before an action (click, scroll) so the next wait only counts quiet time after it"""
+        try:
+            state = self._probe(mark=True)
+            self._marked = (state['id'], state['changed_at'])
+        except WebDriverException:
+            self._marked = None
+    
+    def _is_ready(self, require_change, selector):
+        try:
+            state = self._probe()
+        except WebDriverException:
+            return False  # document is being replaced mid-navigation
+        if require_change and self._marked:
+            marked_id, marked_change = self._marked
+            if state['id'] == marked_id and state['changed_at'] <= marked_change:
+                return False
+        if selector and not self.driver.find_elements(By.CSS_SELECTOR, selector):
+            return False
+        return state['state'] == 'complete' and state['pending'] == 0 and state['quiet_ms'] >= self.quiet_ms
+    
+    def wait_until_ready(self, kind, baseline=0, require_change=False, selector=None):
+        """
+        Block until the page is ready or the learned timeout for this site and kind expires.
+        
+        kind groups waits with similar costs (load, scroll, results, ...) for timeout learning.
+        require_change also waits for a new document or a DOM change since mark(), for actions
+        whose effect may start after the click returns. selector additionally requires a
+        matching element. Returns True if the page became ready, False on timeout.
+        """
+        started = time.time()
+        try:
+            host = self._probe()['host']
+        except WebDriverException:
+            host = ''
+        timeout = self.timeouts.timeout_for(host, kind)
+        
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=self.poll).until(
+                lambda driver: self._is_ready(require_change, selector)
+            )
+            ready = True
+        except TimeoutException:
+            ready = False
+            self.stats['timeouts'] += 1
+            logger.debug(f"Page not ready after {timeout:.1f}s ({host}/{kind}), continuing")
+        
+        elapsed = time.time() - started
+        self.timeouts.record(host, kind, elapsed, timed_out=not ready)
+        self._marked = None
+        
+        self.stats['waits'] += 1
+        self.stats['waited_seconds'] += elapsed
+        self.stats['baseline_seconds'] += baseline
+        self.stats['time_saved_seconds'] += baseline - elapsed
+        return ready
+    
+    def get_stats(self):
+        """Rounded copy of the wait counters"""
+        return {key: round(value, 2) if isinstance(value, float) else value for key, value in self.stats.items()}
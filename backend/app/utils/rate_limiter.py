@@ -0,0 +1,37 @@
+"""
+Token bucket rate limiter
+Shared by threads calling a rate-limited API so the process as a whole stays under its limit
+"""
+import threading
+import time
+
+class TokenBucket:
+    """rate tokens per second, bursts of up to capacity; acquire() blocks until a token is free"""
+    
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited_seconds = 0.0
+    
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self, timeout=None):
+        """Take one token; returns False if none is available within timeout seconds"""
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.waited_seconds += now - started
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if timeout is not None and now - started + wait > timeout:
+                return False
+            time.sleep(wait)
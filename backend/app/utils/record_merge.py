@@ -0,0 +1,45 @@
+"""
+Merge planning for exact duplicate records
+Shared by the Google Sheets and database merges: group records whose key fields match,
+keep the most complete record of each group and fill its empty fields from the others
+"""
+
+def is_empty(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+def normalize_key(record, key_fields):
+    """Normalized tuple of the key fields (lowercase, stripped), or None if they are all empty"""
+    values = tuple(str(record.get(field) or '').lower().strip() for field in key_fields)
+    return values if any(values) else None
+
+def exact_groups(records, key_fields):
+    """Indexes of records sharing the same normalized key fields, for every key seen more than once"""
+    groups = {}
+    for idx, record in enumerate(records):
+        key = normalize_key(record, key_fields)
+        if key is not None:
+            groups.setdefault(key, []).append(idx)
+    return [group for group in groups.values() if len(group) > 1]
+
+def completeness(record, fields):
+    """Number of non-empty merge fields"""
+    return sum(1 for field in fields if not is_empty(record.get(field)))
+
+def plan_merge(records, group, fields):
+    """
+    Merge plan for one group of record indexes (given in preference order for ties).
+    Returns {'survivor': idx, 'removed': [idx, ...], 'updates': {field: value}} where updates are
+    the survivor's empty fields filled from the first removed record that has them.
+    """
+    survivor = max(group, key=lambda idx: (completeness(records[idx], fields), -group.index(idx)))
+    removed = [idx for idx in group if idx != survivor]
+    updates = {}
+    for field in fields:
+        if not is_empty(records[survivor].get(field)):
+            continue
+        for idx in removed:
+            value = records[idx].get(field)
+            if not is_empty(value):
+                updates[field] = value
+                break
+    return {'survivor': survivor, 'removed': removed, 'updates': updates}
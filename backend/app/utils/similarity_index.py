@@ -0,0 +1,146 @@
+"""
+Similarity index for fuzzy duplicate detection
+Uses character trigram blocking so each name is only compared with names that could pass the threshold
+"""
+import difflib
+import math
+import time
+from collections import defaultdict
+
+PAD = '\x02'
+
+class SimilarityIndex:
+    """
+    Incremental index of names that returns every indexed name whose
+    difflib.SequenceMatcher ratio with a query name is above the threshold.
+    
+    Candidates come from shared trigram posting lists. A name pair with ratio > threshold
+    can only differ by a bounded number of insertions/deletions, and each one destroys at
+    most 3 trigrams, so candidates that share fewer trigrams than that bound are skipped
+    without losing any pair the full pairwise scan would have found.
+    """
+    
+    def __init__(self, threshold=0.85, q=3):
+        self.threshold = threshold
+        self.q = q
+        self.names = []  # name id -> name
+        self.name_ids = {}  # name -> name id
+        self.grams = []  # name id -> set of trigrams
+        self.postings = defaultdict(list)  # trigram -> [name ids]
+        self._destroyed_cache = {}
+        self.reset_stats()
+    
+    def reset_stats(self):
+        """Reset per-run statistics"""
+        self.stats = {
+            'names_indexed': len(self.names),
+            'queries': 0,
+            'candidates_generated': 0,
+            'candidates_compared': 0,
+            'pairs_emitted': 0,
+            'time_spent_seconds': 0.0
+        }
+    
+    def _ngrams(self, name):
+        padded = f"{PAD * (self.q - 1)}{name}{PAD * (self.q - 1)}"
+        return {padded[i:i + self.q] for i in range(len(padded) - self.q + 1)}
+    
+    def _max_destroyed(self, length, other_length):
+        """
+        Most trigrams of a name of this length that can be destroyed by an alignment with
+        a name of other_length whose ratio stays above the threshold: each deleted character
+        breaks q trigrams and each inserted one q - 1. None if the lengths alone rule it out.
+        """
+        key = (length, other_length)
+        if key not in self._destroyed_cache:
+            # ratio = 2 * matches / (length + other_length) > threshold
+            matches = math.floor(self.threshold * (length + other_length) / 2) + 1
+            if matches > min(length, other_length):
+                self._destroyed_cache[key] = None
+            else:
+                self._destroyed_cache[key] = (
+                    self.q * (length - matches) + (self.q - 1) * (other_length - matches)
+                )
+        return self._destroyed_cache[key]
+    
+    def _min_shared_grams(self, name, gram_count):
+        """Lower bound on trigrams a name must share with any match above the threshold"""
+        length = len(name)
+        r = self.threshold
+        shortest = max(math.floor(length * r / (2 - r)), 1)
+        longest = math.ceil(length * (2 - r) / r)
+        destroyed = [
+            d for d in (self._max_destroyed(length, other) for other in range(shortest, longest + 1))
+            if d is not None
+        ]
+        if not destroyed:
+            return None
+        return max(gram_count - max(destroyed), 1)
+    
+    def add(self, name):
+        """Index a name; returns its id (existing id if already indexed)"""
+        if name in self.name_ids:
+            return self.name_ids[name]
+        
+        name_id = len(self.names)
+        grams = self._ngrams(name)
+        self.names.append(name)
+        self.name_ids[name] = name_id
+        self.grams.append(grams)
+        for gram in grams:
+            self.postings[gram].append(name_id)
+        self.stats['names_indexed'] += 1
+        return name_id
+    
+    def query(self, name):
+        """Return [(name_id, ratio)] for indexed names with threshold < ratio < 1.0"""
+        if not name:
+            return []
+        
+        started = time.perf_counter()
+        self.stats['queries'] += 1
+        
+        grams = self._ngrams(name)
+        min_shared = self._min_shared_grams(name, len(grams))
+        if min_shared is None:
+            self.stats['time_spent_seconds'] += time.perf_counter() - started
+            return []
+        
+        # Prefix filter: a candidate sharing min_shared grams must share at least one
+        # of the (len - min_shared + 1) rarest grams, so only those posting lists are read
+        probe = sorted(grams, key=lambda g: len(self.postings.get(g, ())))[:len(grams) - min_shared + 1]
+        candidates = set()
+        for gram in probe:
+            candidates.update(self.postings.get(gram, ()))
+        self.stats['candidates_generated'] += len(candidates)
+        
+        matches = []
+        # real_quick_ratio/quick_ratio are symmetric upper bounds, so keep the query as the
+        # cached second sequence for them and only build a full matcher for survivors
+        bound = difflib.SequenceMatcher(None, '', name)
+        length = len(name)
+        for name_id in sorted(candidates):
+            other = self.names[name_id]
+            if other == name:
+                continue
+            # Length filter, then the trigram bound for this exact pair of lengths
+            destroyed = self._max_destroyed(length, len(other))
+            if destroyed is None:
+                continue
+            other_grams = self.grams[name_id]
+            shared = len(grams & other_grams)
+            if (shared < len(grams) - destroyed
+                    or shared < len(other_grams) - self._max_destroyed(len(other), length)):
+                continue
+            
+            self.stats['candidates_compared'] += 1
+            bound.set_seq1(other)
+            if bound.quick_ratio() <= self.threshold:
+                continue
+            similarity = difflib.SequenceMatcher(None, name, other).ratio()
+            if self.threshold < similarity < 1.0:
+                matches.append((name_id, similarity))
+        
+        self.stats['pairs_emitted'] += len(matches)
+        self.stats['time_spent_seconds'] += time.perf_counter() - started
+        return matches
@@ -0,0 +1,169 @@
+"""
+Step graph executor for the automation pipelines
+Steps declare the steps they come after; every step whose dependencies are finished runs on a
+thread pool, so independent stages overlap instead of running strictly in sequence
+"""
+from app.utils.logger import get_logger
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import time
+
+logger = get_logger(__name__)
+
+class Step:
+    """
+    One pipeline stage.
+    func receives the results of the finished steps (by name). when, if given, is called with
+    the same results and the step is skipped when it returns False. A step fails when it raises,
+    times out or returns a dict with an 'error'; it is retried only if retries > 0, so leave
+    retries at 0 for steps that are not safe to repeat (writes, emails).
+    A step is skipped when a step it comes after failed (or was skipped for that reason), unless
+    run_after_failure is set. side_effects marks steps whose timed-out attempt is not retried,
+    since the abandoned attempt may still be running.
+    """
+    
+    def __init__(self, name, func, after=(), when=None, timeout=None, retries=0,
+                 run_after_failure=False, side_effects=False):
+        self.name = name
+        self.func = func
+        self.after = tuple(after)
+        self.when = when
+        self.timeout = timeout
+        self.retries = retries
+        self.run_after_failure = run_after_failure
+        self.side_effects = side_effects
+
+class StepGraph:
+    """Dependency-ordered, parallel execution of Steps with per-step timeout, retry and timings"""
+    
+    def __init__(self, steps, max_workers=4, default_timeout=None, app=None):
+        self.steps = {step.name: step for step in steps}
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self.app = app  # steps run inside this app's context (database access from pool threads)
+        for step in steps:
+            missing = [name for name in step.after if name not in self.steps]
+            if missing:
+                raise ValueError(f"Step '{step.name}' depends on unknown step(s): {', '.join(missing)}")
+        self._check_acyclic()
+    
+    def _check_acyclic(self):
+        done = set()
+        remaining = dict(self.steps)
+        while remaining:
+            ready = [name for name, step in remaining.items() if all(dep in done for dep in step.after)]
+            if not ready:
+                raise ValueError(f"Step graph has a cycle among: {', '.join(remaining)}")
+            for name in ready:
+                done.add(name)
+                del remaining[name]
+    
+    def _call(self, step, results):
+        if self.app is None:
+            return step.func(results)
+        with self.app.app_context():
+            return step.func(results)
+    
+    def run(self, tracker=None):
+        """
+        Run every step; returns (results, timings).
+        results maps step name to its result ({'status': 'skipped'} for skipped steps).
+        With a job tracker, progress is recorded and steps finished before a restart are reused.
+        """
+        results = {}
+        timings = {}
+        pending = dict(self.steps)
+        running = {}  # future -> (step, attempt, started, deadline)
+        failed_steps = set()  # failed, or skipped because a dependency failed
+        started_at = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='automation-step')
+        
+        def finished(name):
+            return name in results
+        
+        def record(step, status, attempt, started, result):
+            results[step.name] = result
+            timings[step.name] = {
+                'status': status,
+                'attempts': attempt,
+                'started_at_seconds': round(started - started_at, 2),
+                'duration_seconds': round(time.monotonic() - started, 2)
+            }
+        
+        def submit(step, attempt, started=None):
+            now = time.monotonic()
+            timeout = step.timeout or self.default_timeout
+            future = executor.submit(self._call, step, dict(results))
+            running[future] = (step, attempt, started or now, now + timeout if timeout else None)
+        
+        def failed(step, attempt, started, error, result=None, retry=True):
+            if retry and attempt <= step.retries:
+                logger.warning(f"Step '{step.name}' failed (attempt {attempt}/{step.retries + 1}), retrying: {error}")
+                submit(step, attempt + 1, started)
+                return
+            logger.error(f"Step '{step.name}' failed: {error}")
+            failed_steps.add(step.name)
+            if tracker is not None:
+                tracker.fail(step.name, error)
+            record(step, 'failed', attempt, started, result if result is not None else {'status': 'error', 'error': error})
+        
+        try:
+            while pending or running:
+                # Start every step whose dependencies have finished
+                for name, step in list(pending.items()):
+                    if not all(finished(dep) for dep in step.after):
+                        continue
+                    del pending[name]
+                    if tracker is not None and tracker.is_done(name):
+                        logger.info(f"⏭️ Step '{name}' already completed, reusing its result")
+                        results[name] = tracker.result_of(name)
+                        timings[name] = {'status': 'reused', 'attempts': 0, 'started_at_seconds': None, 'duration_seconds': 0}
+                        continue
+                    blocked = [dep for dep in step.after if dep in failed_steps]
+                    if blocked and not step.run_after_failure:
+                        logger.warning(f"⏭️ Step '{name}' skipped, it depends on failed step(s): {', '.join(blocked)}")
+                        failed_steps.add(name)
+                        record(step, 'skipped', 0, time.monotonic(), {'status': 'skipped', 'reason': f"dependency failed: {', '.join(blocked)}"})
+                        continue
+                    if step.when is not None and not step.when(results):
+                        record(step, 'skipped', 0, time.monotonic(), {'status': 'skipped', 'reason': 'condition not met'})
+                        continue
+                    if tracker is not None:
+                        tracker.start(name)
+                    submit(step, 1)
+                
+                if not running:
+                    continue
+                
+                deadlines = [deadline for _, _, _, deadline in running.values() if deadline]
+                wait_for = max(min(deadlines) - time.monotonic(), 0) if deadlines else None
+                done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    step, attempt, started, _ = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        failed(step, attempt, started, str(e))
+                        continue
+                    if isinstance(result, dict) and result.get('error'):
+                        failed(step, attempt, started, str(result['error']), result)
+                        continue
+                    if tracker is not None:
+                        tracker.finish(step.name, result)
+                    record(step, 'completed', attempt, started, result)
+                
+                # Threads cannot be killed: a timed-out attempt is abandoned and left to finish on its own,
+                # so steps with side effects are not retried alongside it
+                now = time.monotonic()
+                for future, (step, attempt, started, deadline) in list(running.items()):
+                    if deadline and now >= deadline:
+                        del running[future]
+                        error = f"Timed out after {step.timeout or self.default_timeout}s"
+                        if step.side_effects and attempt <= step.retries:
+                            error += " (not retried: the abandoned attempt may still be running)"
+                        failed(step, attempt, started, error, retry=not step.side_effects)
+        finally:
+            executor.shutdown(wait=False)
+        
+        timings['total_seconds'] = round(time.monotonic() - started_at, 2)
+        return results, timings
@@ -0,0 +1,291 @@
+"""
+Shared Chrome WebDriver pool
+Keeps warm browser instances that scrapers lease instead of launching Chrome per call
+"""
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from app.config import Config
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class PooledDriver:
+    """Bookkeeping for one Chrome instance owned by the pool"""
+    
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.leases = 0
+        self.created_at = time.time()
+        self.last_used = time.time()
+        self.origins = set()  # origins navigated to this lease, whose storage is cleared on release
+        
+        # Count navigations so the pool can recycle a browser after max_pages
+        original_get = driver.get
+        
+        def counting_get(url):
+            self.pages += 1
+            self.note_origin(url)
+            return original_get(url)
+        
+        driver.get = counting_get
+    
+    def note_origin(self, url):
+        parts = urlsplit(url or '')
+        if parts.scheme in ('http', 'https') and parts.netloc:
+            self.origins.add(f'{parts.scheme}://{parts.netloc}')
+
+class WebDriverPool:
+    """
+    Bounded pool of headless Chrome drivers.
+    
+    lease() hands out a healthy idle driver (or starts one while under max_size, otherwise
+    waits up to lease_timeout). On release the browser's cookies and cache are cleared, as is
+    the storage of every origin the lease visited, and it goes back to the idle list, unless
+    it crashed, failed the reset, or served max_pages navigations - then it is quit and
+    replaced lazily on a later lease.
+    """
+    
+    def __init__(self, max_size=None, max_pages=None, lease_timeout=None, idle_timeout=None, headless=None):
+        self.max_size = max(max_size or Config.WEBDRIVER_POOL_SIZE, 1)
+        self.max_pages = max_pages or Config.WEBDRIVER_MAX_PAGES
+        self.lease_timeout = lease_timeout or Config.WEBDRIVER_LEASE_TIMEOUT
+        self.idle_timeout = idle_timeout or Config.WEBDRIVER_IDLE_TIMEOUT
+        self.headless = Config.WEBDRIVER_HEADLESS if headless is None else headless
+        
+        self._condition = threading.Condition()
+        self._idle = []  # PooledDriver instances ready to lease, most recently used last
+        self._total = 0  # idle + leased + starting
+        self._closed = False
+        self.stats = {
+            'created': 0,
+            'reused': 0,
+            'recycled': 0,
+            'crashed': 0,
+            'leases': 0,
+            'wait_seconds': 0.0
+        }
+    
+    def _options(self):
+        chrome_options = Options()
+        if self.headless:
+            chrome_options.add_argument('--headless')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        chrome_options.add_argument('--window-size=1920,1080')
+        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+        return chrome_options
+    
+    def _start_driver(self):
+        driver = webdriver.Chrome(options=self._options())
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self._count('created')
+        logger.info("Chrome driver started for pool")
+        return PooledDriver(driver)
+    
+    def _count(self, stat, amount=1):
+        with self._condition:
+            self.stats[stat] += amount
+    
+    def _quit(self, pooled):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting pooled driver: {str(e)}")
+    
+    def _is_healthy(self, pooled):
+        """Cheap round trip to the browser; a dead session raises"""
+        try:
+            pooled.driver.current_url
+            return True
+        except Exception:
+            return False
+    
+    def _reset(self, pooled):
+        """Clear per-lease state so the next lease starts from a blank browser; raises if any of it fails"""
+        driver = pooled.driver
+        # Cookies and cache of every origin, not just the page the lease ended on
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        # Pages reached through clicks and redirects never went through driver.get
+        for handle in driver.window_handles:
+            driver.switch_to.window(handle)
+            pooled.note_origin(driver.current_url)
+        for origin in pooled.origins:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+        pooled.origins.clear()
+        # Close extra tabs/windows a scrape may have opened
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get('about:blank')
+        pooled.pages -= 1  # the blank page does not count towards recycling
+    
+    def _discard(self, pooled):
+        self._quit(pooled)
+        with self._condition:
+            self._total -= 1
+            self._condition.notify()
+    
+    def _acquire(self):
+        started = time.time()
+        deadline = started + self.lease_timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise Exception('WebDriver pool is shut down')
+                
+                # Drop browsers that sat idle too long
+                now = time.time()
+                while self._idle and now - self._idle[0].last_used > self.idle_timeout:
+                    stale = self._idle.pop(0)
+                    self._total -= 1
+                    threading.Thread(target=self._quit, args=(stale,), daemon=True).start()
+                
+                if self._idle:
+                    pooled = self._idle.pop()
+                    reused = True
+                    break
+                if self._total < self.max_size:
+                    self._total += 1
+                    pooled = None
+                    reused = False
+                    break
+                
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise Exception(f"No WebDriver available within {self.lease_timeout}s (pool size {self.max_size})")
+                self._condition.wait(remaining)
+            
+            self.stats['wait_seconds'] += time.time() - started
+        
+        if pooled is None:
+            try:
+                return self._start_driver()
+            except Exception:
+                with self._condition:
+                    self._total -= 1
+                    self._condition.notify()
+                raise
+        
+        if not self._is_healthy(pooled):
+            logger.warning("Pooled driver failed health check, replacing it")
+            self._count('crashed')
+            self._quit(pooled)
+            try:
+                return self._start_driver()
+            except Exception:
+                with self._condition:
+                    self._total -= 1
+                    self._condition.notify()
+                raise
+        
+        self._count('reused', int(reused))
+        return pooled
+    
+    def _release(self, pooled, crashed=False):
+        pooled.last_used = time.time()
+        if crashed:
+            self._count('crashed')
+            self._discard(pooled)
+            return
+        if pooled.pages >= self.max_pages:
+            self._count('recycled')
+            self._discard(pooled)
+            return
+        try:
+            self._reset(pooled)
+        except Exception as e:
+            logger.warning(f"Error resetting pooled driver, discarding it: {str(e)}")
+            self._count('crashed')
+            self._discard(pooled)
+            return
+        
+        with self._condition:
+            if self._closed:
+                self._total -= 1
+                self._quit(pooled)
+            else:
+                self._idle.append(pooled)
+            self._condition.notify()
+    
+    @contextmanager
+    def lease(self):
+        """Lease a driver for the duration of the block"""
+        pooled = self._acquire()
+        pooled.leases += 1
+        self._count('leases')
+        crashed = False
+        try:
+            yield pooled.driver
+        except WebDriverException:
+            # The browser may be wedged; never hand it to another scrape
+            crashed = not self._is_healthy(pooled)
+            raise
+        finally:
+            self._release(pooled, crashed=crashed)
+    
+    def warm(self, count):
+        """Start up to count idle drivers ahead of the first lease"""
+        for _ in range(count):
+            with self._condition:
+                if self._closed or self._total >= self.max_size:
+                    return
+                self._total += 1
+            try:
+                pooled = self._start_driver()
+            except Exception as e:
+                logger.error(f"Error warming WebDriver pool: {str(e)}")
+                with self._condition:
+                    self._total -= 1
+                    self._condition.notify()
+                return
+            with self._condition:
+                self._idle.append(pooled)
+                self._condition.notify()
+    
+    def get_status(self):
+        """Pool size and counters"""
+        with self._condition:
+            return {
+                'max_size': self.max_size,
+                'total': self._total,
+                'idle': len(self._idle),
+                'leased': self._total - len(self._idle),
+                **self.stats
+            }
+    
+    def shutdown(self):
+        """Quit every idle driver; leased drivers are quit when they are released"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._condition.notify_all()
+        for pooled in idle:
+            self._quit(pooled)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_driver_pool():
+    """Process-wide driver pool, created on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WebDriverPool()
+            atexit.register(_pool.shutdown)
+            if Config.WEBDRIVER_POOL_WARM:
+                threading.Thread(target=_pool.warm, args=(Config.WEBDRIVER_POOL_WARM,), daemon=True).start()
+        return _pool
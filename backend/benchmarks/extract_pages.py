@@ -0,0 +1,83 @@
+"""
+Brand page extraction micro-benchmark
+Runs BrandWebsiteScraper._extract_from_page over the stored pages in tests/fixtures/brand_pages
+and reports pages per second. Pages are parsed once up front, so only extraction is timed
+unless --include-parse is given.
+
+Usage (from backend/):
+    python benchmarks/extract_pages.py                  # current tree
+    python benchmarks/extract_pages.py --rev <commit>   # scraper as of an earlier commit, for before/after
+"""
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import time
+import types
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(BACKEND_DIR, 'tests', 'fixtures', 'brand_pages')
+SCRAPER_PATH = 'backend/app/scrapers/brand_website_scraper.py'
+
+sys.path.insert(0, BACKEND_DIR)
+
+def load_scraper(rev=None):
+    """BrandWebsiteScraper class from the working tree, or from the given git revision"""
+    if rev is None:
+        from app.scrapers.brand_website_scraper import BrandWebsiteScraper
+        return BrandWebsiteScraper
+    
+    source = subprocess.run(['git', 'show', f'{rev}:{SCRAPER_PATH}'], cwd=BACKEND_DIR,
+                            capture_output=True, text=True, check=True).stdout
+    # Older revisions call _extract_emails(soup, base_url, result) and use result in its body,
+    # but the method did not take it, so every page raised; patch the signature so they run
+    source = source.replace('def _extract_emails(self, soup, base_url):',
+                            'def _extract_emails(self, soup, base_url, result):')
+    module = types.ModuleType(f'brand_website_scraper_{rev}')
+    exec(compile(source, f'{rev}:{SCRAPER_PATH}', 'exec'), module.__dict__)
+    return module.BrandWebsiteScraper
+
+def new_result():
+    return {
+        'data': {
+            'emails': {'primary': '', 'contact': '', 'support': '', 'sales': '', 'all_found': []},
+            'phone': {'primary': '', 'all_found': []},
+            'address': {'full': ''},
+            'social_media': {'all_found': []},
+            'company_info': {},
+            'key_personnel': {}
+        }
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rev', help='git revision to take brand_website_scraper.py from')
+    parser.add_argument('--repeat', type=int, default=20, help='passes over the fixture pages')
+    parser.add_argument('--parser', default='html.parser', help='BeautifulSoup tree builder')
+    parser.add_argument('--include-parse', action='store_true', help='time parsing as well as extraction')
+    args = parser.parse_args()
+    
+    from bs4 import BeautifulSoup
+    
+    scraper_class = load_scraper(args.rev)
+    scraper = scraper_class.__new__(scraper_class)  # extraction needs no HTTP session or services
+    pages = [open(path, encoding='utf-8').read() for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html')))]
+    soups = [BeautifulSoup(page, args.parser) for page in pages]
+    
+    count = 0
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for page, soup in zip(pages, soups):
+            if args.include_parse:
+                soup = BeautifulSoup(page, args.parser)
+            scraper._extract_from_page(soup, 'https://brand.example.com', new_result())
+            count += 1
+    elapsed = time.perf_counter() - started
+    
+    label = args.rev or 'working tree'
+    timed = 'parse + extract' if args.include_parse else 'extract'
+    print(f"{label}: {count / elapsed:.1f} pages/s ({timed}, {args.parser}, {len(pages)} pages x {args.repeat})")
+
+if __name__ == '__main__':
+    main()
@@ -11,16 +11,28 @@ sys.path.insert(0, backend_dir)
 
 from app import create_app
 from app.tasks.scheduler import init_scheduler
+from app.tasks.research_worker import init_research_worker
+from app.tasks.job_runner import init_job_runner
 
 app = create_app()
 
+# Background automation jobs (resumes jobs interrupted by a restart)
+init_job_runner(app)
+
 # Initialize scheduler for automated tasks
 if os.environ.get('ENABLE_SCHEDULER', 'true').lower() == 'true':
     try:
-        init_scheduler()
+        init_scheduler(app)
     except Exception as e:
         print(f"Warning: Could not initialize scheduler: {e}")
 
+# Drain the brand research queue in-process (or run python -m app.tasks.research_worker separately)
+if os.environ.get('ENABLE_RESEARCH_WORKER', 'false').lower() == 'true':
+    try:
+        init_research_worker(app)
+    except Exception as e:
+        print(f"Warning: Could not start research worker: {e}")
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('FLASK_ENV') == 'development'
@@ -0,0 +1,115 @@
+"""
+Parser parity: every scraper must extract the same data whichever HTML_PARSER tree builder
+is configured. Each extractor runs over the stored fixture pages under lxml and html.parser
+and the results are compared.
+"""
+import glob
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app.config import Config
+from app.utils import html_parser
+from app.scrapers.brand_website_scraper import BrandWebsiteScraper
+from app.scrapers.seller_scraper import SellerScraper
+from app.scrapers.smartscout_scraper import SmartScoutScraper
+
+pytest.importorskip('lxml')
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+PARSERS = ['lxml', 'html.parser']
+
+def fixture_paths(folder):
+    return sorted(glob.glob(os.path.join(FIXTURES_DIR, folder, '*.html')))
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+def empty_result():
+    return {
+        'data': {
+            'emails': {'primary': '', 'contact': '', 'support': '', 'sales': '', 'all_found': []},
+            'phone': {'primary': '', 'all_found': []},
+            'address': {'full': ''},
+            'social_media': {'all_found': []},
+            'company_info': {},
+            'key_personnel': {}
+        }
+    }
+
+class FakeDriver:
+    """Serves a stored page (extraction is set to 'offline', so scripts only scroll)"""
+    
+    def __init__(self, html):
+        self.page_source = html
+    
+    def execute_script(self, script, *args):
+        return None
+    
+    def find_element(self, *args):
+        raise RuntimeError('no browser in tests')
+
+class FakeWaiter:
+    def mark(self):
+        pass
+    
+    def wait_until_ready(self, *args, **kwargs):
+        return True
+
+@pytest.fixture
+def use_parser(monkeypatch):
+    """Make make_soup build trees with the given parser"""
+    def use(parser):
+        monkeypatch.setattr(html_parser, '_resolved_parser', parser)
+    return use
+
+def extract_brand_page(html, parser):
+    scraper = BrandWebsiteScraper.__new__(BrandWebsiteScraper)
+    result = empty_result()
+    scraper._extract_from_page(BeautifulSoup(html, parser), 'https://brand.example.com', result)
+    return result
+
+@pytest.mark.parametrize('path', fixture_paths('brand_pages'), ids=os.path.basename)
+def test_brand_page_extraction_matches(path):
+    html = read(path)
+    results = [extract_brand_page(html, parser) for parser in PARSERS]
+    
+    assert results[0] == results[1]
+    assert results[0]['data']['emails']['all_found'] or results[0]['data']['social_media']['all_found']
+
+def test_malformed_brand_page_still_extracts():
+    result = extract_brand_page(read(os.path.join(FIXTURES_DIR, 'brand_pages', 'malformed_home.html')), 'lxml')
+    
+    assert 'orders@lumencandles.com' in result['data']['emails']['all_found']
+    assert result['data']['address']['zip'] == '97210'
+    assert result['data']['key_personnel'] == {'founder': 'Nora Quinn', 'ceo': 'Sam Ortiz'}
+
+@pytest.mark.parametrize('path', fixture_paths('seller_pages'), ids=os.path.basename)
+def test_seller_page_brands_match(path, use_parser, monkeypatch):
+    monkeypatch.setattr(Config, 'SELLER_PAGE_EXTRACTION', 'offline')
+    results = []
+    for parser in PARSERS:
+        use_parser(parser)
+        scraper = SellerScraper.__new__(SellerScraper)
+        scraper.driver = FakeDriver(read(path))
+        results.append(sorted(scraper._extract_brands_from_page()))
+    
+    assert results[0] == results[1]
+    assert {'Osprey', 'Black Diamond', 'Nalgene'} <= set(results[0])
+
+@pytest.mark.parametrize('path', fixture_paths('smartscout_pages'), ids=os.path.basename)
+def test_smartscout_brands_match(path, use_parser, monkeypatch):
+    monkeypatch.setattr(Config, 'SMARTSCOUT_ROW_EXTRACTION', 'offline')
+    results = []
+    for parser in PARSERS:
+        use_parser(parser)
+        scraper = SmartScoutScraper()
+        scraper.driver = FakeDriver(read(path))
+        scraper.waiter = FakeWaiter()
+        brands = scraper.extract_brands(count=10, scroll_delay=0)
+        results.append([{k: v for k, v in brand.items() if k != 'extracted_at'} for brand in brands])
+    
+    assert results[0] == results[1]
+    assert [brand['name'] for brand in results[0]] == ['Zulay Kitchen', 'Mighty Patch', 'Cozy Earth', 'Unnamed seller']
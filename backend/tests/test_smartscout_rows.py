@@ -0,0 +1,47 @@
+"""
+SmartScout row reading: a brand list that re-renders its rows in place (virtualized scrolling
+or a next-page click) must still yield every brand.
+"""
+from app.config import Config
+from app.scrapers.smartscout_scraper import SmartScoutScraper
+
+def brand_list(names):
+    rows = ''.join(f'<tr data-brand-id="{i}"><td><a href="https://app.smartscout.com/brands/{i}">{name}</a></td></tr>'
+                   for i, name in enumerate(names))
+    return f'<html><body><table><tbody>{rows}</tbody></table></body></html>'
+
+class RecyclingDriver:
+    """Serves one page of rows per scroll, always rendered into the same number of row nodes"""
+    
+    def __init__(self, pages):
+        self.pages = pages
+        self.page = 0
+    
+    @property
+    def page_source(self):
+        return brand_list(self.pages[self.page])
+    
+    def execute_script(self, script, *args):
+        if 'scrollTo' in script:
+            self.page = min(self.page + 1, len(self.pages) - 1)
+        return None
+    
+    def find_element(self, *args):
+        raise RuntimeError('no load-more button')
+
+class FakeWaiter:
+    def mark(self):
+        pass
+    
+    def wait_until_ready(self, *args, **kwargs):
+        return True
+
+def test_offline_rows_recycled_in_place(monkeypatch):
+    monkeypatch.setattr(Config, 'SMARTSCOUT_ROW_EXTRACTION', 'offline')
+    scraper = SmartScoutScraper()
+    scraper.driver = RecyclingDriver([['Alpha', 'Bravo'], ['Bravo', 'Charlie'], ['Delta', 'Echo']])
+    scraper.waiter = FakeWaiter()
+    
+    brands = scraper.extract_brands(count=10, scroll_delay=0)
+    
+    assert [brand['name'] for brand in brands] == ['Alpha', 'Bravo', 'Charlie', 'Delta', 'Echo']
@@ -10,10 +10,14 @@ if backend_dir not in sys.path:
     sys.path.insert(0, backend_dir)
 
 from app import create_app
+from app.tasks.job_runner import init_job_runner
 
 # Create Flask app instance
 app = create_app()
 
+# Background automation jobs (resumes jobs interrupted by a restart)
+init_job_runner(app)
+
 # This is required for Render
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))